@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Key reduction for dense (baked) curves on NumPy key arrays.
+# Ramer-Douglas-Peucker over the key times: a span between two kept keys is split at its worst key until every removed key
+# lies within the tolerance of the curve rebuilt from the kept keys. The rebuilt curve is either linear or cubic Hermite; the
+# cubic one uses the slope of the original curve at each kept key as its tangent, so it matches smooth baked motion with few keys.
+# The error is measured at the original key times. This module does not import unreal; sequencer_bulk_keys.simplify_float_keys() and
+# sequencer_stream.simplify_sequence() apply it to sequence channels and fbxArrays.simplifyAnimationCurves() to curves decoded from FBX.
+import numpy as np
+
+LINEAR = 'linear'
+CUBIC = 'cubic'
+
+'''
+	Summary:
+		Slopes (value per time unit) of a curve at its keys, from central differences of the neighbouring keys.
+'''
+def key_slopes(times, values):
+	times = np.asarray(times, dtype = np.float64)
+	values = np.asarray(values, dtype = np.float64)
+	if len(times) < 2:
+		return np.zeros(len(times))
+	return np.gradient(values, times)
+
+'''
+	Summary:
+		Evaluates the curve defined by kept keys at the given times, linearly or with cubic Hermite segments.
+	Params:
+		key_times, key_values - The kept keys, sorted by time.
+		at - Times to evaluate at, within [key_times[0], key_times[-1]].
+		mode - LINEAR or CUBIC.
+		slopes - Tangent of each kept key (value per time unit), required for CUBIC.
+'''
+def evaluate(key_times, key_values, at, mode = LINEAR, slopes = None):
+	key_times = np.asarray(key_times, dtype = np.float64)
+	key_values = np.asarray(key_values, dtype = np.float64)
+	at = np.asarray(at, dtype = np.float64)
+	if len(key_times) == 1:
+		return np.full(at.shape, key_values[0])
+	segment = np.clip(np.searchsorted(key_times, at, 'right') - 1, 0, len(key_times) - 2)
+	t0 = key_times[segment]
+	width = key_times[segment + 1] - t0
+	s = np.where(width > 0, (at - t0) / np.where(width > 0, width, 1.0), 0.0)
+	v0 = key_values[segment]
+	v1 = key_values[segment + 1]
+	if mode == LINEAR:
+		return v0 + (v1 - v0) * s
+	s2 = s * s
+	s3 = s2 * s
+	return ((2 * s3 - 3 * s2 + 1) * v0 + (s3 - 2 * s2 + s) * width * slopes[segment]
+		+ (-2 * s3 + 3 * s2) * v1 + (s3 - s2) * width * slopes[segment + 1])
+
+'''
+	Summary:
+		Finds the keys that must be kept so the curve rebuilt from them stays within the tolerance of every original key.
+		Example:
+			keep, max_error = curve_simplify.simplify_keys(times, values, 0.01, curve_simplify.CUBIC)
+			times, values = times[keep], values[keep]
+	Params:
+		times - Key times, sorted and unique.
+		values - Key values.
+		tolerance - Largest allowed absolute error at the removed keys.
+		mode - LINEAR or CUBIC (see evaluate()).
+		slopes - Tangents for CUBIC, from key_slopes() by default.
+		fixed - Optional boolean mask of keys that must be kept (such as keys with constant interpolation and the keys after them).
+	Returns:
+		(keep, max_error): a boolean mask of the kept keys and the largest error at any original key.
+'''
+def simplify_keys(times, values, tolerance, mode = LINEAR, slopes = None, fixed = None):
+	times = np.asarray(times, dtype = np.float64)
+	values = np.asarray(values, dtype = np.float64)
+	num_keys = len(times)
+	keep = np.zeros(num_keys, dtype = bool)
+	if num_keys <= 2:
+		keep[:] = True
+		return keep, 0.0
+	if mode == CUBIC and slopes is None:
+		slopes = key_slopes(times, values)
+
+	keep[0] = keep[-1] = True
+	if fixed is not None:
+		keep |= np.asarray(fixed, dtype = bool)
+	anchors = np.flatnonzero(keep)
+	spans = list(zip(anchors[:-1].tolist(), anchors[1:].tolist()))
+	while spans:
+		first, last = spans.pop()
+		if last - first < 2:
+			continue
+		inner = slice(first + 1, last)
+		span_slopes = slopes[[first, last]] if mode == CUBIC else None
+		rebuilt = evaluate(times[[first, last]], values[[first, last]], times[inner], mode, span_slopes)
+		errors = np.abs(values[inner] - rebuilt)
+		worst = int(np.argmax(errors))
+		if errors[worst] > tolerance:
+			split = first + 1 + worst
+			keep[split] = True
+			spans.append((first, split))
+			spans.append((split, last))
+	return keep, max_error(times, values, keep, mode, slopes)
+
+'''
+	Summary:
+		Largest absolute error at the original keys of the curve rebuilt from the kept keys.
+'''
+def max_error(times, values, keep, mode = LINEAR, slopes = None):
+	times = np.asarray(times, dtype = np.float64)
+	values = np.asarray(values, dtype = np.float64)
+	if len(times) == 0:
+		return 0.0
+	rebuilt = evaluate(times[keep], values[keep], times, mode, slopes[keep] if slopes is not None else None)
+	return float(np.max(np.abs(values - rebuilt)))
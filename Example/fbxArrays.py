@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# fbxArrays.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 下午4:40:18
+
+# 把 FBX 数组属性解码为 NumPy 数组（Vertices, PolygonVertexIndex, KeyTime, KeyValueFloat ...）
+# Builds on fbxReader. Raw arrays are zero-copy np.frombuffer views over the file mapping, so keep the
+# FbxFile referenced while using them; zlib-compressed arrays are decompressed into new buffers.
+# decodeFiles() decodes a list of files in a process pool.
+
+# import fbxReader, fbxArrays
+# with fbxReader.FbxFile('E:/Git_Res/pythonUE4/Assets/Characters/Mannequin/Animations/ThirdPersonIdle.FBX') as fbx_file:
+#     curves = fbxArrays.readAnimationCurves(fbx_file)
+#     simplified, summary = fbxArrays.simplifyAnimationCurves(curves, 0.01)
+
+import zlib
+import multiprocessing
+
+import numpy as np
+
+import fbxReader
+import curve_simplify
+
+
+# FBX 数组类型码对应的 dtype（小端） NumPy dtype for each FBX array type code
+ARRAY_DTYPES = {
+    b'f' : np.dtype('<f4'),
+    b'd' : np.dtype('<f8'),
+    b'l' : np.dtype('<i8'),
+    b'i' : np.dtype('<i4'),
+    b'b' : np.dtype('?'),
+}
+
+# FBX 时间单位：每秒的 tick 数 FBX KTime ticks per second
+FBX_TICKS_PER_SECOND = 46186158000
+
+
+# 解码一个数组属性
+# fbx_file: obj fbxReader.FbxFile : 数组所在的文件
+# fbx_array: obj fbxReader.FbxArray : 数组描述
+# return: obj np.ndarray : 一维只读数组；未压缩时为文件映射上的视图
+def decodeArray(fbx_file, fbx_array):
+    dtype = ARRAY_DTYPES[fbx_array.type_code]
+    if fbx_array.encoding == 0:
+        return np.frombuffer(fbx_file.data, dtype, fbx_array.length, fbx_array.offset)
+    if fbx_array.encoding == 1:
+        payload = zlib.decompress(fbx_file.data[fbx_array.offset:fbx_array.offset + fbx_array.compressed_length])
+        return np.frombuffer(payload, dtype, fbx_array.length)
+    raise fbxReader.FbxFormatError('Unknown array encoding {0} at {1}'.format(fbx_array.encoding, fbx_array.offset))
+
+
+# 解码子节点 child_name 的第一个属性（数组）
+# node: obj fbxReader.FbxNode : 父节点，例如 Geometry
+# child_name: str : 子节点名称，例如 'Vertices'
+# return: obj np.ndarray : 子节点不存在时返回 None
+def readChildArray(node, child_name):
+    child = node.find(child_name)
+    if child is None or not isinstance(child.property(0), fbxReader.FbxArray):
+        return None
+    return decodeArray(node.fbx_file, child.property(0))
+
+
+# 读取所有网格的顶点和多边形索引
+# fbx_file: obj fbxReader.FbxFile : 已打开的文件
+# return: dict List : 每个 Geometry 一项 {'id', 'name', 'vertices' (N x 3), 'polygon_vertex_index'}
+#   polygon_vertex_index 中每个多边形的最后一个索引按 FBX 约定存为 ~index（负数）
+def readMeshArrays(fbx_file):
+    meshes = []
+    objects = fbx_file.find('Objects')
+    if objects is None:
+        return meshes
+    for geometry in objects.findAll('Geometry'):
+        if geometry.property(2) != 'Mesh':
+            continue
+        vertices = readChildArray(geometry, 'Vertices')
+        meshes.append({
+            'id' : geometry.property(0),
+            'name' : fbxReader.objectName(geometry.property(1)),
+            'vertices' : vertices.reshape(-1, 3) if vertices is not None else np.zeros((0, 3)),
+            'polygon_vertex_index' : readChildArray(geometry, 'PolygonVertexIndex'),
+        })
+    return meshes
+
+
+# 读取所有动画曲线
+# fbx_file: obj fbxReader.FbxFile : 已打开的文件
+# return: dict List : 每个 AnimationCurve 一项 {'id', 'key_time' (FBX tick), 'key_value'}
+def readAnimationCurves(fbx_file):
+    curves = []
+    objects = fbx_file.find('Objects')
+    if objects is None:
+        return curves
+    for curve in objects.findAll('AnimationCurve'):
+        curves.append({
+            'id' : curve.property(0),
+            'key_time' : readChildArray(curve, 'KeyTime'),
+            'key_value' : readChildArray(curve, 'KeyValueFloat'),
+        })
+    return curves
+
+
+# FBX tick 转换为秒
+# key_time: obj np.ndarray : int64 的 FBX tick
+# return: obj np.ndarray : float64 的秒
+def keyTimesToSeconds(key_time):
+    return key_time / float(FBX_TICKS_PER_SECOND)
+
+
+# 精简动画曲线：去掉可以由相邻关键帧在容差内插值得到的关键帧（见 curve_simplify）
+# 只计算结果，不修改文件；可以用来估计导入时 remove_redundant_keys 的效果，或把精简后的曲线写入序列
+# curves: dict List : readAnimationCurves() 的结果
+# tolerance: float : 被删除的关键帧允许的最大误差（曲线数值单位）
+# mode: str : curve_simplify.LINEAR 或 curve_simplify.CUBIC
+# return: (dict List, dict) : 每条曲线一项 {'id', 'keys', 'kept', 'max_error', 'key_time', 'key_value'}（保留的关键帧），
+#   以及汇总 {'curves', 'keys', 'keys_removed', 'max_error'}
+def simplifyAnimationCurves(curves, tolerance, mode=curve_simplify.LINEAR):
+    results = []
+    summary = {'curves' : 0, 'keys' : 0, 'keys_removed' : 0, 'max_error' : 0.0}
+    for curve in curves:
+        key_time, key_value = curve['key_time'], curve['key_value']
+        if key_time is None or key_value is None:
+            continue
+        keep, max_error = curve_simplify.simplify_keys(keyTimesToSeconds(key_time), key_value, tolerance, mode)
+        results.append({
+            'id' : curve['id'],
+            'keys' : len(key_time),
+            'kept' : int(keep.sum()),
+            'max_error' : max_error,
+            'key_time' : key_time[keep],
+            'key_value' : key_value[keep],
+        })
+        summary['curves'] += 1
+        summary['keys'] += len(key_time)
+        summary['keys_removed'] += len(key_time) - int(keep.sum())
+        summary['max_error'] = max(summary['max_error'], max_error)
+    return results, summary
+
+
+# 读取并复制一个文件的所有网格和曲线数组（在进程池中执行，返回值需要可以序列化）
+def _decodeFile(filename):
+    with fbxReader.FbxFile(filename) as fbx_file:
+        meshes = readMeshArrays(fbx_file)
+        curves = readAnimationCurves(fbx_file)
+        for item in meshes + curves:
+            for key, value in item.items():
+                if isinstance(value, np.ndarray):
+                    item[key] = value.copy() # 脱离文件映射，才能在关闭文件后传回主进程
+    return {'filename' : filename, 'meshes' : meshes, 'curves' : curves}
+
+
+# 使用进程池解码多个文件，解压缩在各个进程中并行执行
+# filenames: str List : 二进制 FBX 文件
+# processes: int : 进程数，默认为 CPU 核数
+# python_executable: str : 子进程使用的 python 解释器。在编辑器内调用时必须指定，
+#   否则 multiprocessing 会用编辑器程序本身启动子进程
+# return: dict List : 每个文件一项 {'filename', 'meshes', 'curves'}，顺序与 filenames 相同
+def decodeFiles(filenames, processes=None, python_executable=None):
+    if python_executable:
+        multiprocessing.set_executable(python_executable)
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(_decodeFile, filenames, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
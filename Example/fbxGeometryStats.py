@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# fbxGeometryStats.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 下午7:05:32
+
+# 导入前的几何统计，以及根据统计选择静态网格导入选项的策略
+# Triangle count, bounds and UV channels are computed from the FBX arrays with NumPy (see fbxArrays).
+# staticMeshImportPolicy() turns the statistics into the keyword arguments of
+# importAsset.buildStaticMeshImportOptions(), so the expensive steps (lightmap UV generation and
+# collision generation) only run when they are needed.
+
+# import fbxGeometryStats
+# stats = fbxGeometryStats.computeFileStats('E:/Git_Res/pythonUE4/Assets/Props/Chair/Meshes/SM_Chair.FBX')
+# # uv_channel_count 1 ('LightMapUV'), collision_mesh_count 1 (UCX_SM_Chair)
+# fbxGeometryStats.staticMeshImportPolicy(stats)  # {'generate_lightmap_uvs': False, 'auto_generate_collision': False}
+
+import numpy as np
+
+import fbxReader
+import fbxArrays
+
+
+# 自定义碰撞网格的名称前缀 Name prefixes of custom collision meshes (UCX_SM_Chair ...)
+COLLISION_PREFIXES = ('UCX_', 'UBX_', 'USP_', 'UCP_')
+
+# 光照贴图 UV 通道的名称前缀（不区分大小写） Name prefixes of UV channels that already are lightmap UVs (case insensitive)
+LIGHTMAP_UV_PREFIXES = ('lightmap',)
+
+# 低于这些阈值的网格不生成碰撞 Meshes below both thresholds get no generated collision
+SMALL_MESH_TRIANGLES = 64
+SMALL_MESH_EXTENT = 10.0 # 包围盒最长边（厘米） Longest bounding box side, in centimetres
+
+
+# 由 PolygonVertexIndex 计算三角形数（n 边形按 n - 2 个三角形计算）
+# polygon_vertex_index: obj np.ndarray : 每个多边形的最后一个索引为负数
+# return: int : 三角形数
+def triangleCount(polygon_vertex_index):
+    if polygon_vertex_index is None or len(polygon_vertex_index) == 0:
+        return 0
+    polygon_ends = np.flatnonzero(polygon_vertex_index < 0)
+    polygon_sizes = np.diff(np.concatenate(([-1], polygon_ends)))
+    return int(np.maximum(polygon_sizes - 2, 0).sum())
+
+
+# 计算文件中所有渲染网格的统计（自定义碰撞网格单独计数）
+# fbx_file: obj fbxReader.FbxFile : 已打开的文件
+# return: dict : 可以写入 JSON 的统计
+#   {'mesh_count', 'collision_mesh_count', 'triangle_count', 'vertex_count',
+#    'bounds_min', 'bounds_max', 'uv_channel_count', 'uv_channel_names'}
+def computeGeometryStats(fbx_file):
+    stats = {
+        'mesh_count' : 0,
+        'collision_mesh_count' : 0,
+        'triangle_count' : 0,
+        'vertex_count' : 0,
+        'bounds_min' : None,
+        'bounds_max' : None,
+        'uv_channel_count' : 0,
+        'uv_channel_names' : [],
+    }
+    objects = fbx_file.find('Objects')
+    geometry_nodes = dict((node.property(0), node) for node in objects.findAll('Geometry')) if objects is not None else {}
+    bounds_min = []
+    bounds_max = []
+    for mesh in fbxArrays.readMeshArrays(fbx_file):
+        if mesh['name'].upper().startswith(COLLISION_PREFIXES):
+            stats['collision_mesh_count'] += 1
+            continue
+        stats['mesh_count'] += 1
+        stats['triangle_count'] += triangleCount(mesh['polygon_vertex_index'])
+        stats['vertex_count'] += len(mesh['vertices'])
+        if len(mesh['vertices']):
+            bounds_min.append(mesh['vertices'].min(axis=0))
+            bounds_max.append(mesh['vertices'].max(axis=0))
+        uv_names = [layer.find('Name').property(0) for layer in geometry_nodes[mesh['id']].findAll('LayerElementUV') if layer.find('Name') is not None]
+        if len(uv_names) > stats['uv_channel_count']:
+            stats['uv_channel_count'] = len(uv_names)
+            stats['uv_channel_names'] = uv_names
+    if bounds_min:
+        stats['bounds_min'] = np.min(bounds_min, axis=0).tolist()
+        stats['bounds_max'] = np.max(bounds_max, axis=0).tolist()
+    return stats
+
+
+# 计算一个文件的统计；提供缓存时按内容哈希复用之前的结果
+# filename: str : 二进制 FBX 文件
+# cache: obj importCache.ImportCache : 可选的导入缓存，统计和文件哈希保存在一起
+# return: dict : 见 computeGeometryStats()
+def computeFileStats(filename, cache=None):
+    if cache is not None:
+        stats = cache.getStats(filename)
+        if stats is not None:
+            return stats
+    with fbxReader.FbxFile(filename) as fbx_file:
+        stats = computeGeometryStats(fbx_file)
+    if cache is not None:
+        cache.setStats(filename, stats)
+    return stats
+
+
+# 根据统计选择静态网格导入选项
+# stats: dict : computeGeometryStats() 的结果
+# small_mesh_triangles: int : 三角形数阈值
+# small_mesh_extent: float : 包围盒最长边阈值
+# return: dict : importAsset.buildStaticMeshImportOptions() 的关键字参数
+def staticMeshImportPolicy(stats, small_mesh_triangles=SMALL_MESH_TRIANGLES, small_mesh_extent=SMALL_MESH_EXTENT):
+    extent = 0.0
+    if stats['bounds_min'] is not None:
+        extent = float(np.max(np.subtract(stats['bounds_max'], stats['bounds_min'])))
+    small_mesh = stats['triangle_count'] < small_mesh_triangles and extent < small_mesh_extent
+    has_lightmap_uvs = any(name.lower().startswith(LIGHTMAP_UV_PREFIXES) for name in stats['uv_channel_names'])
+    return {
+        # 已有 LightMap* 通道或第二套 UV 时不再生成 A LightMap* channel or a second UV channel is used as the lightmap UV as is
+        'generate_lightmap_uvs' : not has_lightmap_uvs and stats['uv_channel_count'] < 2,
+        # 自带 UCX_ 碰撞或网格很小时不生成碰撞 Custom collision is imported from the file instead
+        'auto_generate_collision' : stats['collision_mesh_count'] == 0 and not small_mesh,
+    }
@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# fbxReader.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 下午2:14:05
+
+# 二进制 FBX 读取器（不依赖 unreal 模块，可以在编辑器外运行）
+# Memory-mapped, lazy node tree over the binary FBX format. Only node headers are read while walking
+# the tree; property values are parsed on demand and array payloads are never read here, they are
+# returned as FbxArray descriptors (offset, length, encoding) that can be decoded separately.
+
+# 在命令行中分类文件：
+#   python fbxReader.py ../Assets/Props/Chair/Meshes/SM_Chair.FBX ../Assets/Characters/Mannequin/Animations
+# 在代码中：
+#   import fbxReader
+#   fbxReader.classifyFbx('E:/Git_Res/pythonUE4/Assets/Props/Chair/Meshes/SM_Chair.FBX')  # 'static_mesh'
+
+import os
+import sys
+import mmap
+import time
+import struct
+
+
+# 文件头 File header: 21 bytes magic, 2 bytes unknown, uint32 version
+FBX_MAGIC = b'Kaydara FBX Binary  \x00'
+FBX_HEADER_SIZE = 27
+
+# 7500 及以上版本的节点记录使用 64 位偏移 Node records use 64 bit offsets from version 7500 on
+FBX_VERSION_64BIT = 7500
+
+# 标量属性的类型码 Scalar property type codes
+SCALAR_PROPERTY_FORMATS = {
+    b'Y' : '<h',
+    b'C' : '<?',
+    b'I' : '<i',
+    b'F' : '<f',
+    b'D' : '<d',
+    b'L' : '<q',
+}
+
+# 数组属性的类型码及元素格式 Array property type codes and their element format
+ARRAY_PROPERTY_FORMATS = {
+    b'f' : 'f',
+    b'd' : 'd',
+    b'l' : 'q',
+    b'i' : 'i',
+    b'b' : '?',
+}
+
+# 分类结果 Classification results
+STATIC_MESH = 'static_mesh'
+SKELETAL_MESH = 'skeletal_mesh'
+ANIMATION = 'animation'
+UNKNOWN = 'unknown'
+
+# 每种分类对应的 importAsset 导入选项函数 importAsset option builder for each classification
+IMPORT_OPTIONS_BUILDERS = {
+    STATIC_MESH : 'buildStaticMeshImportOptions',
+    SKELETAL_MESH : 'buildSkeletalMeshImportOptions',
+    ANIMATION : 'buildAnimationImportOptions',
+}
+
+
+class FbxFormatError(ValueError):
+    pass
+
+
+class FbxArray(object):
+    '''
+        Summary:
+            数组属性的描述（不读取数据）。Descriptor of an array property; the payload is left in the file.
+        Params:
+            type_code - One of b'f', b'd', b'l', b'i', b'b'.
+            length - Number of elements.
+            encoding - 0 for raw little-endian data, 1 for zlib-compressed data.
+            compressed_length - Size in bytes of the payload as stored in the file.
+            offset - File offset of the payload.
+    '''
+    __slots__ = ('type_code', 'length', 'encoding', 'compressed_length', 'offset')
+
+    def __init__(self, type_code, length, encoding, compressed_length, offset):
+        self.type_code = type_code
+        self.length = length
+        self.encoding = encoding
+        self.compressed_length = compressed_length
+        self.offset = offset
+
+    def __repr__(self):
+        return '<FbxArray {0} x{1} encoding={2} at {3}>'.format(self.type_code.decode('ascii'), self.length, self.encoding, self.offset)
+
+
+class FbxNode(object):
+    '''
+        Summary:
+            FBX 节点记录。子节点和属性在第一次访问时才读取。
+            A node record. Children and properties are read on first access.
+    '''
+    __slots__ = ('fbx_file', 'name', 'offset', 'end_offset', 'num_properties', 'property_list_len', 'properties_offset', '_properties', '_children')
+
+    def __init__(self, fbx_file, name, offset, end_offset, num_properties, property_list_len, properties_offset):
+        self.fbx_file = fbx_file
+        self.name = name
+        self.offset = offset
+        self.end_offset = end_offset
+        self.num_properties = num_properties
+        self.property_list_len = property_list_len
+        self.properties_offset = properties_offset
+        self._properties = None
+        self._children = None
+
+    @property
+    def properties(self):
+        if self._properties is None:
+            self._properties = self.fbx_file._readProperties(self)
+        return self._properties
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = self.fbx_file._readNodeList(self.properties_offset + self.property_list_len, self.end_offset)
+        return self._children
+
+    # 返回第一个名称匹配的子节点
+    def find(self, name):
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    # 返回所有名称匹配的子节点
+    def findAll(self, name):
+        return [child for child in self.children if child.name == name]
+
+    # 返回第 index 个属性（字符串属性解码为 str）
+    def property(self, index, default=None):
+        if index >= self.num_properties:
+            return default
+        return self.properties[index]
+
+    def __repr__(self):
+        return '<FbxNode {0} at {1}>'.format(self.name, self.offset)
+
+
+class FbxFile(object):
+    '''
+        Summary:
+            以内存映射方式打开的二进制 FBX 文件。
+            A binary FBX file opened through mmap. Use as a context manager or call close().
+        Params:
+            filename - Path to a binary FBX file. ASCII FBX files raise FbxFormatError.
+    '''
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise FbxFormatError('{0} is empty'.format(filename))
+        if self.data[:len(FBX_MAGIC)] != FBX_MAGIC:
+            self.close()
+            raise FbxFormatError('{0} is not a binary FBX file'.format(filename))
+        self.version = struct.unpack_from('<I', self.data, 23)[0]
+        if self.version >= FBX_VERSION_64BIT:
+            self._record_header = struct.Struct('<QQQB')
+        else:
+            self._record_header = struct.Struct('<IIIB')
+        self._nodes = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.data is not None:
+            try:
+                self.data.close()
+            except BufferError:
+                pass # 仍有数组引用这块内存（见 fbxArrays），映射在这些数组释放后关闭
+            self.data = None
+        self._file.close()
+
+    # 顶层节点（FBXHeaderExtension, Definitions, Objects, Connections ...）
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            self._nodes = self._readNodeList(FBX_HEADER_SIZE, len(self.data))
+        return self._nodes
+
+    # 返回第一个名称匹配的顶层节点
+    def find(self, name):
+        for node in self.nodes:
+            if node.name == name:
+                return node
+        return None
+
+    # 读取 [offset, end) 之间的节点记录，遇到空记录时结束；只读取记录头，跳过属性和子节点
+    def _readNodeList(self, offset, end):
+        nodes = []
+        record_header = self._record_header
+        while offset + record_header.size <= end:
+            end_offset, num_properties, property_list_len, name_len = record_header.unpack_from(self.data, offset)
+            if end_offset == 0:
+                break
+            name_offset = offset + record_header.size
+            name = self.data[name_offset:name_offset + name_len].decode('ascii', 'replace')
+            nodes.append(FbxNode(self, name, offset, end_offset, num_properties, property_list_len, name_offset + name_len))
+            offset = end_offset
+        return nodes
+
+    def _readProperties(self, node):
+        data = self.data
+        offset = node.properties_offset
+        properties = []
+        for i in range(node.num_properties):
+            type_code = data[offset:offset + 1]
+            offset += 1
+            if type_code in SCALAR_PROPERTY_FORMATS:
+                value_format = SCALAR_PROPERTY_FORMATS[type_code]
+                properties.append(struct.unpack_from(value_format, data, offset)[0])
+                offset += struct.calcsize(value_format)
+            elif type_code in ARRAY_PROPERTY_FORMATS:
+                length, encoding, compressed_length = struct.unpack_from('<III', data, offset)
+                offset += 12
+                properties.append(FbxArray(type_code, length, encoding, compressed_length, offset))
+                offset += compressed_length
+            elif type_code == b'S':
+                length = struct.unpack_from('<I', data, offset)[0]
+                offset += 4
+                properties.append(data[offset:offset + length].decode('utf-8', 'replace'))
+                offset += length
+            elif type_code == b'R':
+                length = struct.unpack_from('<I', data, offset)[0]
+                offset += 4
+                properties.append(data[offset:offset + length])
+                offset += length
+            else:
+                raise FbxFormatError('Unknown property type {0!r} in node {1} at {2}'.format(type_code, node.name, offset - 1))
+        return properties
+
+
+# 二进制 FBX 中的对象名为 "Name\x00\x01Class"，只返回 Name 部分
+def objectName(name):
+    return name.split(u'\x00\x01')[0]
+
+
+# 统计 Objects 下各类对象的数量
+# fbx_file: obj FbxFile : 已打开的文件
+# return: dict : {'geometry', 'skins', 'limb_nodes', 'animation_curves'}
+def objectCounts(fbx_file):
+    counts = {'geometry' : 0, 'skins' : 0, 'limb_nodes' : 0, 'animation_curves' : 0}
+    objects = fbx_file.find('Objects')
+    if objects is None:
+        return counts
+    for node in objects.children:
+        if node.name == 'Geometry' and node.property(2) == 'Mesh':
+            counts['geometry'] += 1
+        elif node.name == 'Deformer' and node.property(2) == 'Skin':
+            counts['skins'] += 1
+        elif node.name == 'Model' and node.property(2) == 'LimbNode':
+            counts['limb_nodes'] += 1
+        elif node.name == 'AnimationCurve':
+            counts['animation_curves'] += 1
+    return counts
+
+
+# 返回文件中材质的名称
+# fbx_file: obj FbxFile : 已打开的文件
+# return: str List : 例如 ['M_Chair']
+def materialNames(fbx_file):
+    objects = fbx_file.find('Objects')
+    if objects is None:
+        return []
+    return [objectName(node.property(1)) for node in objects.children if node.name == 'Material']
+
+
+# 判断 FBX 文件内容是静态网格、骨架网格还是动画
+# filename: str : 二进制 FBX 文件
+# return: str : STATIC_MESH, SKELETAL_MESH, ANIMATION 或 UNKNOWN
+def classifyFbx(filename):
+    with FbxFile(filename) as fbx_file:
+        counts = objectCounts(fbx_file)
+    if counts['skins']:
+        return SKELETAL_MESH
+    if counts['geometry']:
+        return STATIC_MESH
+    if counts['limb_nodes'] or counts['animation_curves']:
+        return ANIMATION
+    return UNKNOWN
+
+
+# 返回 importAsset 中适用于该文件的导入选项函数名
+# filename: str : 二进制 FBX 文件
+# return: str : 例如 'buildStaticMeshImportOptions'，无法分类时返回 None
+def selectImportOptionsBuilder(filename):
+    return IMPORT_OPTIONS_BUILDERS.get(classifyFbx(filename))
+
+
+if __name__ == "__main__":
+    filenames = []
+    for path in sys.argv[1:]:
+        if os.path.isdir(path):
+            for dirpath, dirnames, names in os.walk(path):
+                filenames.extend(os.path.join(dirpath, name) for name in sorted(names) if name.lower().endswith('.fbx'))
+        else:
+            filenames.append(path)
+    for filename in filenames:
+        start_time = time.time()
+        classification = classifyFbx(filename)
+        print('{0:<14} {1:7.2f}ms  {2}'.format(classification, (time.time() - start_time) * 1000.0, filename))
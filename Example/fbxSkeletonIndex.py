@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# fbxSkeletonIndex.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 下午9:31:47
+
+# 骨骼层级索引：自动为动画 FBX 找到对应的骨架，并按骨架分组（不依赖 unreal 模块）
+# The bone hierarchy of a file is the set of (parent, bone) name pairs of its Root/LimbNode models,
+# taken from the Objects and Connections nodes. Its hash identifies a skeleton. An animation matches
+# the skeleton with the same hash, or failing that the smallest skeleton whose hierarchy contains it.
+
+# import fbxSkeletonIndex
+# index = fbxSkeletonIndex.SkeletonIndex()
+# index.addSkeletalMesh('E:/Art/SK_Mannequin.FBX', '/Game/Mannequin/Character/Mesh/SK_Mannequin_Skeleton')
+# groups, unmatched = index.groupAnimations(['E:/Art/ThirdPersonRun.FBX', 'E:/Art/ThirdPersonWalk.FBX'])
+
+import os
+import json
+import hashlib
+
+import fbxReader
+
+
+# 作为骨骼的模型类型 Model types that are bones
+BONE_MODEL_TYPES = ('Root', 'LimbNode')
+
+
+# 读取骨骼层级
+# fbx_file: obj fbxReader.FbxFile : 已打开的文件
+# return: (str, str) List : 排序后的 (父骨骼名, 骨骼名)，根骨骼的父骨骼名为 ''
+def readBoneHierarchy(fbx_file):
+    objects = fbx_file.find('Objects')
+    connections = fbx_file.find('Connections')
+    if objects is None:
+        return []
+    bone_names = {}
+    for model in objects.findAll('Model'):
+        if model.property(2) in BONE_MODEL_TYPES:
+            bone_names[model.property(0)] = fbxReader.objectName(model.property(1))
+    parents = dict((bone_id, '') for bone_id in bone_names)
+    if connections is not None:
+        for connection in connections.children:
+            if connection.property(0) != 'OO':
+                continue
+            child_id, parent_id = connection.property(1), connection.property(2)
+            if child_id in bone_names and parent_id in bone_names:
+                parents[child_id] = bone_names[parent_id]
+    return sorted((parents[bone_id], bone_names[bone_id]) for bone_id in bone_names)
+
+
+# 骨骼层级的哈希
+# hierarchy: (str, str) List : readBoneHierarchy() 的结果
+# return: str : 十六进制摘要，没有骨骼时返回 None
+def hierarchyHash(hierarchy):
+    if not hierarchy:
+        return None
+    return hashlib.sha1('\n'.join('{0}/{1}'.format(parent, bone) for parent, bone in hierarchy).encode('utf-8')).hexdigest()
+
+
+# 读取文件的骨骼层级和哈希
+# filename: str : 二进制 FBX 文件
+# return: (str, (str, str) List) : (哈希, 层级)
+def readFileHierarchy(filename):
+    with fbxReader.FbxFile(filename) as fbx_file:
+        hierarchy = readBoneHierarchy(fbx_file)
+    return hierarchyHash(hierarchy), hierarchy
+
+
+class SkeletonIndex(object):
+    '''
+        Summary:
+            骨骼层级哈希到骨架资产路径的索引。
+            Maps bone hierarchy hashes to skeleton asset paths and matches animation files against them.
+        Params:
+            index_path - Optional JSON file the index is loaded from and saved to.
+    '''
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self.skeletons = {} # 哈希 -> {'skeleton_path', 'source', 'hierarchy'}
+        if index_path and os.path.isfile(index_path):
+            with open(index_path, 'r') as f:
+                self.skeletons = json.load(f)
+
+    # 用骨架网格（或任意带有完整骨骼的 FBX）登记一个骨架
+    # filename: str : 二进制 FBX 文件
+    # skeleton_path: str : 骨架资产路径，例如 '/Game/Mannequin/Character/Mesh/SK_Mannequin_Skeleton'
+    # return: str : 骨骼层级哈希
+    def addSkeletalMesh(self, filename, skeleton_path):
+        hash_value, hierarchy = readFileHierarchy(filename)
+        if hash_value is None:
+            raise ValueError('{0} has no bones'.format(filename))
+        self.skeletons[hash_value] = {
+            'skeleton_path' : skeleton_path,
+            'source' : filename,
+            'hierarchy' : [list(pair) for pair in hierarchy],
+        }
+        return hash_value
+
+    # 为动画文件找到骨架资产路径：优先哈希完全相同的骨架，其次是包含动画全部骨骼的最小骨架
+    # filename: str : 动画 FBX 文件
+    # return: str : 骨架资产路径，找不到时返回 None
+    def matchAnimation(self, filename):
+        hash_value, hierarchy = readFileHierarchy(filename)
+        if hash_value is None:
+            return None
+        if hash_value in self.skeletons:
+            return self.skeletons[hash_value]['skeleton_path']
+        pairs = set(hierarchy)
+        best = None
+        for skeleton in self.skeletons.values():
+            if len(skeleton['hierarchy']) < len(pairs):
+                continue
+            if pairs.issubset(tuple(pair) for pair in skeleton['hierarchy']):
+                if best is None or len(skeleton['hierarchy']) < len(best['hierarchy']):
+                    best = skeleton
+        return best['skeleton_path'] if best is not None else None
+
+    # 按骨架分组动画文件
+    # filenames: str List : 动画 FBX 文件
+    # return: (dict, str List) : ({骨架资产路径: 动画文件列表}, 找不到骨架的文件)
+    def groupAnimations(self, filenames):
+        groups = {}
+        unmatched = []
+        for filename in filenames:
+            skeleton_path = self.matchAnimation(filename)
+            if skeleton_path is None:
+                unmatched.append(filename)
+            else:
+                groups.setdefault(skeleton_path, []).append(filename)
+        return groups, unmatched
+
+    def save(self, index_path=None):
+        index_path = index_path or self.index_path
+        with open(index_path, 'w') as f:
+            json.dump(self.skeletons, f, indent=1, sort_keys=True)
+
+
+# 骨架网格导入后生成的骨架资产路径（UE 默认命名为 <网格名>_Skeleton）
+# filename: str : 骨架网格 FBX 文件
+# destination_path: str : 骨架网格导入到的资产目录
+# return: str : 骨架资产路径
+def importedSkeletonPath(filename, destination_path):
+    mesh_name = os.path.splitext(os.path.basename(filename))[0]
+    return '{0}/{1}_Skeleton'.format(destination_path.rstrip('/'), mesh_name)
@@ -13,6 +13,9 @@
 import unreal
 import os
 
+import importLedger
+import importProfiles
+
 
 # 要导入资产内容的源路径 
 asset_path = 'E:\Git_Res\pythonUE4\Assets\Meshes\SM_TableRound.FBX'
@@ -26,8 +29,9 @@ destination_path = '/Game/pyTest/Meshes'
 # filename: str : 要导入的资源的路径
 # destination_path: str : 资产路径
 # option: obj : 导入对象选项。对于导入时通常没有弹出窗口的资产，可以为“无”。（如声音、纹理等）
+# save: bool : 导入后立即保存。批量导入时可以关闭，导入结束后再统一保存（见 importDirectory.saveImportedAssets）
 # return: obj : The import task object
-def buildImportTask(filename='', destination_path='', options=None):
+def buildImportTask(filename='', destination_path='', options=None, save=True):
     # https://docs.unrealengine.com/en-US/PythonAPI/class/AssetImportTask.html?highlight=assetimporttask
     task = unreal.AssetImportTask() # 包含要导入的一组资产的数据
     task.automated = True # 避免对话框
@@ -36,15 +40,18 @@ def buildImportTask(filename='', destination_path='', options=None):
     task.filename = filename # 要导入的文件名
     task.replace_existing = True # 覆盖现有资产
     task.options = options # （对象） – [读写]特定于资产类型的导入选项
-    task.save = True # 导入后保存
+    task.save = save # 导入后保存
     
     # task.imported_object_paths # （Array（str））：[读写]导入后创建或更新的对象的路径
     return task
 
 
 # 建立静态网格导入选项
+# combine_meshes: bool : 合并网格
+# generate_lightmap_uvs: bool : 生成光照贴图 UV（文件中已有光照贴图 UV 时可以关闭，见 fbxGeometryStats）
+# auto_generate_collision: bool : 自动生成碰撞（文件中已有 UCX_ 碰撞或网格很小时可以关闭）
 # return: obj : Import option object. The basic import options for importing a static mesh 导入选项对象。用于导入静态网格的基本导入选项
-def buildStaticMeshImportOptions():
+def buildStaticMeshImportOptions(combine_meshes=True, generate_lightmap_uvs=True, auto_generate_collision=True):
     options = unreal.FbxImportUI()
     # unreal.FbxImportUI
     options.set_editor_property('import_mesh', True)
@@ -56,9 +63,9 @@ def buildStaticMeshImportOptions():
     options.static_mesh_import_data.set_editor_property('import_rotation', unreal.Rotator(0.0, 0.0, 0.0))
     options.static_mesh_import_data.set_editor_property('import_uniform_scale', 1.0)
     # unreal.FbxStaticMeshImportData
-    options.static_mesh_import_data.set_editor_property('combine_meshes', True)
-    options.static_mesh_import_data.set_editor_property('generate_lightmap_u_vs', True)
-    options.static_mesh_import_data.set_editor_property('auto_generate_collision', True)
+    options.static_mesh_import_data.set_editor_property('combine_meshes', combine_meshes)
+    options.static_mesh_import_data.set_editor_property('generate_lightmap_u_vs', generate_lightmap_uvs)
+    options.static_mesh_import_data.set_editor_property('auto_generate_collision', auto_generate_collision)
     return options
 
 
@@ -83,12 +90,13 @@ def buildSkeletalMeshImportOptions():
 
 # 建立动画导入选项
 # skeleton_path: str : Skeleton asset path of the skeleton that will be used to bind the animation
+# skeleton: obj unreal.Skeleton : 已加载的骨架资产。批量导入同一骨架的动画时传入，避免每个动画都 load_asset 一次
 # return: obj : Import option object. The basic import options for importing an animation
-def buildAnimationImportOptions(skeleton_path=''):
+def buildAnimationImportOptions(skeleton_path='', skeleton=None):
     options = unreal.FbxImportUI()
     # unreal.FbxImportUI
     options.set_editor_property('import_animations', True)
-    options.skeleton = unreal.load_asset(skeleton_path)
+    options.skeleton = skeleton if skeleton is not None else unreal.load_asset(skeleton_path)
     # unreal.FbxMeshImportData
     options.anim_sequence_import_data.set_editor_property('import_translation', unreal.Vector(0.0, 0.0, 0.0))
     options.anim_sequence_import_data.set_editor_property('import_rotation', unreal.Rotator(0.0, 0.0, 0.0))
@@ -101,15 +109,35 @@ def buildAnimationImportOptions(skeleton_path=''):
 
 # https://api.unrealengine.com/INT/PythonAPI/class/AssetToolsHelpers.html
 # https://api.unrealengine.com/INT/PythonAPI/class/AssetTools.html
+# 执行导入任务，返回每个任务的结果
+# tasks: obj List : 导入任务对象，可以从 buildImportTask() 获取
+# cache: obj importCache.ImportCache : 可选的增量导入缓存，跳过源文件和导入选项都没有变化的任务
+# ledger: obj importLedger.ImportLedger : 可选的结果台账
+# return: obj importLedger.ImportResult List : 每个提交的任务一项（被缓存跳过的任务不包含在内），
+#   包括源文件、导入选项配置、用时、导入的对象路径和失败原因
+def executeImportTaskResults(tasks, cache=None, ledger=None):
+    if cache is not None:
+        tasks = cache.filterTasks(tasks)
+    results = importLedger.runImportTasks(unreal.AssetToolsHelpers.get_asset_tools(), tasks, profile_name_of=importProfiles.optionsProfileName) # 使用指定的任务导入资产。
+    if cache is not None:
+        cache.recordTasks(tasks)
+        cache.save()
+    if ledger is not None:
+        ledger.record(results)
+    for result in results:
+        if not result.succeeded:
+            unreal.log_warning('Import of {0} failed: {1}'.format(result.source, result.failure))
+    return results
+
+
 # 执行导入任务
 # tasks: obj List : The import tasks object. You can get them from buildImportTask() 导入任务对象。您可以从buildImportTask（）获取它们
+# cache: obj importCache.ImportCache : 可选的增量导入缓存，跳过源文件和导入选项都没有变化的任务
 # return: str List : The paths of successfully imported assets 成功导入资产的路径
-def executeImportTasks(tasks):
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks(tasks) # 使用指定的任务导入资产。
+def executeImportTasks(tasks, cache=None):
     imported_asset_paths = []
-    for task in tasks:
-        for path in task.get_editor_property('imported_object_paths'):
-            imported_asset_paths.append(path)
+    for result in executeImportTaskResults(tasks, cache):
+        imported_asset_paths.extend(result.object_paths)
     return imported_asset_paths
 
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# importCache.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 上午11:26:40
+
+# 增量导入缓存：跳过源文件和导入选项都没有变化的导入任务
+# The manifest is a JSON file keyed by source path. Each entry stores the destination, file size,
+# mtime, a SHA-1 of the file content and a fingerprint of the import options used.
+# Pre-import analysis results (see fbxGeometryStats) are stored next to the same file hash.
+
+# import importAsset, importCache
+# cache = importCache.ImportCache('E:/Git_Res/pythonUE4/Saved/import_cache.json')
+# importAsset.executeImportTasks(tasks, cache)
+
+import unreal
+import os
+import json
+import hashlib
+
+import importProfiles
+
+
+# 读取文件内容时每次读取的字节数 Bytes read per call while hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# 影响导入结果的选项属性，用于计算导入选项指纹 Option properties that affect the import result
+# None 表示 FbxImportUI 本身，其余键为 FbxImportUI 上的子对象
+OPTION_FINGERPRINT_PROPERTIES = (
+    (None, ('import_mesh', 'import_textures', 'import_materials', 'import_as_skeletal', 'import_animations', 'skeleton')),
+    ('static_mesh_import_data', ('import_translation', 'import_rotation', 'import_uniform_scale',
+        'combine_meshes', 'generate_lightmap_u_vs', 'auto_generate_collision')),
+    ('skeletal_mesh_import_data', ('import_translation', 'import_rotation', 'import_uniform_scale',
+        'import_morph_targets', 'update_skeleton_reference_pose')),
+    ('anim_sequence_import_data', ('import_translation', 'import_rotation', 'import_uniform_scale',
+        'animation_length', 'remove_redundant_keys')),
+)
+
+
+# 计算文件内容的 SHA-1
+# filename: str : 文件路径
+# return: str : 十六进制摘要
+def hashFile(filename):
+    sha1 = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        block = f.read(HASH_BLOCK_SIZE)
+        while block:
+            sha1.update(block)
+            block = f.read(HASH_BLOCK_SIZE)
+    return sha1.hexdigest()
+
+
+# 把编辑器属性值转换为稳定的字符串（不包含对象的内存地址）
+def _propertyToString(value):
+    if value is None:
+        return 'None'
+    if isinstance(value, unreal.Vector):
+        return 'Vector({0!r}, {1!r}, {2!r})'.format(value.x, value.y, value.z)
+    if isinstance(value, unreal.Rotator):
+        return 'Rotator({0!r}, {1!r}, {2!r})'.format(value.roll, value.pitch, value.yaw)
+    if hasattr(value, 'get_path_name'):
+        return value.get_path_name()
+    return str(value)
+
+
+# 计算导入选项的指纹，导入选项变化时缓存条目失效
+# 由 importProfiles 构建的选项直接使用配置键，不再逐个读取编辑器属性
+# options: obj : 导入选项对象（unreal.FbxImportUI 或 None）
+# return: str : 十六进制摘要
+def optionsFingerprint(options):
+    if options is None:
+        return 'None'
+    profile_key = importProfiles.optionsProfileKey(options)
+    if profile_key is not None:
+        return profile_key
+    lines = [options.get_class().get_name()]
+    for sub_object_name, property_names in OPTION_FINGERPRINT_PROPERTIES:
+        owner = options if sub_object_name is None else options.get_editor_property(sub_object_name)
+        if owner is None:
+            continue
+        for property_name in property_names:
+            lines.append('{0}.{1}={2}'.format(sub_object_name, property_name, _propertyToString(owner.get_editor_property(property_name))))
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+class ImportCache(object):
+    '''
+        Summary:
+            持久化的导入清单。executeImportTasks 在导入前用 filterTasks() 去掉没有变化的任务，
+            导入后用 recordTasks() 记录成功导入的任务。
+            Persistent import manifest. A task is skipped when its source file (size, mtime and
+            content hash), destination and options fingerprint all match the stored entry.
+        Params:
+            manifest_path - Path of the JSON manifest. It is created on the first save().
+            verify_assets - Also require the previously imported assets to still exist in the project.
+    '''
+    def __init__(self, manifest_path, verify_assets=True):
+        self.manifest_path = manifest_path
+        self.verify_assets = verify_assets
+        self.entries = {}
+        self.stats = {}
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            self.entries = manifest.get('entries', {})
+            self.stats = manifest.get('stats', {})
+
+    @staticmethod
+    def sourceKey(filename):
+        return os.path.normcase(os.path.abspath(filename)).replace('\\', '/')
+
+    # 判断源文件是否需要重新导入
+    # filename: str : 源文件
+    # destination_path: str : 资产目录路径
+    # fingerprint: str : 导入选项指纹，见 optionsFingerprint()
+    # return: bool : True 表示可以跳过
+    def isUpToDate(self, filename, destination_path, fingerprint):
+        entry = self.entries.get(self.sourceKey(filename))
+        if entry is None or not os.path.isfile(filename):
+            return False
+        if entry['destination_path'] != destination_path or entry['options'] != fingerprint:
+            return False
+        stat = os.stat(filename)
+        if entry['size'] != stat.st_size:
+            return False
+        if entry['mtime'] != stat.st_mtime:
+            # 只有修改时间变化时才比较内容哈希 Touched but maybe unchanged: compare the content hash
+            if entry['sha1'] != hashFile(filename):
+                return False
+            entry['mtime'] = stat.st_mtime
+        if self.verify_assets:
+            for path in entry['imported_object_paths']:
+                if not unreal.EditorAssetLibrary.does_asset_exist(path):
+                    return False
+        return True
+
+    # 去掉不需要重新导入的任务
+    # tasks: obj List : 导入任务对象
+    # return: obj List : 需要导入的任务
+    def filterTasks(self, tasks):
+        pending_tasks = []
+        for task in tasks:
+            if not self.isUpToDate(task.filename, task.destination_path, optionsFingerprint(task.options)):
+                pending_tasks.append(task)
+        print('Import cache: {0} of {1} tasks unchanged, skipped'.format(len(tasks) - len(pending_tasks), len(tasks)))
+        return pending_tasks
+
+    # 记录已执行的任务，没有导入任何对象的任务不会被记录
+    # tasks: obj List : 已执行的导入任务对象
+    def recordTasks(self, tasks):
+        for task in tasks:
+            imported_object_paths = [str(path) for path in task.get_editor_property('imported_object_paths')]
+            key = self.sourceKey(task.filename)
+            if not imported_object_paths:
+                self.entries.pop(key, None)
+                continue
+            stat = os.stat(task.filename)
+            self.entries[key] = {
+                'destination_path' : task.destination_path,
+                'size' : stat.st_size,
+                'mtime' : stat.st_mtime,
+                'sha1' : hashFile(task.filename),
+                'options' : optionsFingerprint(task.options),
+                'imported_object_paths' : imported_object_paths,
+            }
+
+    # 源文件的哈希：大小和修改时间没有变化时直接使用 record 中记录的哈希
+    def _currentHash(self, filename, record):
+        stat = os.stat(filename)
+        if record is not None and record['size'] == stat.st_size and record['mtime'] == stat.st_mtime:
+            return record['sha1']
+        return hashFile(filename)
+
+    # 返回源文件的分析结果，文件内容变化后返回 None
+    # filename: str : 源文件
+    # return: dict : 之前用 setStats() 保存的结果
+    def getStats(self, filename):
+        record = self.stats.get(self.sourceKey(filename))
+        if record is None or not os.path.isfile(filename):
+            return None
+        if self._currentHash(filename, record) != record['sha1']:
+            return None
+        return record['stats']
+
+    # 保存源文件的分析结果（可以写入 JSON 的对象）
+    # filename: str : 源文件
+    # stats: dict : 分析结果
+    def setStats(self, filename, stats):
+        stat = os.stat(filename)
+        self.stats[self.sourceKey(filename)] = {
+            'size' : stat.st_size,
+            'mtime' : stat.st_mtime,
+            'sha1' : self._currentHash(filename, None),
+            'stats' : stats,
+        }
+
+    # 写回清单（先写临时文件再替换，避免中断时清单损坏）
+    def save(self):
+        directory = os.path.dirname(self.manifest_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'entries' : self.entries, 'stats' : self.stats}, f, indent=1, sort_keys=True)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        os.rename(temp_path, self.manifest_path)
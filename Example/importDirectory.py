@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# importDirectory.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/17 上午10:02:11
+
+# 批量导入目录（按块提交导入任务）
+# Walks a source tree (such as Assets/), builds every import task up front, mirrors the folder
+# layout under /Game and submits the tasks to import_asset_tasks in chunks.
+
+# import importDirectory
+# importDirectory.importDirectory('E:/Git_Res/pythonUE4/Assets', '/Game/Assets', chunk_size=100)
+
+import unreal
+import os
+import time
+
+import importAsset
+import importProfiles
+import importLedger
+import fbxReader
+import fbxGeometryStats
+
+
+# 参与导入的源文件扩展名 Source file extensions picked up by the directory walk
+IMPORT_EXTENSIONS = ('.fbx',)
+
+# 每次调用 import_asset_tasks 提交的任务数 Number of tasks submitted per import_asset_tasks call
+DEFAULT_CHUNK_SIZE = 50
+
+
+# 把源文件所在目录映射为 /Game 下的目标路径（保持源目录结构）
+# source_root: str : 源目录，例如 'E:/Git_Res/pythonUE4/Assets'
+# filename: str : source_root 下的源文件
+# destination_root: str : 目标根路径，例如 '/Game/Assets'
+# return: str : 资产目录路径，例如 '/Game/Assets/Props/Chair/Meshes'
+def mirrorDestinationPath(source_root, filename, destination_root='/Game'):
+    destination_root = destination_root.rstrip('/')
+    relative_dir = os.path.relpath(os.path.dirname(os.path.abspath(filename)), os.path.abspath(source_root))
+    if relative_dir == '.':
+        return destination_root
+    return '/'.join([destination_root] + relative_dir.replace('\\', '/').split('/'))
+
+
+# 遍历源目录，按稳定的顺序返回要导入的文件
+# source_root: str : 源目录
+# extensions: str tuple : 小写的扩展名
+# return: str List : 源文件路径（使用 '/' 分隔）
+def findSourceFiles(source_root, extensions=IMPORT_EXTENSIONS):
+    source_files = []
+    for dirpath, dirnames, filenames in os.walk(source_root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in extensions:
+                source_files.append(os.path.join(dirpath, name).replace('\\', '/'))
+    return source_files
+
+
+# 默认的导入选项：按静态网格导入
+# filename: str : 源文件
+# return: obj : 导入选项对象（所有文件共用同一个对象，见 importProfiles）
+def defaultOptionsBuilder(filename):
+    return importProfiles.getImportOptions('static_prop')
+
+
+# 读取 FBX 内容判断资产类型，再选择对应的导入选项配置（见 fbxReader.classifyFbx）
+# 静态网格根据几何统计关闭不需要的光照贴图 UV 和碰撞生成（见 fbxGeometryStats.staticMeshImportPolicy）
+# filename: str : 源文件
+# skeleton_path: str : 动画绑定的骨架资产路径
+# cache: obj importCache.ImportCache : 可选的导入缓存，用于复用几何统计
+# return: obj : 导入选项对象，无法分类的文件返回静态网格导入选项
+def classifiedOptionsBuilder(filename, skeleton_path='', cache=None):
+    classification = fbxReader.classifyFbx(filename) if filename.lower().endswith('.fbx') else fbxReader.UNKNOWN
+    profile_name = importProfiles.CLASSIFICATION_PROFILES.get(classification)
+    if profile_name is None:
+        return defaultOptionsBuilder(filename)
+    if classification == fbxReader.STATIC_MESH:
+        policy = fbxGeometryStats.staticMeshImportPolicy(fbxGeometryStats.computeFileStats(filename, cache))
+        overrides = {'static_mesh_import_data' : {
+            'generate_lightmap_u_vs' : policy['generate_lightmap_uvs'],
+            'auto_generate_collision' : policy['auto_generate_collision'],
+        }}
+        return importProfiles.getImportOptions(profile_name, overrides)
+    if classification == fbxReader.ANIMATION:
+        return importProfiles.getImportOptions(profile_name, skeleton_path=skeleton_path)
+    return importProfiles.getImportOptions(profile_name)
+
+
+# 一次性生成整个目录的导入任务
+# source_root: str : 源目录
+# destination_root: str : 目标根路径
+# options_builder: function : options_builder(filename) 返回该文件的导入选项，默认为 defaultOptionsBuilder
+# extensions: str tuple : 参与导入的扩展名
+# return: obj List : 导入任务对象
+def buildDirectoryImportTasks(source_root, destination_root='/Game', options_builder=None, extensions=IMPORT_EXTENSIONS):
+    if options_builder is None:
+        options_builder = defaultOptionsBuilder
+    tasks = []
+    for filename in findSourceFiles(source_root, extensions):
+        destination_path = mirrorDestinationPath(source_root, filename, destination_root)
+        tasks.append(importAsset.buildImportTask(filename, destination_path, options_builder(filename)))
+    return tasks
+
+
+# 批量保存已导入的资产（一次调用保存所有脏包）
+# asset_paths: str List : 资产路径，例如 task.imported_object_paths 中的路径
+# return: float : 保存用时（秒）
+def saveImportedAssets(asset_paths):
+    start_time = time.time()
+    assets = [unreal.EditorAssetLibrary.load_asset(path) for path in asset_paths]
+    assets = [asset for asset in assets if asset is not None]
+    if assets:
+        unreal.EditorAssetLibrary.save_loaded_assets(assets, True)
+    return time.time() - start_time
+
+
+# 按块执行导入任务，并报告每块的吞吐量
+# tasks: obj List : 导入任务对象，可以从 buildDirectoryImportTasks() 获取
+# chunk_size: int : 每次提交给 import_asset_tasks 的任务数
+# collect_garbage: bool : 每块结束后执行垃圾回收，避免编辑器内存持续增长
+# cache: obj importCache.ImportCache : 可选的增量导入缓存，没有变化的任务不会提交
+# deferred_save: bool : 导入时不逐个保存资产，改为在结束时（或每 save_every 个资产）批量保存
+# save_every: int : 延迟保存时，累计导入这么多资产后在块结束处保存一次；0 表示只在最后保存
+# ledger: obj importLedger.ImportLedger : 可选的结果台账，每块结束后写入
+# per_task_timing: bool : 块内每个任务单独提交，记录准确的单个任务用时（用于找出最慢的导入，吞吐量会下降）
+# return: (str List, dict List) : 成功导入资产的路径，以及每块的统计
+#   每块的统计：{'chunk', 'files', 'imported_objects', 'failures', 'seconds', 'save_seconds', 'files_per_minute', 'results'}
+#   results 为 importLedger.ImportResult 列表
+def executeImportTasksInChunks(tasks, chunk_size=DEFAULT_CHUNK_SIZE, collect_garbage=True, cache=None, deferred_save=False, save_every=0, ledger=None, per_task_timing=False):
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1, got {0}'.format(chunk_size))
+    if cache is not None:
+        tasks = cache.filterTasks(tasks)
+    if deferred_save:
+        for task in tasks:
+            task.save = False
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    imported_asset_paths = []
+    chunk_reports = []
+    unsaved_asset_paths = []
+    unsaved_tasks = []
+    num_chunks = (len(tasks) + chunk_size - 1) // chunk_size
+    for chunk_index in range(num_chunks):
+        chunk = tasks[chunk_index * chunk_size:(chunk_index + 1) * chunk_size]
+        start_time = time.time()
+        results = importLedger.runImportTasks(asset_tools, chunk, per_task_timing, importProfiles.optionsProfileName) # 一次调用导入整块任务
+        seconds = time.time() - start_time
+
+        imported_objects = 0
+        for result in results:
+            imported_asset_paths.extend(result.object_paths)
+            unsaved_asset_paths.extend(result.object_paths)
+            imported_objects += len(result.object_paths)
+            if not result.succeeded:
+                unreal.log_warning('Import of {0} failed: {1}'.format(result.source, result.failure))
+        unsaved_tasks.extend(chunk)
+        if ledger is not None:
+            ledger.record(results)
+
+        save_seconds = 0.0
+        last_chunk = chunk_index == num_chunks - 1
+        if not deferred_save or last_chunk or (save_every > 0 and len(unsaved_asset_paths) >= save_every):
+            if deferred_save:
+                save_seconds = saveImportedAssets(unsaved_asset_paths)
+            # 资产写入磁盘后才记录到缓存 Only record tasks in the cache once their assets are on disk
+            if cache is not None:
+                cache.recordTasks(unsaved_tasks)
+                cache.save()
+            unsaved_asset_paths = []
+            unsaved_tasks = []
+        if collect_garbage:
+            unreal.SystemLibrary.collect_garbage()
+
+        report = {
+            'chunk' : chunk_index,
+            'files' : len(chunk),
+            'imported_objects' : imported_objects,
+            'failures' : len([result for result in results if not result.succeeded]),
+            'seconds' : seconds,
+            'save_seconds' : save_seconds,
+            'files_per_minute' : len(chunk) * 60.0 / seconds if seconds > 0 else 0.0,
+            'results' : results,
+        }
+        chunk_reports.append(report)
+        print('Chunk {0}/{1}: {2} files, {3} objects in {4:.2f}s ({5:.1f} files/min){6}'.format(
+            chunk_index + 1, num_chunks, report['files'], imported_objects, seconds, report['files_per_minute'],
+            ', saved in {0:.2f}s'.format(save_seconds) if save_seconds else ''))
+
+    total_seconds = sum(report['seconds'] for report in chunk_reports)
+    if total_seconds > 0:
+        print('Imported {0} files in {1:.2f}s ({2:.1f} files/min, chunk size {3})'.format(
+            len(tasks), total_seconds, len(tasks) * 60.0 / total_seconds, chunk_size))
+    if deferred_save:
+        print('Import phase {0:.2f}s, save phase {1:.2f}s'.format(total_seconds, sum(report['save_seconds'] for report in chunk_reports)))
+    return imported_asset_paths, chunk_reports
+
+
+# 按骨架分组导入动画：每个骨架只加载一次，同一骨架的所有动画共用一份导入选项并批量提交
+# skeleton_index: obj fbxSkeletonIndex.SkeletonIndex : 已登记骨架的索引
+# filenames: str List : 动画 FBX 文件
+# source_root: str : 源目录
+# destination_root: str : 目标根路径
+# chunk_size: int : 每次提交给 import_asset_tasks 的任务数
+# cache: obj importCache.ImportCache : 可选的增量导入缓存
+# return: (str List, str List) : (成功导入资产的路径, 找不到骨架而没有导入的文件)
+def importAnimationsBySkeleton(skeleton_index, filenames, source_root, destination_root='/Game', chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    groups, unmatched = skeleton_index.groupAnimations(filenames)
+    for filename in unmatched:
+        unreal.log_warning('No skeleton matches the bone hierarchy of {0}, skipped'.format(filename))
+    imported_asset_paths = []
+    for skeleton_path in sorted(groups):
+        skeleton = unreal.load_asset(skeleton_path)
+        if skeleton is None:
+            unreal.log_warning('Skeleton {0} could not be loaded, skipped {1} animations'.format(skeleton_path, len(groups[skeleton_path])))
+            unmatched.extend(groups[skeleton_path])
+            continue
+        options = importProfiles.getImportOptions('animation', skeleton=skeleton)
+        tasks = [importAsset.buildImportTask(filename, mirrorDestinationPath(source_root, filename, destination_root), options) for filename in groups[skeleton_path]]
+        print('Importing {0} animations for skeleton {1}'.format(len(tasks), skeleton_path))
+        paths, chunk_reports = executeImportTasksInChunks(tasks, chunk_size, cache=cache)
+        imported_asset_paths.extend(paths)
+    return imported_asset_paths, unmatched
+
+
+# 导入整个目录
+# source_root: str : 源目录
+# destination_root: str : 目标根路径
+# chunk_size: int : 每次提交给 import_asset_tasks 的任务数
+# options_builder: function : options_builder(filename) 返回该文件的导入选项
+# cache: obj importCache.ImportCache : 可选的增量导入缓存
+# deferred_save: bool : 导入完成后批量保存，而不是每个资产导入后立即保存
+# save_every: int : 延迟保存时每累计多少个资产保存一次，0 表示只在最后保存
+# ledger: obj importLedger.ImportLedger : 可选的结果台账
+# per_task_timing: bool : 逐个任务计时，台账的 slowestImports() 需要它，见 executeImportTasksInChunks()
+# return: str List : 成功导入资产的路径
+def importDirectory(source_root, destination_root='/Game', chunk_size=DEFAULT_CHUNK_SIZE, options_builder=None, cache=None, deferred_save=False, save_every=0, ledger=None, per_task_timing=False):
+    tasks = buildDirectoryImportTasks(source_root, destination_root, options_builder)
+    print('Built {0} import tasks from {1}'.format(len(tasks), source_root))
+    imported_asset_paths, chunk_reports = executeImportTasksInChunks(tasks, chunk_size, cache=cache, deferred_save=deferred_save, save_every=save_every, ledger=ledger, per_task_timing=per_task_timing)
+    return imported_asset_paths
+
+
+if __name__ == "__main__":
+    importDirectory(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Assets'), '/Game/Assets')
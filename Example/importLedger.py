@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# importLedger.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/18 下午5:12:36
+
+# 导入结果：每个导入任务一条结构化记录，并写入本地 SQLite 台账（不依赖 unreal 模块，可以在编辑器外查询）
+# runImportTasks() wraps import_asset_tasks and returns one ImportResult per task (source, options
+# profile, wall time, produced object paths, failure reason). ImportLedger keeps the results of every
+# run in SQLite so the slowest imports and failure trends can be queried across runs.
+
+# import importLedger
+# ledger = importLedger.ImportLedger('E:/Git_Res/pythonUE4/Saved/import_ledger.db')
+# importDirectory.importDirectory('E:/Git_Res/pythonUE4/Assets', '/Game/Assets', ledger=ledger, per_task_timing=True)
+# for row in ledger.slowestImports(10): print(row)
+
+import os
+import json
+import time
+import sqlite3
+
+
+# 失败原因 Failure reasons recorded when the engine gives no error
+FAILURE_SOURCE_MISSING = 'source file not found'
+FAILURE_NO_OBJECTS = 'no objects imported'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    source TEXT NOT NULL,
+    destination TEXT,
+    profile TEXT,
+    wall_time REAL,
+    batch_size INTEGER,
+    object_count INTEGER,
+    object_paths TEXT,
+    failure TEXT
+);
+CREATE INDEX IF NOT EXISTS results_source ON results(source);
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+'''
+
+
+class ImportResult(object):
+    '''
+        Summary:
+            一个导入任务的结果。The result of one import task.
+        Params:
+            source - Source file.
+            destination - Content path the asset was imported into.
+            profile - Name of the import options profile (see importProfiles), '' if unknown.
+            wall_time - Seconds spent importing this task. When several tasks were imported by one
+                import_asset_tasks call, the call's time divided by batch_size.
+            batch_size - Number of tasks imported by the same call.
+            object_paths - Paths of the created or updated objects.
+            failure - Failure reason, None on success.
+    '''
+    __slots__ = ('source', 'destination', 'profile', 'wall_time', 'batch_size', 'object_paths', 'failure')
+
+    def __init__(self, source, destination, profile, wall_time, batch_size, object_paths, failure=None):
+        self.source = source
+        self.destination = destination
+        self.profile = profile
+        self.wall_time = wall_time
+        self.batch_size = batch_size
+        self.object_paths = object_paths
+        self.failure = failure
+
+    @property
+    def succeeded(self):
+        return self.failure is None
+
+    def __repr__(self):
+        return '<ImportResult {0} {1} {2:.3f}s>'.format(self.source, 'ok' if self.succeeded else self.failure, self.wall_time)
+
+
+# 执行导入任务并返回每个任务的结果
+# asset_tools: obj unreal.AssetTools : unreal.AssetToolsHelpers.get_asset_tools()
+# tasks: obj List : 导入任务对象
+# per_task_timing: bool : 每个任务单独调用一次 import_asset_tasks，得到准确的单个任务用时（失去批量提交的收益）
+# profile_name_of: function : profile_name_of(options) 返回导入选项的配置名，例如 importProfiles.optionsProfileName
+# return: obj ImportResult List : 与 tasks 顺序相同
+def runImportTasks(asset_tools, tasks, per_task_timing=False, profile_name_of=None):
+    batches = [[task] for task in tasks] if per_task_timing else ([list(tasks)] if tasks else [])
+    results = []
+    for batch in batches:
+        failure = None
+        start_time = time.time()
+        try:
+            asset_tools.import_asset_tasks(batch)
+        except Exception as e:
+            failure = 'exception: {0}'.format(e)
+        wall_time = (time.time() - start_time) / len(batch)
+        for task in batch:
+            object_paths = [str(path) for path in task.get_editor_property('imported_object_paths')]
+            task_failure = failure
+            if task_failure is None and not object_paths:
+                task_failure = FAILURE_SOURCE_MISSING if not os.path.isfile(task.filename) else FAILURE_NO_OBJECTS
+            profile = (profile_name_of(task.options) if profile_name_of is not None else None) or ''
+            results.append(ImportResult(task.filename, task.destination_path, profile, wall_time, len(batch), object_paths, task_failure))
+    return results
+
+
+class ImportLedger(object):
+    '''
+        Summary:
+            导入结果的 SQLite 台账。每次创建台账对象时开始一次新的运行（run）。
+            SQLite ledger of import results. Every ImportLedger instance records into a new run.
+        Params:
+            db_path - SQLite database file, created if missing.
+            label - Optional label of the run, such as 'nightly'.
+    '''
+    def __init__(self, db_path, label=None):
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(_SCHEMA)
+        cursor = self.connection.execute('INSERT INTO runs (started, label) VALUES (?, ?)', (time.time(), label))
+        self.run_id = cursor.lastrowid
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    # 写入结果
+    # results: obj ImportResult List : runImportTasks() 的结果
+    def record(self, results):
+        self.connection.executemany(
+            'INSERT INTO results (run_id, source, destination, profile, wall_time, batch_size, object_count, object_paths, failure) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(self.run_id, result.source, result.destination, result.profile, result.wall_time, result.batch_size,
+                len(result.object_paths), json.dumps(result.object_paths), result.failure) for result in results])
+        self.connection.commit()
+
+    # 最慢的导入（所有运行中每个源文件的平均用时）
+    # 只有单独计时的结果（per_task_timing=True，batch_size 为 1）是单个任务的真实用时；批量导入记录的是整批用时除以任务数，
+    # 一个很慢的文件会被平均掉，所以默认只按单独计时的结果排名。
+    # Only results imported with per_task_timing=True (batch_size 1) are real per-task times; batched results store the batch
+    # time divided by the batch size, so they are left out unless include_batched is set, and then ranked after the single ones.
+    # limit: int : 返回的行数
+    # include_batched: bool : 同时返回批量导入的平均用时（排在单独计时的结果之后）
+    # return: tuple List : (source, profile, batched, runs, average wall_time, max wall_time)
+    def slowestImports(self, limit=20, include_batched=False):
+        return self.connection.execute(
+            'SELECT source, profile, batch_size > 1 AS batched, COUNT(*), AVG(wall_time), MAX(wall_time) FROM results '
+            'WHERE failure IS NULL AND (? OR batch_size = 1) GROUP BY source, profile, batched '
+            'ORDER BY batched, AVG(wall_time) DESC LIMIT ?', (1 if include_batched else 0, limit)).fetchall()
+
+    # 每次运行的失败数，按失败原因分组
+    # return: tuple List : (run_id, started, label, failure, count)
+    def failureTrends(self):
+        return self.connection.execute(
+            'SELECT runs.id, runs.started, runs.label, results.failure, COUNT(*) FROM results JOIN runs ON runs.id = results.run_id '
+            'WHERE results.failure IS NOT NULL GROUP BY runs.id, results.failure ORDER BY runs.id, COUNT(*) DESC').fetchall()
+
+    # 每种配置的导入数和平均用时，用于决定优化哪一类资产
+    # return: tuple List : (profile, count, average wall_time, total wall_time)
+    def profileSummary(self):
+        return self.connection.execute(
+            'SELECT profile, COUNT(*), AVG(wall_time), SUM(wall_time) FROM results WHERE failure IS NULL '
+            'GROUP BY profile ORDER BY SUM(wall_time) DESC').fetchall()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# importProfiles.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/18 下午2:20:09
+
+# 声明式的导入选项配置，构建一次后缓存复用
+# Each profile lists the FbxImportUI properties that importAsset's build*ImportOptions() functions set
+# one call at a time. getImportOptions() builds the unreal.FbxImportUI for a profile once and returns
+# the same object for every later request with the same key (profile fields, overrides and skeleton),
+# so a large import makes a handful of set_editor_property calls instead of ten per file.
+
+# import importProfiles
+# options = importProfiles.getImportOptions('static_prop')
+# options = importProfiles.getImportOptions('static_prop', {'static_mesh_import_data': {'auto_generate_collision': False}})
+# options = importProfiles.getImportOptions('animation', skeleton_path='/Game/Mannequin/Character/Mesh/SK_Mannequin_Skeleton')
+
+import unreal
+import copy
+import json
+import hashlib
+
+
+# 配置：{子对象名: {属性名: 值}}，'import_ui' 表示 FbxImportUI 本身
+# 向量和旋转写为元组，枚举写为名称，见 _VALUE_CONVERTERS
+PROFILES = {
+    # 与 importAsset.buildStaticMeshImportOptions() 相同
+    'static_prop' : {
+        'import_ui' : {
+            'import_mesh' : True,
+            'import_textures' : False,
+            'import_materials' : False,
+            'import_as_skeletal' : False,
+        },
+        'static_mesh_import_data' : {
+            'import_translation' : (0.0, 0.0, 0.0),
+            'import_rotation' : (0.0, 0.0, 0.0),
+            'import_uniform_scale' : 1.0,
+            'combine_meshes' : True,
+            'generate_lightmap_u_vs' : True,
+            'auto_generate_collision' : True,
+        },
+    },
+    # 与 importAsset.buildSkeletalMeshImportOptions() 相同
+    'skeletal_char' : {
+        'import_ui' : {
+            'import_mesh' : True,
+            'import_textures' : False,
+            'import_materials' : False,
+            'import_as_skeletal' : True,
+        },
+        'skeletal_mesh_import_data' : {
+            'import_translation' : (0.0, 0.0, 0.0),
+            'import_rotation' : (0.0, 0.0, 0.0),
+            'import_uniform_scale' : 1.0,
+            'import_morph_targets' : True,
+            'update_skeleton_reference_pose' : False,
+        },
+    },
+    # 与 importAsset.buildAnimationImportOptions() 相同，骨架由 getImportOptions() 的参数指定
+    'animation' : {
+        'import_ui' : {
+            'import_animations' : True,
+        },
+        'anim_sequence_import_data' : {
+            'import_translation' : (0.0, 0.0, 0.0),
+            'import_rotation' : (0.0, 0.0, 0.0),
+            'import_uniform_scale' : 1.0,
+            'animation_length' : 'FBXALIT_EXPORTED_TIME',
+            'remove_redundant_keys' : False,
+        },
+    },
+}
+
+# fbxReader.classifyFbx() 的分类对应的配置 Profile used for each fbxReader classification
+CLASSIFICATION_PROFILES = {
+    'static_mesh' : 'static_prop',
+    'skeletal_mesh' : 'skeletal_char',
+    'animation' : 'animation',
+}
+
+# 配置中的值到编辑器属性值的转换 Conversion of profile values to editor property values
+_VALUE_CONVERTERS = {
+    'import_translation' : lambda value: unreal.Vector(*value),
+    'import_rotation' : lambda value: unreal.Rotator(*value),
+    'animation_length' : lambda value: getattr(unreal.FBXAnimationLengthImportType, value),
+}
+
+# 已构建的导入选项 {配置键: unreal.FbxImportUI}
+_options_cache = {}
+# 已构建的导入选项的配置键 {对象路径: 配置键}，供 importCache.optionsFingerprint 使用
+# 使用对象路径而不是 id()，因为从 task.options 读回的 Python 包装对象不一定是同一个
+_fingerprints = {}
+# 已构建的导入选项的配置名 {对象路径: 配置名}，供 importLedger 记录
+_profile_names = {}
+
+
+# 资产路径统一为对象路径，'/Game/A/SK_Skeleton' -> '/Game/A/SK_Skeleton.SK_Skeleton'
+def _objectPath(path):
+    if not path or '.' in path.rsplit('/', 1)[-1]:
+        return path or ''
+    return '{0}.{1}'.format(path, path.rsplit('/', 1)[-1])
+
+
+# 合并配置和覆盖项
+# profile_name: str : PROFILES 中的配置名
+# overrides: dict : {子对象名: {属性名: 值}}，覆盖配置中的值
+# return: dict : 合并后的配置
+def resolveProfile(profile_name, overrides=None):
+    if profile_name not in PROFILES:
+        raise KeyError('Unknown import profile {0!r}, expected one of {1}'.format(profile_name, ', '.join(sorted(PROFILES))))
+    profile = copy.deepcopy(PROFILES[profile_name])
+    for section, values in (overrides or {}).items():
+        profile.setdefault(section, {}).update(values)
+    return profile
+
+
+# 配置键：包含所有影响导入结果的字段
+# profile: dict : resolveProfile() 的结果
+# skeleton_path: str : 骨架资产路径（动画）
+# return: str : 十六进制摘要
+def profileKey(profile, skeleton_path=''):
+    canonical = json.dumps({'profile' : profile, 'skeleton' : _objectPath(skeleton_path)}, sort_keys=True)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+# 按配置构建新的导入选项对象
+# profile: dict : resolveProfile() 的结果
+# skeleton: obj unreal.Skeleton : 动画绑定的骨架
+# return: obj unreal.FbxImportUI : 导入选项
+def buildImportOptions(profile, skeleton=None):
+    options = unreal.FbxImportUI()
+    for section, values in profile.items():
+        owner = options if section == 'import_ui' else options.get_editor_property(section)
+        for property_name, value in values.items():
+            if property_name in _VALUE_CONVERTERS:
+                value = _VALUE_CONVERTERS[property_name](value)
+            owner.set_editor_property(property_name, value)
+    if skeleton is not None:
+        options.skeleton = skeleton
+    return options
+
+
+# 返回配置对应的导入选项；相同的配置键只构建一次，之后返回同一个对象
+# profile_name: str : PROFILES 中的配置名
+# overrides: dict : {子对象名: {属性名: 值}}
+# skeleton_path: str : 动画绑定的骨架资产路径，只在第一次构建时加载
+# skeleton: obj unreal.Skeleton : 已加载的骨架，提供时不再按 skeleton_path 加载
+# return: obj unreal.FbxImportUI : 导入选项（多个导入任务共用，不要修改）
+def getImportOptions(profile_name, overrides=None, skeleton_path='', skeleton=None):
+    if skeleton is not None:
+        skeleton_path = skeleton.get_path_name()
+    profile = resolveProfile(profile_name, overrides)
+    key = profileKey(profile, skeleton_path)
+    options = _options_cache.get(key)
+    if options is None:
+        if skeleton is None and skeleton_path:
+            skeleton = unreal.load_asset(skeleton_path)
+        options = buildImportOptions(profile, skeleton)
+        _options_cache[key] = options
+        _fingerprints[options.get_path_name()] = key
+        _profile_names[options.get_path_name()] = profile_name
+    return options
+
+
+# 返回由 getImportOptions() 构建的导入选项的配置键，其它对象返回 None
+# options: obj unreal.FbxImportUI : 导入选项
+# return: str : 配置键
+def optionsProfileKey(options):
+    return _fingerprints.get(options.get_path_name())
+
+
+# 返回由 getImportOptions() 构建的导入选项的配置名，其它对象返回 None
+# options: obj unreal.FbxImportUI : 导入选项
+# return: str : 配置名，例如 'static_prop'
+def optionsProfileName(options):
+    if options is None:
+        return None
+    return _profile_names.get(options.get_path_name())
+
+
+# 清空缓存（修改 PROFILES 或重新加载骨架后调用）
+def clearCache():
+    _options_cache.clear()
+    _fingerprints.clear()
+    _profile_names.clear()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# importScheduler.py
+# @Author :  ()
+# @Link   :
+# @Date   : 2026/10/18 上午9:48:20
+
+# 按依赖关系分波导入（骨架网格 -> 骨架 -> 动画，网格 -> 材质）
+# A manifest lists the import tasks. Dependencies come from each entry's "depends" list and from two
+# implicit rules: an animation depends on the task producing its skeleton (matched by skeleton path
+# or by bone hierarchy, see fbxSkeletonIndex), and a material depends on the mesh tasks whose FBX
+# uses a material of that name (or lists it under "materials"). The graph is run in topological
+# waves; every wave is submitted together, and dependents of a task that imported nothing are skipped.
+
+# 清单格式 Manifest format (JSON):
+# {
+#     "source_root": "E:/Git_Res/pythonUE4/Assets",     # 可选，用于推导 destination
+#     "destination_root": "/Game/Assets",
+#     "tasks": [
+#         {"name": "SK_Mannequin", "source": "E:/.../SK_Mannequin.FBX", "kind": "skeletal_mesh"},
+#         {"name": "ThirdPersonRun", "source": "E:/.../ThirdPersonRun.FBX", "kind": "animation"},
+#         {"name": "T_Chair_N", "source": "E:/.../T_Chair_N.TGA", "kind": "texture"},
+#         {"name": "SM_Chair", "source": "E:/.../SM_Chair.FBX", "destination": "/Game/Props", "depends": ["T_Chair_N"]}
+#     ]
+# }
+# kind 省略时由 fbxReader.classifyFbx 判断；网格的 materials 省略时从 FBX 中读取。
+
+# import importScheduler
+# importScheduler.runManifest('E:/Git_Res/pythonUE4/import_manifest.json', dry_run=True)
+
+import unreal
+import os
+import json
+
+import importAsset
+import importDirectory
+import importProfiles
+import fbxReader
+import fbxSkeletonIndex
+
+
+# 任务类型，以及同一波内的提交顺序 Task kinds, in the order they are submitted within a wave
+TASK_KINDS = ('texture', 'skeletal_mesh', 'skeleton', 'static_mesh', 'material', 'animation', 'other')
+
+# 提供骨架的任务类型 Kinds of task that produce a skeleton
+SKELETON_PROVIDER_KINDS = ('skeletal_mesh', 'skeleton')
+
+# 使用材质的任务类型 Kinds of task whose materials import after them
+MESH_KINDS = ('skeletal_mesh', 'static_mesh')
+
+
+class ImportNode(object):
+    '''
+        Summary:
+            调度图中的一个导入任务。A single import task of the dependency graph.
+        Params:
+            name - Unique name used by "depends".
+            source - Source file.
+            destination - Content path the asset is imported into.
+            kind - One of TASK_KINDS.
+            depends - Names of the tasks that must be imported first.
+            skeleton_path - For skeleton providers, the skeleton asset they produce; for animations,
+                the skeleton asset they bind to.
+            materials - For meshes, the names of the materials they use.
+    '''
+    def __init__(self, name, source, destination, kind, depends=None, skeleton_path=None, materials=None):
+        self.name = name
+        self.source = source
+        self.destination = destination
+        self.kind = kind
+        self.depends = list(depends or [])
+        self.skeleton_path = skeleton_path
+        self.materials = list(materials or [])
+
+    def __repr__(self):
+        return '<ImportNode {0} ({1})>'.format(self.name, self.kind)
+
+
+# 由清单中的一项生成 ImportNode
+def _nodeFromEntry(entry, source_root=None, destination_root='/Game'):
+    source = entry['source'].replace('\\', '/')
+    name = entry.get('name') or os.path.splitext(os.path.basename(source))[0]
+    destination = entry.get('destination')
+    if destination is None:
+        destination = importDirectory.mirrorDestinationPath(source_root, source, destination_root) if source_root else destination_root
+    kind = entry.get('kind')
+    if kind is None:
+        kind = fbxReader.classifyFbx(source) if source.lower().endswith('.fbx') else 'other'
+        if kind == fbxReader.UNKNOWN:
+            kind = 'other'
+    if kind not in TASK_KINDS:
+        raise ValueError('Task {0} has unknown kind {1!r}'.format(name, kind))
+    skeleton_path = entry.get('skeleton')
+    if skeleton_path is None and kind == 'skeletal_mesh':
+        skeleton_path = fbxSkeletonIndex.importedSkeletonPath(source, destination)
+    materials = entry.get('materials')
+    if materials is None and kind in MESH_KINDS and source.lower().endswith('.fbx'):
+        with fbxReader.FbxFile(source) as fbx_file:
+            materials = fbxReader.materialNames(fbx_file)
+    return ImportNode(name, source, destination, kind, entry.get('depends'), skeleton_path, materials)
+
+
+# 读取清单
+# manifest_path: str : JSON 清单
+# return: obj ImportNode List : 导入任务
+def loadManifest(manifest_path):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    source_root = manifest.get('source_root')
+    destination_root = manifest.get('destination_root', '/Game')
+    return [_nodeFromEntry(entry, source_root, destination_root) for entry in manifest['tasks']]
+
+
+# 由源目录生成导入任务（类型由文件内容判断）
+# source_root: str : 源目录
+# destination_root: str : 目标根路径
+# return: obj ImportNode List : 导入任务
+def manifestFromDirectory(source_root, destination_root='/Game'):
+    return [_nodeFromEntry({'source' : filename}, source_root, destination_root) for filename in importDirectory.findSourceFiles(source_root)]
+
+
+# 建立依赖图：显式的 depends，加上动画对骨架提供者、材质对使用它的网格的隐式依赖
+# nodes: obj ImportNode List : 导入任务
+# return: dict : {任务名: 依赖的任务名集合}
+def buildDependencyGraph(nodes):
+    nodes_by_name = {}
+    for node in nodes:
+        if node.name in nodes_by_name:
+            raise ValueError('Duplicate task name {0}'.format(node.name))
+        nodes_by_name[node.name] = node
+
+    skeleton_providers = {}
+    skeleton_index = fbxSkeletonIndex.SkeletonIndex()
+    for node in nodes:
+        if node.kind in SKELETON_PROVIDER_KINDS and node.skeleton_path:
+            skeleton_providers[node.skeleton_path] = node.name
+            if node.source.lower().endswith('.fbx'):
+                skeleton_index.addSkeletalMesh(node.source, node.skeleton_path)
+
+    # 材质名（小写） -> 使用它的网格任务 Material name (lower case) -> mesh tasks using it
+    material_users = {}
+    for node in nodes:
+        if node.kind in MESH_KINDS:
+            for material in node.materials:
+                material_users.setdefault(material.lower(), set()).add(node.name)
+
+    graph = {}
+    for node in nodes:
+        depends = set(node.depends)
+        for name in depends:
+            if name not in nodes_by_name:
+                raise ValueError('Task {0} depends on unknown task {1}'.format(node.name, name))
+        if node.kind == 'animation':
+            if node.skeleton_path is None and node.source.lower().endswith('.fbx'):
+                node.skeleton_path = skeleton_index.matchAnimation(node.source)
+            # 骨架已经存在于项目中时没有依赖 No dependency when the skeleton already exists in the project
+            if node.skeleton_path in skeleton_providers:
+                depends.add(skeleton_providers[node.skeleton_path])
+        elif node.kind == 'material':
+            depends.update(material_users.get(node.name.lower(), ()))
+        depends.discard(node.name)
+        graph[node.name] = depends
+    return graph
+
+
+# 按拓扑顺序把任务分成若干波，同一波内的任务互不依赖
+# nodes: obj ImportNode List : 导入任务
+# graph: dict : 可选，buildDependencyGraph() 的结果
+# return: obj ImportNode List List : 每一波的任务
+def planWaves(nodes, graph=None):
+    if graph is None:
+        graph = buildDependencyGraph(nodes)
+    nodes_by_name = dict((node.name, node) for node in nodes)
+    remaining = dict((name, set(depends)) for name, depends in graph.items())
+    waves = []
+    while remaining:
+        ready = [name for name, depends in remaining.items() if not depends]
+        if not ready:
+            raise ValueError('Dependency cycle between tasks: {0}'.format(', '.join(sorted(remaining))))
+        ready.sort(key=lambda name: (TASK_KINDS.index(nodes_by_name[name].kind), name))
+        waves.append([nodes_by_name[name] for name in ready])
+        for name in ready:
+            del remaining[name]
+        for depends in remaining.values():
+            depends.difference_update(ready)
+    return waves
+
+
+# 打印计划
+# waves: obj ImportNode List List : planWaves() 的结果
+def printWaves(waves):
+    for wave_index, wave in enumerate(waves):
+        print('Wave {0}: {1} tasks'.format(wave_index + 1, len(wave)))
+        for node in wave:
+            suffix = ' (skeleton {0})'.format(node.skeleton_path) if node.kind == 'animation' else ''
+            print('    {0:<14} {1} -> {2}{3}'.format(node.kind, node.source, node.destination, suffix))
+
+
+# 生成一波的导入任务；导入选项来自 importProfiles，同一骨架的动画共用一份导入选项，骨架只加载一次
+# wave: obj ImportNode List : 一波的任务
+# cache: obj importCache.ImportCache : 可选的导入缓存，用于复用几何统计
+# return: (obj List, obj ImportNode List) : 导入任务对象，以及对应的 ImportNode
+def buildWaveTasks(wave, cache=None):
+    tasks = []
+    task_nodes = []
+    for node in wave:
+        if node.kind == 'static_mesh':
+            options = importDirectory.classifiedOptionsBuilder(node.source, cache=cache)
+        elif node.kind == 'skeletal_mesh':
+            options = importProfiles.getImportOptions('skeletal_char')
+        elif node.kind == 'animation':
+            if not node.skeleton_path or not unreal.EditorAssetLibrary.does_asset_exist(node.skeleton_path):
+                unreal.log_warning('No skeleton for animation {0}, skipped'.format(node.source))
+                continue
+            options = importProfiles.getImportOptions('animation', skeleton_path=node.skeleton_path)
+        else:
+            options = None # 贴图、材质等由导入工厂自动处理
+        tasks.append(importAsset.buildImportTask(node.source, node.destination, options))
+        task_nodes.append(node)
+    return tasks, task_nodes
+
+
+# 按波执行导入
+# nodes: obj ImportNode List : 导入任务
+# dry_run: bool : 只打印计划，不导入
+# chunk_size: int : 每次提交给 import_asset_tasks 的任务数
+# cache: obj importCache.ImportCache : 可选的增量导入缓存
+# deferred_save: bool : 每一波导入完成后批量保存，见 importDirectory.executeImportTasksInChunks()
+# ledger: obj importLedger.ImportLedger : 可选的结果台账
+# return: (obj ImportNode List List, str List) : (计划的波, 成功导入资产的路径)
+def runSchedule(nodes, dry_run=False, chunk_size=importDirectory.DEFAULT_CHUNK_SIZE, cache=None, deferred_save=False, ledger=None):
+    graph = buildDependencyGraph(nodes)
+    waves = planWaves(nodes, graph)
+    printWaves(waves)
+    if dry_run:
+        return waves, []
+
+    failed = set()
+    imported_asset_paths = []
+    for wave_index, wave in enumerate(waves):
+        runnable = []
+        for node in wave:
+            if graph[node.name] & failed:
+                unreal.log_warning('Skipping {0}: a dependency failed to import'.format(node.name))
+                failed.add(node.name)
+            else:
+                runnable.append(node)
+        tasks, task_nodes = buildWaveTasks(runnable, cache)
+        failed.update(node.name for node in runnable if node not in task_nodes)
+        # 缓存过滤在 executeImportTasksInChunks 中进行；被跳过的任务资产是最新的，不算失败 Tasks skipped by the cache are up to date
+        print('Running wave {0}/{1} ({2} tasks)'.format(wave_index + 1, len(waves), len(tasks)))
+        paths, chunk_reports = importDirectory.executeImportTasksInChunks(tasks, chunk_size, cache=cache, deferred_save=deferred_save, ledger=ledger)
+        imported_asset_paths.extend(paths)
+        failed_sources = set(result.source for report in chunk_reports for result in report['results'] if not result.succeeded)
+        for task, node in zip(tasks, task_nodes):
+            if task.filename in failed_sources:
+                failed.add(node.name)
+    return waves, imported_asset_paths
+
+
+# 读取清单并执行
+# manifest_path: str : JSON 清单
+# dry_run: bool : 只打印计划，不导入
+# return: (obj ImportNode List List, str List) : 见 runSchedule()
+def runManifest(manifest_path, dry_run=False, chunk_size=importDirectory.DEFAULT_CHUNK_SIZE, cache=None, deferred_save=False, ledger=None):
+    return runSchedule(loadManifest(manifest_path), dry_run, chunk_size, cache, deferred_save, ledger)
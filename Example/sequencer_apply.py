@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Applies an exported document (see sequencer_export) back onto a LevelSequence.
+# The document and the current asset are both turned into sequencer_hash trees. Subtrees with equal hashes are skipped
+# without touching the engine; only tracks and sections that are missing are created, only changed section ranges are set, and
+# only channels whose keys differ are rewritten (the float channels through sequencer_bulk_keys, which writes changed keys only).
+# Reapplying an unchanged document therefore costs one read of the asset and no writes.
+# Object bindings cannot be recreated from a document (the bound objects live in a level), so bindings that are missing from the
+# asset are reported as unresolved. So are created tracks that can't be given the display name and property of the document track.
+import unreal
+import numpy as np
+import sequencer_hash
+import sequencer_index
+import sequencer_export
+import sequencer_bulk_keys
+
+# Values of the non-float channels, converted for add_key()/set_value()
+_VALUE_CONVERTERS = {
+	'MovieSceneScriptingBoolChannel' : bool,
+	'MovieSceneScriptingByteChannel' : int,
+	'MovieSceneScriptingIntegerChannel' : int,
+	'MovieSceneScriptingStringChannel' : lambda value: u'{0}'.format(value),
+	'MovieSceneScriptingFloatChannel' : float,
+}
+
+'''
+	Summary:
+		Counts of what apply_document() did. Every binding, track, section and channel of the document is counted once.
+'''
+class ApplyReport(object):
+	def __init__(self):
+		self.created = 0
+		self.updated = 0
+		self.skipped = 0
+		self.removed = 0
+		self.unresolved = 0
+		self.keys_written = 0
+
+	def as_dict(self):
+		return dict(self.__dict__)
+
+	def __repr__(self):
+		return '<ApplyReport created {0} updated {1} skipped {2} removed {3} unresolved {4} keys written {5}>'.format(
+			self.created, self.updated, self.skipped, self.removed, self.unresolved, self.keys_written)
+
+def _set_section_range(section, range_record):
+	section_range = section.get_range()
+	section_range.has_start = range_record['has_start']
+	section_range.inclusive_start = range_record['start']
+	section_range.has_end = range_record['has_end']
+	section_range.exclusive_end = range_record['end']
+	section.set_range(section_range)
+
+'''
+	Summary:
+		Makes the keys of a channel equal to the key columns of a document channel. Keys are only removed and re-added when the key
+		count differs; otherwise the times and values are compared and only the differing ones are set.
+	Returns:
+		The number of set/add calls made.
+'''
+def write_channel_keys(channel, columns):
+	channel_type = channel.get_class().get_name()
+	convert = _VALUE_CONVERTERS[channel_type]
+	times = np.asarray(columns['times'], dtype = np.int64)
+	num_calls = 0
+	keys = channel.get_keys()
+	if len(keys) != len(times):
+		for key in keys:
+			channel.remove_key(key)
+		for time, value in zip(times.tolist(), columns['values'].tolist()):
+			channel.add_key(unreal.FrameNumber(time), convert(value), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
+		num_calls = len(times)
+
+	if channel_type == 'MovieSceneScriptingFloatChannel':
+		arrays = sequencer_bulk_keys.read_float_keys(channel, [name for name in sequencer_bulk_keys.FLOAT_KEY_FIELD_NAMES if name in columns])
+		for name in arrays.fields:
+			getattr(arrays, name)[:] = np.asarray(columns[name])
+		return num_calls + sequencer_bulk_keys.write_float_keys(arrays)
+
+	for key, time, value in zip(channel.get_keys(), times.tolist(), columns['values'].tolist()):
+		if key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value != time:
+			key.set_time(unreal.FrameNumber(time), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
+			num_calls = num_calls + 1
+		if key.get_value() != convert(value):
+			key.set_value(convert(value))
+			num_calls = num_calls + 1
+	return num_calls
+
+'''
+	Summary:
+		Applies a document (the root sequencer_hash.DocumentNode from sequencer_hash.load_document()) to a sequence.
+	Params:
+		sequence - The LevelSequence to update.
+		document - The document to apply.
+		remove_extra - Remove tracks and sections of the asset that are not in the document.
+		batch_size - Number of channel rewrites per progress step.
+	Returns:
+		An ApplyReport.
+'''
+def apply_document(sequence, document, remove_extra = True, batch_size = 200):
+	report = ApplyReport()
+	current = sequencer_hash.document_from_records(sequencer_export.iter_export_records(sequence, objects = True))
+	sequencer_hash.compute_hashes(current)
+	if current.hash == document.hash:
+		report.skipped = document.count()
+		return report
+
+	# Frame rates first, so the tick times of the document mean the same thing in the asset
+	sequence_record = document.record
+	if sequence_record.get('tick_resolution') and sequence_record['tick_resolution'] != current.record['tick_resolution']:
+		sequence.set_tick_resolution(unreal.FrameRate(*sequence_record['tick_resolution']))
+	if sequence_record.get('display_rate') and sequence_record['display_rate'] != current.record['display_rate']:
+		sequence.set_display_rate(unreal.FrameRate(*sequence_record['display_rate']))
+
+	# Structural pass: create/remove tracks and sections, queue the channels whose keys differ
+	pending_channels = []
+	current_bindings = dict(current.keyed_children())
+	for key, document_binding in document.keyed_children():
+		current_binding = current_bindings.get(key)
+		if current_binding is None:
+			# Only the master pseudo-binding always exists; a real binding can't be recreated without its object
+			report.unresolved = report.unresolved + document_binding.count()
+			continue
+		if current_binding.hash == document_binding.hash:
+			report.skipped = report.skipped + document_binding.count()
+			continue
+		report.updated = report.updated + 1
+		owner = current_binding.record.get('_object')
+		_apply_tracks(sequence, owner, current_binding, document_binding, report, pending_channels, remove_extra)
+
+	# Key pass, in batches with progress
+	with unreal.ScopedSlowTask(len(pending_channels), 'Applying keys to {0}'.format(sequence.get_name())) as slow_task:
+		slow_task.make_dialog(True)
+		for start in range(0, len(pending_channels), batch_size):
+			if slow_task.should_cancel():
+				break
+			batch = pending_channels[start:start + batch_size]
+			for channel, columns in batch:
+				report.keys_written = report.keys_written + write_channel_keys(channel, columns)
+			slow_task.enter_progress_frame(len(batch))
+
+	sequencer_index.invalidate_sequence_index(sequence)
+	return report
+
+def _apply_tracks(sequence, owner, current_binding, document_binding, report, pending_channels, remove_extra):
+	current_tracks = dict(current_binding.keyed_children())
+	for key, document_track in document_binding.keyed_children():
+		current_track = current_tracks.pop(key, None)
+		if current_track is not None and current_track.hash == document_track.hash:
+			report.skipped = report.skipped + document_track.count()
+			continue
+		if current_track is None:
+			track_class = getattr(unreal, document_track.record['type'], None)
+			if track_class is None:
+				report.unresolved = report.unresolved + document_track.count()
+				continue
+			track = sequence.add_master_track(track_class) if owner is None else owner.add_track(track_class)
+			if not _set_track_identity(track, document_track.record):
+				# Left in place it would be created again on every apply, since its key never matches the document
+				_remove_track(sequence, owner, track)
+				report.unresolved = report.unresolved + document_track.count()
+				continue
+			report.created = report.created + 1
+			_apply_sections(track, [], document_track, report, pending_channels, remove_extra)
+		else:
+			report.updated = report.updated + 1
+			_apply_sections(current_track.record['_object'], current_track.children, document_track, report, pending_channels, remove_extra)
+
+	if remove_extra:
+		for key, current_track in current_tracks.items():
+			_remove_track(sequence, owner, current_track.record['_object'])
+			report.removed = report.removed + 1
+
+def _remove_track(sequence, owner, track):
+	if owner is None:
+		sequence.remove_master_track(track)
+	else:
+		owner.remove_track(track)
+
+'''
+	Summary:
+		Gives a new track the display name and, for property tracks, the property of its document record.
+	Returns:
+		True when the track now has the record's name and property, so it hashes under the same key as the document track.
+'''
+def _set_track_identity(track, track_record):
+	property_name = track_record.get('property_name')
+	if property_name is not None:
+		track.set_property_name_and_path(property_name, track_record['property_path'])
+		if str(track.get_property_name()) != property_name or str(track.get_property_path()) != track_record['property_path']:
+			return False
+	if str(track.get_display_name()) != track_record['name'] and hasattr(track, 'set_display_name'):
+		track.set_display_name(track_record['name'])
+	return str(track.get_display_name()) == track_record['name']
+
+def _apply_sections(track, current_sections, document_track, report, pending_channels, remove_extra):
+	document_sections = document_track.children
+	for position, document_section in enumerate(document_sections):
+		if position < len(current_sections):
+			current_section = current_sections[position]
+			if current_section.hash == document_section.hash:
+				report.skipped = report.skipped + document_section.count()
+				continue
+			section = current_section.record['_object']
+			report.updated = report.updated + 1
+			if current_section.record['range'] != document_section.record['range']:
+				_set_section_range(section, document_section.record['range'])
+			current_channels = dict(current_section.keyed_children())
+		else:
+			section = track.add_section()
+			_set_section_range(section, document_section.record['range'])
+			report.created = report.created + 1
+			# A section's channels come with its type, so match the new section's channels by name
+			current_channels = dict((key, (channel, None)) for key, channel in _keyed_channels(section))
+
+		for key, document_channel in document_section.keyed_children():
+			match = current_channels.get(key)
+			if match is None or document_channel.record['type'] not in _VALUE_CONVERTERS:
+				report.unresolved = report.unresolved + 1
+				continue
+			if isinstance(match, tuple):
+				channel, channel_hash = match
+			else:
+				channel, channel_hash = match.record['_object'], match.hash
+			if channel_hash == document_channel.hash:
+				report.skipped = report.skipped + 1
+				continue
+			pending_channels.append((channel, document_channel.columns))
+			report.updated = report.updated + 1
+
+	if remove_extra:
+		for current_section in current_sections[len(document_sections):]:
+			track.remove_section(current_section.record['_object'])
+			report.removed = report.removed + 1
+
+def _keyed_channels(section):
+	seen = {}
+	for channel in section.get_channels():
+		name = str(channel.get_name())
+		count = seen.get(name, 0)
+		seen[name] = count + 1
+		yield (name if count == 0 else '{0}#{1}'.format(name, count)), channel
+
+'''
+	Summary:
+		Applies an exported file (.jsonl or columnar) to a sequence asset, creating the asset if it does not exist.
+		Open the Python interactive console and use:
+			import sequencer_apply
+			sequencer_apply.apply_document_file("/Game/TestKeySequence", "E:/Export/TestKeySequence.seqz")
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		document_path - A file written by sequencer_export.export_sequence_jsonl() or export_sequence_columnar().
+		remove_extra - Remove tracks and sections of the asset that are not in the document.
+	Returns:
+		The ApplyReport as a dict.
+'''
+def apply_document_file(sequencer_asset_path, document_path, remove_extra = True):
+	document = sequencer_hash.load_document(document_path)
+	if unreal.EditorAssetLibrary.does_asset_exist(sequencer_asset_path):
+		sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	else:
+		package_path, asset_name = sequencer_asset_path.rsplit('/', 1)
+		sequence = unreal.AssetToolsHelpers.get_asset_tools().create_asset(asset_name, package_path, unreal.LevelSequence, unreal.LevelSequenceFactoryNew())
+	report = apply_document(sequence, document, remove_extra)
+	print('Applied {0} to {1}: {2}'.format(document_path, sequencer_asset_path, report))
+	return report.as_dict()
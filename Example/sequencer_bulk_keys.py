@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Bulk key access for MovieSceneScriptingFloatChannel.
+# Every key property is read once into NumPy arrays, the arrays are transformed with vectorized operations,
+# and only the properties that actually changed are written back. The scripting API has no bulk setter, so the
+# write pass still calls set_* per changed key, but unchanged keys and unchanged properties cost nothing.
+import unreal, time
+import numpy as np
+import sequencer_time
+import curve_simplify
+
+# Enum values stored in the mode arrays as their index in these tuples.
+INTERP_MODES = (unreal.RichCurveInterpMode.RCIM_LINEAR, unreal.RichCurveInterpMode.RCIM_CONSTANT, unreal.RichCurveInterpMode.RCIM_CUBIC, unreal.RichCurveInterpMode.RCIM_NONE)
+TANGENT_MODES = (unreal.RichCurveTangentMode.RCTM_AUTO, unreal.RichCurveTangentMode.RCTM_USER, unreal.RichCurveTangentMode.RCTM_BREAK, unreal.RichCurveTangentMode.RCTM_NONE)
+TANGENT_WEIGHT_MODES = (unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_NONE, unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_ARRIVE, unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_LEAVE, unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_BOTH)
+
+INTERP_LINEAR = INTERP_MODES.index(unreal.RichCurveInterpMode.RCIM_LINEAR)
+INTERP_CONSTANT = INTERP_MODES.index(unreal.RichCurveInterpMode.RCIM_CONSTANT)
+INTERP_CUBIC = INTERP_MODES.index(unreal.RichCurveInterpMode.RCIM_CUBIC)
+TANGENT_AUTO = TANGENT_MODES.index(unreal.RichCurveTangentMode.RCTM_AUTO)
+TANGENT_USER = TANGENT_MODES.index(unreal.RichCurveTangentMode.RCTM_USER)
+TANGENT_WEIGHTED_NONE = TANGENT_WEIGHT_MODES.index(unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_NONE)
+TANGENT_WEIGHTED_BOTH = TANGENT_WEIGHT_MODES.index(unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_BOTH)
+
+# Field name -> (getter, setter, dtype). Times are always in tick resolution.
+FLOAT_KEY_FIELDS = (
+	('interp_modes', lambda key: INTERP_MODES.index(key.get_interpolation_mode()), lambda key, value: key.set_interpolation_mode(INTERP_MODES[value]), np.int8),
+	('tangent_modes', lambda key: TANGENT_MODES.index(key.get_tangent_mode()), lambda key, value: key.set_tangent_mode(TANGENT_MODES[value]), np.int8),
+	('tangent_weight_modes', lambda key: TANGENT_WEIGHT_MODES.index(key.get_tangent_weight_mode()), lambda key, value: key.set_tangent_weight_mode(TANGENT_WEIGHT_MODES[value]), np.int8),
+	('arrive_tangents', lambda key: key.get_arrive_tangent(), lambda key, value: key.set_arrive_tangent(value), np.float64),
+	('arrive_tangent_weights', lambda key: key.get_arrive_tangent_weight(), lambda key, value: key.set_arrive_tangent_weight(value), np.float64),
+	('leave_tangents', lambda key: key.get_leave_tangent(), lambda key, value: key.set_leave_tangent(value), np.float64),
+	('leave_tangent_weights', lambda key: key.get_leave_tangent_weight(), lambda key, value: key.set_leave_tangent_weight(value), np.float64),
+	('values', lambda key: key.get_value(), lambda key, value: key.set_value(value), np.float64),
+	('times', lambda key: key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value, lambda key, value: key.set_time(unreal.FrameNumber(int(value)), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION), np.int64),
+)
+FLOAT_KEY_FIELD_NAMES = tuple(field[0] for field in FLOAT_KEY_FIELDS)
+
+'''
+	Summary:
+		All keys of one float channel as NumPy arrays. Modify the arrays in place (or through the transform functions below)
+		and call write_float_keys() to apply the changes.
+	Params:
+		channel - The MovieSceneScriptingFloatChannel the keys belong to.
+		keys - The key proxies, in the order of the arrays.
+		fields - Names of the fields that were read (see FLOAT_KEY_FIELD_NAMES). Only these are available and written back.
+'''
+class FloatKeyArrays(object):
+	def __init__(self, channel, keys, fields):
+		self.channel = channel
+		self.keys = keys
+		self.fields = tuple(fields)
+		self.original = {}
+
+	def __len__(self):
+		return len(self.keys)
+
+	'''
+		Summary:
+			Keeps only the keys selected by a boolean mask (in the arrays and the key proxies); the keys themselves are not touched.
+	'''
+	def select(self, mask):
+		self.keys = [self.keys[index] for index in np.flatnonzero(mask)]
+		for name in self.fields:
+			setattr(self, name, getattr(self, name)[mask])
+			self.original[name] = self.original[name][mask]
+
+'''
+	Summary:
+		Reads the keys of a float channel into a FloatKeyArrays. Each requested field costs one call per key, so only ask for the fields you need.
+	Params:
+		channel - The MovieSceneScriptingFloatChannel to read.
+		fields - Names of the fields to read, defaults to all of them.
+	Returns:
+		A FloatKeyArrays with one array attribute per field.
+'''
+def read_float_keys(channel, fields = FLOAT_KEY_FIELD_NAMES):
+	keys = channel.get_keys()
+	arrays = FloatKeyArrays(channel, keys, [name for name in FLOAT_KEY_FIELD_NAMES if name in fields])
+	for name, getter, setter, dtype in FLOAT_KEY_FIELDS:
+		if name not in arrays.fields:
+			continue
+		values = np.array([getter(key) for key in keys], dtype = dtype)
+		setattr(arrays, name, values)
+		arrays.original[name] = values.copy()
+	return arrays
+
+'''
+	Summary:
+		Writes the changed fields of a FloatKeyArrays back to its key proxies. Fields are compared against the values that were read,
+		so only keys whose field changed are touched. Modes are written before tangents so the tangents are respected.
+	Params:
+		arrays - The FloatKeyArrays returned by read_float_keys().
+	Returns:
+		The number of set_* calls that were made.
+'''
+def write_float_keys(arrays):
+	num_calls = 0
+	for name, getter, setter, dtype in FLOAT_KEY_FIELDS:
+		if name not in arrays.fields:
+			continue
+		values = getattr(arrays, name)
+		for index in np.flatnonzero(values != arrays.original[name]):
+			setter(arrays.keys[index], values[index].item())
+			num_calls = num_calls + 1
+		arrays.original[name] = values.copy()
+	return num_calls
+
+'''
+	Summary:
+		Reads all float channels of the given sections.
+	Params:
+		sections - Iterable of MovieSceneSections.
+		fields - Names of the fields to read.
+	Returns:
+		A list of FloatKeyArrays, one per channel.
+'''
+def read_float_channels(sections, fields = FLOAT_KEY_FIELD_NAMES):
+	all_arrays = []
+	for section in sections:
+		for channel in section.find_channels_by_type(unreal.MovieSceneScriptingFloatChannel):
+			all_arrays.append(read_float_keys(channel, fields))
+	return all_arrays
+
+'''
+	Summary:
+		Converts a number of frames at the sequence's display rate into ticks at its tick resolution, without calling into the engine.
+'''
+def display_frames_to_ticks(sequence, frames):
+	return int(sequencer_time.display_to_ticks(sequence, frames))
+
+# Vectorized equivalents of the per-key helpers in sequencer_key_examples.
+
+def shift_times(arrays, ticks):
+	arrays.times += ticks
+
+def add_values(arrays, value):
+	arrays.values += value
+
+def set_cubic_auto(arrays):
+	arrays.interp_modes[:] = INTERP_CUBIC
+	arrays.tangent_modes[:] = TANGENT_AUTO
+
+'''
+	Summary:
+		Scales the tangent weights of the keys that respect them (Cubic interpolation, User tangents, Both weight mode).
+	Returns:
+		The number of keys that were scaled.
+'''
+def scale_tangent_weights(arrays, factor):
+	mask = (arrays.interp_modes == INTERP_CUBIC) & (arrays.tangent_modes == TANGENT_USER) & (arrays.tangent_weight_modes == TANGENT_WEIGHTED_BOTH)
+	arrays.arrive_tangent_weights[mask] *= factor
+	arrays.leave_tangent_weights[mask] *= factor
+	return int(np.count_nonzero(mask))
+
+'''
+	Summary:
+		Removes the keys of a channel that the remaining keys reproduce within a tolerance (see curve_simplify), then writes the
+		interpolation of the remaining keys: Linear for LINEAR, Cubic with User tangents set to the original curve's slope (value per
+		tick) for CUBIC. Keys with Constant interpolation and the keys right after them are always kept and keep their mode.
+		Needs the times, values, interp_modes, tangent_modes, tangent_weight_modes, arrive_tangents and leave_tangents fields.
+	Params:
+		arrays - The FloatKeyArrays of the channel; it only holds the remaining keys afterwards.
+		tolerance - Largest allowed value error at a removed key.
+		mode - curve_simplify.LINEAR or curve_simplify.CUBIC.
+	Returns:
+		(number of keys removed, max error at the original keys).
+'''
+def simplify_float_keys(arrays, tolerance, mode = curve_simplify.CUBIC):
+	if len(arrays) <= 2:
+		return 0, 0.0
+	times = arrays.times.astype(np.float64)
+	slopes = curve_simplify.key_slopes(times, arrays.values)
+	fixed = arrays.interp_modes == INTERP_CONSTANT
+	fixed[1:] |= fixed[:-1].copy()
+	keep, max_error = curve_simplify.simplify_keys(times, arrays.values, tolerance, mode, slopes, fixed)
+	removed = np.flatnonzero(~keep)
+	for index in removed:
+		arrays.channel.remove_key(arrays.keys[index])
+	arrays.select(keep)
+
+	free = arrays.interp_modes != INTERP_CONSTANT
+	if mode == curve_simplify.LINEAR:
+		arrays.interp_modes[free] = INTERP_LINEAR
+	else:
+		arrays.interp_modes[free] = INTERP_CUBIC
+		arrays.tangent_modes[free] = TANGENT_USER
+		arrays.tangent_weight_modes[free] = TANGENT_WEIGHTED_NONE
+		arrays.arrive_tangents[free] = slopes[keep][free]
+		arrays.leave_tangents[free] = slopes[keep][free]
+	write_float_keys(arrays)
+	return len(removed), max_error
+
+def _collect_sections(sequence):
+	sections = []
+	for track in sequence.get_master_tracks():
+		sections.extend(track.get_sections())
+	for binding in sequence.get_bindings():
+		for track in binding.get_tracks():
+			sections.extend(track.get_sections())
+	return sections
+
+'''
+	Summary:
+		Compares the per-key loops of sequencer_key_examples (add_time_to_keys, add_value_to_keys, halve_tangent_weights and
+		set_float_keys_to_cubic_auto, without their per-key printing) with the bulk read/transform/write path. Each path runs on its
+		own duplicate of the sequence, the results are compared, and the duplicates are deleted afterwards.
+		Open the Python interactive console and use:
+			import sequencer_bulk_keys
+			sequencer_bulk_keys.benchmark_float_keys("/Game/TestKeySequence")
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		frames - Number of display rate frames to move the keys by.
+		value - Value added to the keys.
+	Returns:
+		A dict with the key count, the seconds spent by each path and whether both paths produced the same keys.
+'''
+def benchmark_float_keys(sequencer_asset_path, frames = 15, value = 35.0):
+	per_key_path = sequencer_asset_path + '_PerKeyBenchmark'
+	bulk_path = sequencer_asset_path + '_BulkBenchmark'
+	per_key_sequence = unreal.EditorAssetLibrary.duplicate_asset(sequencer_asset_path, per_key_path)
+	bulk_sequence = unreal.EditorAssetLibrary.duplicate_asset(sequencer_asset_path, bulk_path)
+	try:
+		# Per-key loops, as in sequencer_key_examples
+		start_time = time.time()
+		all_float_keys = []
+		for section in _collect_sections(per_key_sequence):
+			for channel in section.find_channels_by_type(unreal.MovieSceneScriptingFloatChannel):
+				all_float_keys.extend(channel.get_keys())
+		# Both paths move the keys by the same tick offset so keys between frames keep their sub-frame position
+		ticks = display_frames_to_ticks(per_key_sequence, frames)
+		for key in all_float_keys:
+			key.set_time(unreal.FrameNumber(key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value + ticks), 0.0,
+				unreal.SequenceTimeUnit.TICK_RESOLUTION)
+		for key in all_float_keys:
+			key.set_value(key.get_value() + value)
+		for key in all_float_keys:
+			if key.get_interpolation_mode() != unreal.RichCurveInterpMode.RCIM_CUBIC or key.get_tangent_mode() != unreal.RichCurveTangentMode.RCTM_USER or key.get_tangent_weight_mode() != unreal.RichCurveTangentWeightMode.RCTWM_WEIGHTED_BOTH:
+				continue
+			key.set_arrive_tangent_weight(key.get_arrive_tangent_weight() / 2)
+			key.set_leave_tangent_weight(key.get_leave_tangent_weight() / 2)
+		for key in all_float_keys:
+			key.set_interpolation_mode(unreal.RichCurveInterpMode.RCIM_CUBIC)
+			key.set_tangent_mode(unreal.RichCurveTangentMode.RCTM_AUTO)
+		per_key_seconds = time.time() - start_time
+
+		# Bulk arrays: one read per field, every transform on the arrays, one write pass for what changed
+		start_time = time.time()
+		ticks = display_frames_to_ticks(bulk_sequence, frames)
+		num_keys = 0
+		for arrays in read_float_channels(_collect_sections(bulk_sequence)):
+			shift_times(arrays, ticks)
+			add_values(arrays, value)
+			scale_tangent_weights(arrays, 0.5)
+			set_cubic_auto(arrays)
+			write_float_keys(arrays)
+			num_keys = num_keys + len(arrays)
+		bulk_seconds = time.time() - start_time
+
+		fields = ('times', 'values', 'interp_modes', 'tangent_modes', 'arrive_tangent_weights', 'leave_tangent_weights')
+		per_key_result = read_float_channels(_collect_sections(per_key_sequence), fields)
+		bulk_result = read_float_channels(_collect_sections(bulk_sequence), fields)
+		matches = all(np.allclose(getattr(a, name), getattr(b, name)) for a, b in zip(per_key_result, bulk_result) for name in fields)
+	finally:
+		unreal.EditorAssetLibrary.delete_asset(per_key_path)
+		unreal.EditorAssetLibrary.delete_asset(bulk_path)
+
+	print('{0} float keys: per-key loops {1:.3f}s, bulk arrays {2:.3f}s ({3:.1f}x), results match: {4}'.format(
+		num_keys, per_key_seconds, bulk_seconds, per_key_seconds / bulk_seconds if bulk_seconds > 0 else 0.0, matches))
+	return {'keys' : num_keys, 'per_key_seconds' : per_key_seconds, 'bulk_seconds' : bulk_seconds, 'matches' : matches}
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Columnar container for exported sequence data.
+# The file is an uncompressed (ZIP_STORED) zip of .npy members, one per channel column ("channels/000012/times.npy"), plus a
+# "manifest.json" member describing the sequence, bindings, tracks, sections and channels. np.load() reads it like an .npz, and
+# because the members are stored uncompressed, ColumnarSequence maps each column straight from the file with np.memmap.
+# This module does not import unreal, so exported files can be analysed outside the editor:
+#	import sequencer_columnar
+#	exported = sequencer_columnar.ColumnarSequence("E:/Export/TestKeySequence.seqz")
+#	for channel in exported.channels(track_name = "Transform"):
+#		times = exported.column(channel, "times")
+import io
+import json
+import struct
+import zipfile
+import numpy as np
+
+MANIFEST_NAME = 'manifest.json'
+
+# Size of the fixed part of a zip local file header
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+def column_name(channel_index, column):
+	return 'channels/{0:06d}/{1}.npy'.format(channel_index, column)
+
+'''
+	Summary:
+		Writes columns and a manifest into a columnar file. Every column is written as soon as it is added, so only the channel
+		being written is held in memory.
+	Params:
+		path - The file to create.
+'''
+class ColumnarWriter(object):
+	def __init__(self, path):
+		self.path = path
+		self.zip_file = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64 = True)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		if self.zip_file is not None:
+			self.zip_file.close()
+			self.zip_file = None
+
+	'''
+		Summary:
+			Adds the columns of one channel.
+		Params:
+			channel_index - Index of the channel in the manifest.
+			columns - Dict of column name -> NumPy array.
+		Returns:
+			The names of the columns written.
+	'''
+	def add_channel(self, channel_index, columns):
+		for column, values in columns.items():
+			buffer = io.BytesIO()
+			np.lib.format.write_array(buffer, np.ascontiguousarray(values), allow_pickle = False)
+			self.zip_file.writestr(column_name(channel_index, column), buffer.getvalue())
+		return sorted(columns)
+
+	'''
+		Summary:
+			Writes the manifest and closes the file.
+	'''
+	def close(self, manifest):
+		self.zip_file.writestr(MANIFEST_NAME, json.dumps(manifest, sort_keys = True).encode('utf-8'))
+		self.zip_file.close()
+		self.zip_file = None
+
+'''
+	Summary:
+		Read access to a columnar file. Columns are memory mapped (or read, with mmap = False) on request.
+	Params:
+		path - The columnar file.
+		mmap - Map columns from the file instead of reading them into memory.
+'''
+class ColumnarSequence(object):
+	def __init__(self, path, mmap = True):
+		self.path = path
+		self.mmap = mmap
+		with zipfile.ZipFile(path, 'r') as zip_file:
+			self.manifest = json.loads(zip_file.read(MANIFEST_NAME).decode('utf-8'))
+			self._members = dict((info.filename, info) for info in zip_file.infolist())
+
+	'''
+		Summary:
+			Returns the channel records of the manifest, optionally filtered.
+		Params:
+			channel_type - Class name such as 'MovieSceneScriptingFloatChannel'.
+			track_name - Name of the track the channels belong to.
+			binding_id - Id of the binding the channels belong to, 'master' for master tracks.
+	'''
+	def channels(self, channel_type = None, track_name = None, binding_id = None):
+		tracks = self.manifest['tracks']
+		result = []
+		for channel in self.manifest['channels']:
+			track = tracks[channel['track']]
+			if channel_type is not None and channel['type'] != channel_type:
+				continue
+			if track_name is not None and track['name'] != track_name:
+				continue
+			if binding_id is not None and (track['binding_id'] or 'master') != binding_id:
+				continue
+			result.append(channel)
+		return result
+
+	'''
+		Summary:
+			Returns one column of a channel as a NumPy array (a read-only memmap when the file was opened with mmap).
+		Params:
+			channel - A channel record from channels() or its index.
+			column - Column name, such as 'times' or 'values'.
+	'''
+	def column(self, channel, column):
+		channel_index = channel if isinstance(channel, int) else channel['index']
+		info = self._members[column_name(channel_index, column)]
+		if info.compress_type != zipfile.ZIP_STORED:
+			raise ValueError('{0} is compressed and cannot be mapped'.format(info.filename))
+		with open(self.path, 'rb') as f:
+			f.seek(info.header_offset)
+			header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+			f.seek(header[-2] + header[-1], 1) # file name and extra field
+			version = np.lib.format.read_magic(f)
+			if version == (1, 0):
+				shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+			else:
+				shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+			offset = f.tell()
+			if not self.mmap or not shape or 0 in shape:
+				return np.fromfile(f, dtype = dtype, count = int(np.prod(shape))).reshape(shape, order = 'F' if fortran_order else 'C')
+		return np.memmap(self.path, dtype = dtype, mode = 'r', offset = offset, shape = shape, order = 'F' if fortran_order else 'C')
+
+	'''
+		Summary:
+			Returns every column of a channel as a dict.
+	'''
+	def channel_columns(self, channel):
+		channel_record = self.manifest['channels'][channel] if isinstance(channel, int) else channel
+		return dict((column, self.column(channel_record, column)) for column in channel_record['columns'])
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Structural diff between two versions of a sequence.
+# Both versions are sequencer_hash trees. The diff starts at the root and only descends into children whose hashes differ, so the
+# work is proportional to the size of the change. Hash trees (without key data) can be cached in a JSON file keyed by asset or
+# file path and invalidated by the file's size and modification time, so an unchanged version is not read again.
+# The module can be used outside the editor on exported files (diff_files); diff_sequences needs the editor.
+#	import sequencer_diff
+#	changes = sequencer_diff.diff_sequences("/Game/TestKeySequence", "/Game/TestKeySequence_v2", "E:/Git_Res/pythonUE4/Saved/sequence_hashes.json")
+#	sequencer_diff.print_changes(changes)
+import os
+import json
+import sequencer_hash
+
+'''
+	Summary:
+		One entry of a change list.
+	Params:
+		op - 'added', 'removed' or 'changed'.
+		path - Slash separated keys from the root, e.g. "<binding id>/MovieScene3DTransformTrack/Transform/0/Location.X".
+		kind - Kind of the node: 'sequence', 'binding', 'track', 'section' or 'channel'.
+		detail - For 'changed', a dict of field name -> (old, new). A channel whose keys changed has a "keys" entry with the old and new
+			key counts.
+'''
+class Change(object):
+	__slots__ = ('op', 'path', 'kind', 'detail')
+
+	def __init__(self, op, path, kind, detail = None):
+		self.op = op
+		self.path = path
+		self.kind = kind
+		self.detail = detail or {}
+
+	def as_dict(self):
+		return {'op' : self.op, 'path' : self.path, 'kind' : self.kind, 'detail' : self.detail}
+
+	def __repr__(self):
+		return '<Change {0} {1} {2}>'.format(self.op, self.kind, self.path)
+
+def _record_changes(old, new):
+	old_content = sequencer_hash.record_content(old.record, old.kind)
+	new_content = sequencer_hash.record_content(new.record, new.kind)
+	detail = {}
+	for name in sorted(set(old_content) | set(new_content)):
+		if old_content.get(name) != new_content.get(name):
+			detail[name] = (old_content.get(name), new_content.get(name))
+	return detail
+
+'''
+	Summary:
+		Returns the changes between two hashed trees. Subtrees with equal hashes are not visited.
+	Params:
+		old, new - Root sequencer_hash.DocumentNode of each version, with hashes computed.
+	Returns:
+		A list of Change, parents before children.
+'''
+def diff_trees(old, new, path = ''):
+	changes = []
+	if old.hash == new.hash:
+		return changes
+	detail = _record_changes(old, new)
+	# Equal channel records with different hashes mean the keys changed
+	if old.kind == 'channel' and (not detail or old.record.get('num_keys') != new.record.get('num_keys')):
+		detail['keys'] = (old.record.get('num_keys'), new.record.get('num_keys'))
+	if detail:
+		changes.append(Change('changed', path, new.kind, detail))
+
+	old_children = dict(old.keyed_children())
+	for key, new_child in new.keyed_children():
+		child_path = key if not path else path + '/' + key
+		old_child = old_children.pop(key, None)
+		if old_child is None:
+			changes.append(Change('added', child_path, new_child.kind))
+		elif old_child.hash != new_child.hash:
+			changes.extend(diff_trees(old_child, new_child, child_path))
+	for key, old_child in old.keyed_children():
+		if key in old_children:
+			changes.append(Change('removed', key if not path else path + '/' + key, old_child.kind))
+	return changes
+
+'''
+	Summary:
+		Converts a hashed tree to plain data (records without "_" fields, hashes and children; no key columns) for caching.
+'''
+def tree_to_dict(node):
+	return {
+		'kind' : node.kind,
+		'record' : dict((name, value) for name, value in node.record.items() if not name.startswith('_')),
+		'hash' : node.hash,
+		'children' : [tree_to_dict(child) for child in node.children],
+	}
+
+def tree_from_dict(data):
+	node = sequencer_hash.DocumentNode(data['kind'], data['record'])
+	node.hash = data['hash']
+	node.children = [tree_from_dict(child) for child in data['children']]
+	return node
+
+'''
+	Summary:
+		JSON cache of hash trees, keyed by asset or file path. An entry is only used while its stamp (file size and modification time)
+		is unchanged.
+	Params:
+		cache_path - JSON file the cache is loaded from and saved to.
+'''
+class HashTreeCache(object):
+	def __init__(self, cache_path):
+		self.cache_path = cache_path
+		self.entries = {}
+		if os.path.isfile(cache_path):
+			with open(cache_path, 'r') as f:
+				self.entries = json.load(f)
+
+	def get(self, key, stamp):
+		entry = self.entries.get(key)
+		if entry is None or entry['stamp'] != list(stamp):
+			return None
+		return tree_from_dict(entry['tree'])
+
+	def put(self, key, stamp, tree):
+		self.entries[key] = {'stamp' : list(stamp), 'tree' : tree_to_dict(tree)}
+
+	def save(self):
+		directory = os.path.dirname(self.cache_path)
+		if directory and not os.path.isdir(directory):
+			os.makedirs(directory)
+		temp_path = self.cache_path + '.tmp'
+		with open(temp_path, 'w') as f:
+			json.dump(self.entries, f, sort_keys = True)
+		if os.path.exists(self.cache_path):
+			os.remove(self.cache_path)
+		os.rename(temp_path, self.cache_path)
+
+def _file_stamp(path):
+	stat = os.stat(path)
+	return [stat.st_size, stat.st_mtime]
+
+'''
+	Summary:
+		Returns the hashed tree of an exported file (see sequencer_export), from the cache when the file is unchanged.
+'''
+def file_tree(path, cache = None):
+	stamp = _file_stamp(path)
+	tree = cache.get(path, stamp) if cache is not None else None
+	if tree is None:
+		tree = sequencer_hash.load_document(path)
+		if cache is not None:
+			cache.put(path, stamp, tree)
+	return tree
+
+'''
+	Summary:
+		Returns the hashed tree of a sequence asset, from the cache when its package file is unchanged and not dirty in the editor.
+'''
+def sequence_tree(sequencer_asset_path, cache = None):
+	# Imported here so the rest of the module works outside the editor
+	import unreal, sequencer_export
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	package_name = sequencer_asset_path.split('.')[0]
+	dirty = package_name in [package.get_name() for package in unreal.EditorLoadingAndSavingUtils.get_dirty_content_packages()]
+	package_file = unreal.SystemLibrary.get_system_path(sequence)
+	stamp = _file_stamp(package_file) if package_file and os.path.isfile(package_file) else None
+	tree = cache.get(sequencer_asset_path, stamp) if cache is not None and stamp is not None and not dirty else None
+	if tree is None:
+		tree = sequencer_hash.document_from_records(sequencer_export.iter_export_records(sequence))
+		sequencer_hash.compute_hashes(tree)
+		if cache is not None and stamp is not None and not dirty:
+			cache.put(sequencer_asset_path, stamp, tree)
+	return tree
+
+'''
+	Summary:
+		Diffs two exported files (.jsonl or columnar). Works without the editor.
+	Params:
+		old_path, new_path - The exported files.
+		cache_path - Optional JSON hash tree cache.
+	Returns:
+		A list of Change.
+'''
+def diff_files(old_path, new_path, cache_path = None):
+	cache = HashTreeCache(cache_path) if cache_path else None
+	changes = diff_trees(file_tree(old_path, cache), file_tree(new_path, cache))
+	if cache is not None:
+		cache.save()
+	return changes
+
+'''
+	Summary:
+		Diffs two sequence assets.
+	Params:
+		old_asset_path, new_asset_path - Paths of the LevelSequence assets.
+		cache_path - Optional JSON hash tree cache.
+	Returns:
+		A list of Change.
+'''
+def diff_sequences(old_asset_path, new_asset_path, cache_path = None):
+	cache = HashTreeCache(cache_path) if cache_path else None
+	changes = diff_trees(sequence_tree(old_asset_path, cache), sequence_tree(new_asset_path, cache))
+	if cache is not None:
+		cache.save()
+	return changes
+
+def print_changes(changes):
+	for change in changes:
+		print('{0:<8} {1:<8} {2}'.format(change.op, change.kind, change.path or '<sequence>'))
+		for name, (old_value, new_value) in sorted(change.detail.items()):
+			print('    {0}: {1} -> {2}'.format(name, old_value, new_value))
+	print('{0} changes'.format(len(changes)))
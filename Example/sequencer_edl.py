@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# CMX3600 edit decision lists.
+# Render to Movie writes an EDL next to the frames when write_edit_decision_list is set; parse_edl() reads it (or one written by
+# write_edl()) back into events with frame numbers, so the cut of a previous render can be compared with the current shots
+# (see sequencer_shot_render). Timecodes are converted with the frame rate of the sequence; drop frame timecode (";" separator or
+# "FCM: DROP FRAME") is supported for 29.97 and 59.94.
+# This module does not import unreal.
+#	import sequencer_edl
+#	edl = sequencer_edl.read_edl("E:/Renders/Master/Master.edl", (24, 1))
+#	for event in edl.events: print(event)
+import re
+
+_EVENT_LINE = re.compile(r'^\s*(\d+)\s+(\S+)\s+(\S+)\s+(C|D|W\d*|K\S*)\s+(?:(\d+)\s+)?'
+	r'(\d\d:\d\d:\d\d[:;.]\d\d)\s+(\d\d:\d\d:\d\d[:;.]\d\d)\s+(\d\d:\d\d:\d\d[:;.]\d\d)\s+(\d\d:\d\d:\d\d[:;.]\d\d)\s*$')
+_CLIP_NAME = re.compile(r'^\*\s*FROM CLIP NAME:\s*(.*?)\s*$', re.IGNORECASE)
+
+'''
+	Summary:
+		Nominal (integer) frames per second of a frame rate and whether it is an NTSC rate that can use drop frame timecode.
+'''
+def nominal_rate(frame_rate):
+	numerator, denominator = frame_rate
+	nominal = int(round(float(numerator) / denominator))
+	return nominal, denominator == 1001 and nominal % 30 == 0
+
+'''
+	Summary:
+		Converts a timecode "HH:MM:SS:FF" (";" before the frames for drop frame) to a frame count.
+	Params:
+		timecode - The timecode.
+		frame_rate - (numerator, denominator).
+		drop_frame - Count as drop frame timecode; by default when the timecode uses ";".
+'''
+def timecode_to_frames(timecode, frame_rate, drop_frame = None):
+	hours, minutes, seconds, frames = [int(part) for part in re.split('[:;.]', timecode)]
+	nominal, ntsc = nominal_rate(frame_rate)
+	if drop_frame is None:
+		drop_frame = ';' in timecode
+	total = ((hours * 60 + minutes) * 60 + seconds) * nominal + frames
+	if drop_frame and ntsc:
+		drop = nominal // 15
+		total_minutes = hours * 60 + minutes
+		total = total - drop * (total_minutes - total_minutes // 10)
+	return total
+
+'''
+	Summary:
+		Converts a frame count to a timecode, the inverse of timecode_to_frames().
+'''
+def frames_to_timecode(frames, frame_rate, drop_frame = False):
+	nominal, ntsc = nominal_rate(frame_rate)
+	separator = ':'
+	if drop_frame and ntsc:
+		drop = nominal // 15
+		frames_per_minute = nominal * 60 - drop
+		frames_per_ten_minutes = frames_per_minute * 10 + drop
+		tens, remainder = divmod(frames, frames_per_ten_minutes)
+		frames = frames + drop * 9 * tens
+		if remainder > drop:
+			frames = frames + drop * ((remainder - drop) // frames_per_minute)
+		separator = ';'
+	seconds, frame = divmod(frames, nominal)
+	minutes, second = divmod(seconds, 60)
+	hour, minute = divmod(minutes, 60)
+	return '{0:02d}:{1:02d}:{2:02d}{3}{4:02d}'.format(hour % 24, minute, second, separator, frame)
+
+'''
+	Summary:
+		One event of an EDL. Times are frame counts at the EDL's frame rate; out points are exclusive.
+	Params:
+		number - Event number.
+		reel - Reel name.
+		track - Track type ("V", "A", "A2", "AA", "B", ...).
+		transition - "C" (cut), "D" (dissolve), "W..." (wipe) or "K..." (key).
+		source_in, source_out - Range in the source clip.
+		record_in, record_out - Range in the edited program.
+		clip_name - From the "* FROM CLIP NAME:" comment, None without one.
+'''
+class EdlEvent(object):
+	__slots__ = ('number', 'reel', 'track', 'transition', 'duration', 'source_in', 'source_out', 'record_in', 'record_out', 'clip_name')
+
+	def __init__(self, number, reel, track, transition, source_in, source_out, record_in, record_out, duration = None, clip_name = None):
+		self.number = number
+		self.reel = reel
+		self.track = track
+		self.transition = transition
+		self.duration = duration
+		self.source_in = source_in
+		self.source_out = source_out
+		self.record_in = record_in
+		self.record_out = record_out
+		self.clip_name = clip_name
+
+	@property
+	def name(self):
+		return self.clip_name or self.reel
+
+	def __repr__(self):
+		return '<EdlEvent {0:03d} {1} {2} record [{3}, {4})>'.format(self.number, self.name, self.track, self.record_in, self.record_out)
+
+'''
+	Summary:
+		A parsed EDL.
+	Params:
+		title - The TITLE line.
+		drop_frame - True when the FCM line says drop frame.
+		events - The EdlEvent list in file order.
+'''
+class Edl(object):
+	def __init__(self, title = None, drop_frame = False, events = None):
+		self.title = title
+		self.drop_frame = drop_frame
+		self.events = events or []
+
+	'''
+		Summary:
+			Returns the video events, in record order.
+	'''
+	def video_events(self):
+		return sorted([event for event in self.events if event.track.upper().startswith('V')], key = lambda event: event.record_in)
+
+	def __repr__(self):
+		return '<Edl {0} {1} events>'.format(self.title, len(self.events))
+
+'''
+	Summary:
+		Parses CMX3600 text.
+	Params:
+		text - The EDL contents.
+		frame_rate - (numerator, denominator) of the timecodes.
+	Returns:
+		An Edl. Lines that are neither events nor known comments are ignored.
+'''
+def parse_edl(text, frame_rate):
+	edl = Edl()
+	for line in text.splitlines():
+		stripped = line.strip()
+		if not stripped:
+			continue
+		upper = stripped.upper()
+		if upper.startswith('TITLE:'):
+			edl.title = stripped[len('TITLE:'):].strip()
+			continue
+		if upper.startswith('FCM:'):
+			edl.drop_frame = 'NON' not in upper and 'DROP' in upper
+			continue
+		match = _EVENT_LINE.match(stripped)
+		if match is not None:
+			timecodes = [timecode_to_frames(timecode, frame_rate, edl.drop_frame or ';' in timecode) for timecode in match.group(6, 7, 8, 9)]
+			edl.events.append(EdlEvent(int(match.group(1)), match.group(2), match.group(3), match.group(4), timecodes[0], timecodes[1],
+				timecodes[2], timecodes[3], int(match.group(5)) if match.group(5) else None))
+			continue
+		match = _CLIP_NAME.match(stripped)
+		if match is not None and edl.events:
+			edl.events[-1].clip_name = match.group(1)
+	return edl
+
+def read_edl(path, frame_rate):
+	with open(path, 'r') as f:
+		return parse_edl(f.read(), frame_rate)
+
+'''
+	Summary:
+		Reel name written for a shot: its letters and digits, at most 8 characters (the CMX3600 reel field).
+'''
+def reel_name(name):
+	return ''.join(character for character in name if character.isalnum())[:8] or 'AX'
+
+'''
+	Summary:
+		Writes a CMX3600 EDL with one cut event per entry.
+	Params:
+		path - The file to write.
+		title - Title of the EDL.
+		shots - (name, source_in, record_in, record_out) tuples in frames; the source out is source_in + the record duration.
+		frame_rate - (numerator, denominator).
+		drop_frame - Write drop frame timecode.
+'''
+def write_edl(path, title, shots, frame_rate, drop_frame = False):
+	lines = ['TITLE: {0}'.format(title), 'FCM: {0}'.format('DROP FRAME' if drop_frame else 'NON-DROP FRAME'), '']
+	for number, (name, source_in, record_in, record_out) in enumerate(shots):
+		reel = reel_name(name)
+		timecodes = [frames_to_timecode(frames, frame_rate, drop_frame) for frames in
+			(source_in, source_in + record_out - record_in, record_in, record_out)]
+		lines.append('{0:03d}  {1:<8} V     C        {2} {3} {4} {5}'.format(number + 1, reel, *timecodes))
+		lines.append('* FROM CLIP NAME: {0}'.format(name))
+		lines.append('')
+	with open(path, 'w') as f:
+		f.write('\n'.join(lines))
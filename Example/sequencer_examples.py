@@ -3,7 +3,7 @@
 # 
 # Import the Unreal module to gain access to the UObject/UStruct types.
 # Import the JSON module to gain access to json export 
-import unreal, json, sequencer_key_examples
+import unreal, json, sequencer_key_examples, sequencer_export
 
 # Ensure you have enabled both the "Python Editor Script Plugin" and the "SequencerScripting" plugins for these examples to work.
 
@@ -211,10 +211,11 @@ def sequence_to_dict(sequence):
 	for master_track in sequence.find_master_tracks_by_type(unreal.MovieSceneTrack):
 		d['master_tracks'].append(track_to_dict(master_track))
 
+	descriptions = sequencer_export.binding_descriptions(sequence)
 	for binding in sequence.get_bindings():
 		b = {
-			'name' : 'todo',
-			'type' : 'todo',
+			'name' : descriptions[str(binding.get_id())]['name'],
+			'type' : descriptions[str(binding.get_id())]['type'],
 			'id' : str(binding.get_id()),
 			'tracks' : [],
 		}
@@ -236,6 +237,17 @@ def sequence_to_dict(sequence):
 def sequence_to_json(sequence):
 	return json.dumps(sequence_to_dict(sequence))
 
+'''
+	Summary:
+		Returns the ranges of num_sections consecutive sections of section_length_seconds each. 计算一次，供多个 track 复用。
+	Params:
+		sequence - The UMovieScene the ranges are for
+		num_sections - The number of sections.
+		section_length_seconds - The length of each section.
+'''
+def make_section_ranges(sequence, num_sections = 1, section_length_seconds = 1):
+	return [sequence.make_range_seconds(i*section_length_seconds, section_length_seconds) for i in range(num_sections)]
+
 '''
 	Summary:
 		Populates the specified sequence and track with some test sections. 用一些测试sections填充指定的序列和轨迹。
@@ -244,11 +256,13 @@ def sequence_to_json(sequence):
 		track - The track within the movie scene to create sections from.
 		num_sections - The number of sections to create.
 		section_length_seconds - The length of each section it is creating.
+		section_ranges - Optional ranges from make_section_ranges(), so they are not recomputed for every track.
 '''
-def populate_track(sequence, track, num_sections = 1, section_length_seconds = 1):
+def populate_track(sequence, track, num_sections = 1, section_length_seconds = 1, section_ranges = None):
 
-	for i in range(num_sections):
-		section_range = sequence.make_range_seconds(i*section_length_seconds, section_length_seconds)
+	if section_ranges is None:
+		section_ranges = make_section_ranges(sequence, num_sections, section_length_seconds)
+	for section_range in section_ranges:
 		track.add_section().set_range(section_range)
 
 '''
@@ -262,8 +276,9 @@ def populate_track(sequence, track, num_sections = 1, section_length_seconds = 1
 '''
 def populate_binding(sequence, binding, num_sections = 1, section_length_seconds = 1):
 
+	section_ranges = make_section_ranges(sequence, num_sections, section_length_seconds)
 	for track in binding.get_tracks():
-		populate_track(sequence, track, num_sections, section_length_seconds)
+		populate_track(sequence, track, section_ranges = section_ranges)
 
 '''
 	Summary:
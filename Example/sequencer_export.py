@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Streaming export of a LevelSequence, including key data.
+# sequencer_examples.sequence_to_json() builds the whole nested dict before dumping it and has no keys. These exporters walk
+# the sequence with the sequencer_stream generators and write each binding, track, section and channel as soon as it is read,
+# so memory stays bounded by the largest channel:
+#	- export_sequence_jsonl() writes one JSON record per line.
+#	- export_sequence_columnar() writes per-channel NumPy columns into a sequencer_columnar file that can be memory mapped
+#	  outside the editor.
+import unreal, json
+import numpy as np
+import sequencer_stream
+import sequencer_bulk_keys
+import sequencer_columnar
+
+# Value dtype of the channels that are exported with a plain "values" column
+CHANNEL_VALUE_DTYPES = {
+	'MovieSceneScriptingBoolChannel' : np.bool_,
+	'MovieSceneScriptingByteChannel' : np.uint8,
+	'MovieSceneScriptingIntegerChannel' : np.int32,
+	'MovieSceneScriptingStringChannel' : 'U',
+}
+
+'''
+	Summary:
+		Returns the display name and type ('Possessable' or 'Spawnable') of every object binding of a sequence.
+'''
+def binding_descriptions(sequence):
+	spawnable_ids = set(str(spawnable.get_id()) for spawnable in sequence.get_spawnables())
+	descriptions = {}
+	for binding in sequence.get_bindings():
+		binding_id = str(binding.get_id())
+		descriptions[binding_id] = {
+			'name' : str(binding.get_display_name()),
+			'type' : 'Spawnable' if binding_id in spawnable_ids else 'Possessable',
+		}
+	return descriptions
+
+'''
+	Summary:
+		Reads the keys of a channel into columns. Float channels export every key property (see sequencer_bulk_keys), other channels
+		export "times" (ticks) and "values". Unknown channel types export their values as strings.
+	Returns:
+		A dict of column name -> NumPy array.
+'''
+def channel_columns(channel):
+	channel_type = channel.get_class().get_name()
+	if channel_type == 'MovieSceneScriptingFloatChannel':
+		arrays = sequencer_bulk_keys.read_float_keys(channel)
+		return dict((name, getattr(arrays, name)) for name in arrays.fields)
+	keys = channel.get_keys()
+	times = np.array([key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value for key in keys], dtype = np.int64)
+	dtype = CHANNEL_VALUE_DTYPES.get(channel_type, 'U')
+	if dtype == 'U':
+		values = np.array([u'{0}'.format(key.get_value()) for key in keys], dtype = 'U')
+	else:
+		values = np.array([key.get_value() for key in keys], dtype = dtype)
+	return {'times' : times, 'values' : values}
+
+'''
+	Summary:
+		Yields the records of a sequence in order: the sequence, its bindings, then every track followed by its sections and their
+		channels. Channel records come with their key columns, other records with None.
+		Records refer to each other by index: a section has a "track" index, a channel has "track" and "section" indices.
+	Params:
+		sequence - The LevelSequence to export.
+		objects - Add the live proxy of every record as "_object" (used by sequencer_apply, not written to files).
+'''
+def iter_export_records(sequence, objects = False):
+	display_rate = sequence.get_display_rate()
+	tick_resolution = sequence.get_tick_resolution()
+	yield {
+		'record' : 'sequence',
+		'name' : sequence.get_name(),
+		'path' : sequence.get_path_name(),
+		'display_rate' : [display_rate.numerator, display_rate.denominator],
+		'tick_resolution' : [tick_resolution.numerator, tick_resolution.denominator],
+	}, None
+
+	descriptions = binding_descriptions(sequence)
+	for binding in sequence.get_bindings():
+		record = dict({'record' : 'binding', 'id' : str(binding.get_id())}, **descriptions[str(binding.get_id())])
+		if objects:
+			record['_object'] = binding
+		yield record, None
+
+	track_index = section_index = channel_index = 0
+	for binding, track in sequencer_stream.iter_tracks(sequence):
+		binding_id = str(binding.get_id()) if binding is not None else None
+
+		record = {
+			'record' : 'track',
+			'index' : track_index,
+			'binding_id' : binding_id,
+			'name' : str(track.get_display_name()),
+			'type' : track.get_class().get_name(),
+		}
+		if isinstance(track, unreal.MovieScenePropertyTrack):
+			# The animated property; a property track without it is not bound to anything
+			record['property_name'] = str(track.get_property_name())
+			record['property_path'] = str(track.get_property_path())
+		if objects:
+			record['_object'] = track
+		yield record, None
+
+		for section in track.get_sections():
+			section_range = section.get_range()
+			record = {
+				'record' : 'section',
+				'index' : section_index,
+				'track' : track_index,
+				'type' : section.get_class().get_name(),
+				'range' : {
+					'has_start' : section_range.has_start,
+					'start' : section_range.inclusive_start,
+					'has_end' : section_range.has_end,
+					'end' : section_range.exclusive_end,
+				},
+			}
+			if objects:
+				record['_object'] = section
+			yield record, None
+
+			for channel in section.get_channels():
+				columns = channel_columns(channel)
+				record = {
+					'record' : 'channel',
+					'index' : channel_index,
+					'track' : track_index,
+					'section' : section_index,
+					'name' : str(channel.get_name()),
+					'type' : channel.get_class().get_name(),
+					'num_keys' : len(columns['times']),
+				}
+				if objects:
+					record['_object'] = channel
+				yield record, columns
+				channel_index = channel_index + 1
+			section_index = section_index + 1
+		track_index = track_index + 1
+
+'''
+	Summary:
+		Exports a sequence as line-delimited JSON, one record per line. Channel records carry their key columns as lists.
+		Open the Python interactive console and use:
+			import sequencer_export
+			sequencer_export.export_sequence_jsonl(unreal.load_asset("/Game/TestKeySequence"), "E:/Export/TestKeySequence.jsonl")
+	Params:
+		sequence - The LevelSequence to export.
+		path - The file to write.
+	Returns:
+		The number of records written.
+'''
+def export_sequence_jsonl(sequence, path):
+	num_records = 0
+	with open(path, 'w') as f:
+		for record, columns in iter_export_records(sequence):
+			if columns is not None:
+				record['keys'] = dict((name, values.tolist()) for name, values in columns.items())
+			f.write(json.dumps(record, sort_keys = True))
+			f.write('\n')
+			num_records = num_records + 1
+	return num_records
+
+'''
+	Summary:
+		Exports a sequence into a sequencer_columnar file: key columns are written per channel as they are read, and the other
+		records are collected into the manifest (which holds no key data).
+		Open the Python interactive console and use:
+			import sequencer_export
+			sequencer_export.export_sequence_columnar(unreal.load_asset("/Game/TestKeySequence"), "E:/Export/TestKeySequence.seqz")
+	Params:
+		sequence - The LevelSequence to export.
+		path - The file to write.
+	Returns:
+		The manifest.
+'''
+def export_sequence_columnar(sequence, path):
+	manifest = {'bindings' : [], 'tracks' : [], 'sections' : [], 'channels' : []}
+	with sequencer_columnar.ColumnarWriter(path) as writer:
+		for record, columns in iter_export_records(sequence):
+			kind = record.pop('record')
+			if kind == 'sequence':
+				manifest['sequence'] = record
+				continue
+			if columns is not None:
+				record['columns'] = writer.add_channel(record['index'], columns)
+			manifest[kind + 's'].append(record)
+		writer.close(manifest)
+	return manifest
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Merkle hashes of exported sequence documents.
+# A document is the tree sequence -> bindings -> tracks -> sections -> channels built from the records of sequencer_export
+# (either read back from a file or straight from a live sequence). Every node hashes its own record, its key columns and the
+# (key, hash) pairs of its children, so two nodes with the same hash have identical subtrees and can be skipped as a whole.
+# Master tracks are grouped under a binding node with the id 'master'.
+# This module does not import unreal.
+import json
+import hashlib
+import numpy as np
+import sequencer_columnar
+
+MASTER_BINDING_ID = 'master'
+
+# Record fields that only describe the position in a file, not the content
+_POSITION_FIELDS = ('record', 'index', 'track', 'section', 'num_keys', 'columns')
+# Fields that identify the asset a document was exported from, so a document hashes the same when applied to another asset
+_IDENTITY_FIELDS = {'sequence' : ('name', 'path')}
+
+'''
+	Summary:
+		One node of a document tree.
+	Params:
+		kind - 'sequence', 'binding', 'track', 'section' or 'channel'.
+		record - The exported record. Fields starting with "_" (such as "_object", the live proxy) are not hashed.
+		columns - Key columns of a channel, None for other nodes.
+'''
+class DocumentNode(object):
+	__slots__ = ('kind', 'record', 'columns', 'children', 'hash')
+
+	def __init__(self, kind, record, columns = None):
+		self.kind = kind
+		self.record = record
+		self.columns = columns
+		self.children = []
+		self.hash = None
+
+	'''
+		Summary:
+			Returns (key, child) pairs. Keys identify a child independently of its position where possible: bindings by id, tracks by
+			type and name, channels by name. Sections are matched by position within their track. Repeated keys get a "#n" suffix.
+	'''
+	def keyed_children(self):
+		seen = {}
+		result = []
+		for position, child in enumerate(self.children):
+			if child.kind == 'binding':
+				key = child.record['id']
+			elif child.kind == 'track':
+				key = '{0}/{1}'.format(child.record['type'], child.record['name'])
+			elif child.kind == 'section':
+				key = str(position)
+			else:
+				key = child.record['name']
+			count = seen.get(key, 0)
+			seen[key] = count + 1
+			result.append((key if count == 0 else '{0}#{1}'.format(key, count), child))
+		return result
+
+	def count(self):
+		return 1 + sum(child.count() for child in self.children)
+
+	def __repr__(self):
+		return '<DocumentNode {0} {1}>'.format(self.kind, (self.hash or '')[:12])
+
+'''
+	Summary:
+		Builds a document tree from (record, columns) pairs as yielded by sequencer_export.iter_export_records(). Records are linked
+		by their indices, so their order does not matter.
+	Returns:
+		The root DocumentNode (kind 'sequence').
+'''
+def document_from_records(records):
+	root = DocumentNode('sequence', {})
+	bindings = {}
+	tracks = {}
+	sections = {}
+	channels = []
+	for record, columns in records:
+		kind = record.get('record')
+		if kind == 'sequence':
+			root.record = record
+		elif kind == 'binding':
+			bindings[record['id']] = DocumentNode('binding', record)
+		elif kind == 'track':
+			tracks[record['index']] = DocumentNode('track', record)
+		elif kind == 'section':
+			sections[record['index']] = DocumentNode('section', record)
+		elif kind == 'channel':
+			channels.append(DocumentNode('channel', record, columns))
+
+	bindings[MASTER_BINDING_ID] = DocumentNode('binding', {'record' : 'binding', 'id' : MASTER_BINDING_ID})
+	for index in sorted(tracks):
+		track = tracks[index]
+		binding_id = track.record['binding_id'] or MASTER_BINDING_ID
+		if binding_id not in bindings:
+			bindings[binding_id] = DocumentNode('binding', {'record' : 'binding', 'id' : binding_id})
+		bindings[binding_id].children.append(track)
+	for index in sorted(sections):
+		tracks[sections[index].record['track']].children.append(sections[index])
+	for channel in sorted(channels, key = lambda node: node.record['index']):
+		sections[channel.record['section']].children.append(channel)
+	root.children = [bindings[binding_id] for binding_id in sorted(bindings)]
+	return root
+
+def _column_digest(values):
+	values = np.asarray(values)
+	if values.dtype.kind in 'biuf':
+		return hashlib.sha1(np.ascontiguousarray(values, dtype = '<f8').tobytes()).hexdigest()
+	return hashlib.sha1(u'\x00'.join(u'{0}'.format(value) for value in values.tolist()).encode('utf-8')).hexdigest()
+
+'''
+	Summary:
+		Returns the content fields of a record: position fields, identity fields and "_" fields excluded.
+'''
+def record_content(record, kind = None):
+	excluded = _POSITION_FIELDS + _IDENTITY_FIELDS.get(kind, ())
+	return dict((name, value) for name, value in record.items() if name not in excluded and not name.startswith('_'))
+
+'''
+	Summary:
+		Returns the hash of a record's content (see record_content()).
+'''
+def record_hash(record, kind = None):
+	return hashlib.sha1(json.dumps(record_content(record, kind), sort_keys = True).encode('utf-8')).hexdigest()
+
+'''
+	Summary:
+		Computes the hash of every node of a tree, children first. Numeric columns are hashed as float64 and other columns as text,
+		so a document read back from JSON hashes the same as the sequence it was exported from.
+	Returns:
+		The root hash.
+'''
+def compute_hashes(node):
+	digest = hashlib.sha1()
+	digest.update(node.kind.encode('utf-8'))
+	digest.update(record_hash(node.record, node.kind).encode('utf-8'))
+	for name in sorted(node.columns or {}):
+		digest.update(u'{0}={1}'.format(name, _column_digest(node.columns[name])).encode('utf-8'))
+	for key, child in node.keyed_children():
+		digest.update(u'{0}:{1}'.format(key, compute_hashes(child)).encode('utf-8'))
+	node.hash = digest.hexdigest()
+	return node.hash
+
+'''
+	Summary:
+		Yields (record, columns) pairs from a file written by sequencer_export.export_sequence_jsonl().
+'''
+def iter_jsonl_records(path):
+	with open(path, 'r') as f:
+		for line in f:
+			if not line.strip():
+				continue
+			record = json.loads(line)
+			keys = record.pop('keys', None)
+			columns = None
+			if keys is not None:
+				columns = dict((name, np.asarray(values) if values else np.zeros(0)) for name, values in keys.items())
+			yield record, columns
+
+'''
+	Summary:
+		Yields (record, columns) pairs from a file written by sequencer_export.export_sequence_columnar(). Columns are memory mapped.
+'''
+def iter_columnar_records(path):
+	exported = sequencer_columnar.ColumnarSequence(path)
+	manifest = exported.manifest
+	yield dict(manifest['sequence'], record = 'sequence'), None
+	for kind in ('binding', 'track', 'section'):
+		for record in manifest[kind + 's']:
+			yield dict(record, record = kind), None
+	for record in manifest['channels']:
+		yield dict(record, record = 'channel'), exported.channel_columns(record)
+
+'''
+	Summary:
+		Loads an exported document (.jsonl, otherwise a columnar file) and computes its hashes.
+	Returns:
+		The root DocumentNode.
+'''
+def load_document(path):
+	records = iter_jsonl_records(path) if path.lower().endswith('.jsonl') else iter_columnar_records(path)
+	root = document_from_records(records)
+	compute_hashes(root)
+	return root
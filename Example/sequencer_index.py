@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Cached traversal of a LevelSequence.
+# Walking master tracks, bindings, tracks, sections and find_channels_by_type() costs one engine call per object, and every
+# example in sequencer_key_examples repeats that walk. A SequenceIndex walks the sequence once, remembers the tracks and
+# sections, and memoizes the channels of each channel type so later edit passes over the same sequence skip the traversal.
+# get_sequence_index() re-reads the tracks and sections of the sequence on every call (one engine call per track) and compares them
+# with the cached index; when a track or section was added or removed, or the asset was replaced, a new index is built. Edits made
+# while holding on to an index are not noticed, so call invalidate() after them.
+
+'''
+	Summary:
+		One channel found by the index, together with where it lives in the sequence.
+	Params:
+		binding_id - String id of the object binding the track belongs to, None for master tracks.
+		track - The MovieSceneTrack.
+		section - The MovieSceneSection the channel belongs to.
+		channel - The MovieSceneScriptingChannel.
+'''
+class ChannelEntry(object):
+	__slots__ = ('binding_id', 'track', 'track_name', 'section', 'channel')
+
+	def __init__(self, binding_id, track, track_name, section, channel):
+		self.binding_id = binding_id
+		self.track = track
+		self.track_name = track_name
+		self.section = section
+		self.channel = channel
+
+	def __repr__(self):
+		return '<ChannelEntry {0} {1} {2}>'.format(self.binding_id or 'master', self.track_name, self.channel.get_name())
+
+'''
+	Summary:
+		Traversal cache of one LevelSequence. Tracks and sections are read on first use, channels are read per channel type on first use.
+		Open the Python interactive console and use:
+			import sequencer_index
+			index = sequencer_index.get_sequence_index(unreal.load_asset("/Game/TestKeySequence", unreal.LevelSequence))
+			for entry in index.channels(unreal.MovieSceneScriptingFloatChannel, track_name = "Transform"):
+				print(entry)
+	Params:
+		sequence - The LevelSequence to index.
+'''
+class SequenceIndex(object):
+	def __init__(self, sequence, tracks = None, sections = None):
+		self.sequence = sequence
+		self._tracks = tracks # [(binding_id, track, track_name, track_path)]
+		self._sections = sections or {} # track path -> [sections]
+		self._channels = {} # (channel type, track path) -> [ChannelEntry]
+
+	'''
+		Summary:
+			Returns (binding_id, track, track_name, track_path) for the master tracks followed by the tracks of every object binding.
+	'''
+	def tracks(self):
+		if self._tracks is None:
+			self._tracks = [(None, track, track.get_name(), track.get_path_name()) for track in self.sequence.get_master_tracks()]
+			for binding in self.sequence.get_bindings():
+				binding_id = str(binding.get_id())
+				self._tracks.extend((binding_id, track, track.get_name(), track.get_path_name()) for track in binding.get_tracks())
+		return self._tracks
+
+	def _filtered_tracks(self, track_name, binding_id):
+		for track_binding_id, track, name, track_path in self.tracks():
+			if track_name is not None and name != track_name:
+				continue
+			if binding_id is not None and (track_binding_id or 'master') != binding_id:
+				continue
+			yield track_binding_id, track, name, track_path
+
+	def _track_sections(self, track, track_path):
+		if track_path not in self._sections:
+			self._sections[track_path] = track.get_sections()
+		return self._sections[track_path]
+
+	'''
+		Summary:
+			Returns (binding_id, track, section) for every section in the sequence, optionally filtered by track name and binding id.
+	'''
+	def sections(self, track_name = None, binding_id = None):
+		result = []
+		for track_binding_id, track, name, track_path in self._filtered_tracks(track_name, binding_id):
+			result.extend((track_binding_id, track, section) for section in self._track_sections(track, track_path))
+		return result
+
+	'''
+		Summary:
+			Returns the channels of the given type. The channels of a track are looked up once per channel type, later requests
+			are served from memory. Filtering by track name or binding id only visits the matching tracks.
+		Params:
+			channel_type - A MovieSceneScriptingChannel class such as unreal.MovieSceneScriptingFloatChannel, or None for every channel.
+			track_name - Only return channels of tracks with this name.
+			binding_id - Only return channels of this object binding ('master' for master tracks).
+		Returns:
+			A list of ChannelEntry.
+	'''
+	def channels(self, channel_type = None, track_name = None, binding_id = None):
+		entries = []
+		for track_binding_id, track, name, track_path in self._filtered_tracks(track_name, binding_id):
+			key = (channel_type, track_path)
+			if key not in self._channels:
+				track_entries = []
+				for section in self._track_sections(track, track_path):
+					found = section.get_channels() if channel_type is None else section.find_channels_by_type(channel_type)
+					track_entries.extend(ChannelEntry(track_binding_id, track, name, section, channel) for channel in found)
+				self._channels[key] = track_entries
+			entries.extend(self._channels[key])
+		return entries
+
+	'''
+		Summary:
+			Returns the keys of every channel of the given type, with the same filters as channels().
+	'''
+	def keys(self, channel_type, track_name = None, binding_id = None):
+		all_keys = []
+		for entry in self.channels(channel_type, track_name, binding_id):
+			all_keys.extend(entry.channel.get_keys())
+		return all_keys
+
+	'''
+		Summary:
+			Drops cached traversal results. Call it after changing the structure of the sequence.
+			Without arguments everything is dropped. With channel_type the channels of that type and the untyped (every channel)
+			lists, which contain them, are dropped (after adding or removing channels). With binding_id the track list is re-read and
+			the sections and channels of that binding's tracks are dropped (after adding or removing its tracks or sections); the
+			other bindings keep their cached sections and channels.
+		Params:
+			channel_type - Drop the channels of this type.
+			binding_id - A binding whose tracks or sections changed, 'master' for master tracks.
+	'''
+	def invalidate(self, channel_type = None, binding_id = None):
+		if channel_type is None and binding_id is None:
+			self._tracks = None
+			self._sections = {}
+			self._channels = {}
+			return
+		if binding_id is None:
+			for key in [key for key in self._channels if key[0] == channel_type or key[0] is None]:
+				del self._channels[key]
+			return
+		track_paths = set(track_path for track_binding_id, track, name, track_path in self._filtered_tracks(None, binding_id))
+		self._tracks = None
+		for track_path in track_paths:
+			self._sections.pop(track_path, None)
+		for key in [key for key in self._channels if key[1] in track_paths and (channel_type is None or key[0] in (channel_type, None))]:
+			del self._channels[key]
+
+# Path name of the sequence -> (SequenceIndex, structure signature)
+_indices = {}
+
+# Reads the tracks and sections of a sequence, in the layout SequenceIndex keeps them in
+def _read_structure(sequence):
+	tracks = [(None, track, track.get_name(), track.get_path_name()) for track in sequence.get_master_tracks()]
+	for binding in sequence.get_bindings():
+		binding_id = str(binding.get_id())
+		tracks.extend((binding_id, track, track.get_name(), track.get_path_name()) for track in binding.get_tracks())
+	sections = dict((track_path, track.get_sections()) for binding_id, track, name, track_path in tracks)
+	return tracks, sections
+
+# Tracks (with their binding) and sections by path name; channels come with the section type, so they are covered by the sections
+def _structure_signature(tracks, sections):
+	return tuple((binding_id, track_path, tuple(section.get_path_name() for section in sections[track_path]))
+		for binding_id, track, name, track_path in tracks)
+
+'''
+	Summary:
+		Returns the SequenceIndex of a sequence. Repeated edit passes over the same sequence share the index as long as its tracks and
+		sections are the same; when they changed (or the asset at the path is a different object) a new index is built.
+'''
+def get_sequence_index(sequence):
+	path = sequence.get_path_name()
+	tracks, sections = _read_structure(sequence)
+	signature = _structure_signature(tracks, sections)
+	cached = _indices.get(path)
+	if cached is not None and cached[0].sequence == sequence and cached[1] == signature:
+		return cached[0]
+	index = SequenceIndex(sequence, tracks, sections)
+	_indices[path] = (index, signature)
+	return index
+
+'''
+	Summary:
+		Drops the cached index of a sequence, or of every sequence when no sequence is given.
+'''
+def invalidate_sequence_index(sequence = None):
+	if sequence is None:
+		_indices.clear()
+	else:
+		_indices.pop(sequence.get_path_name(), None)
@@ -1,4 +1,4 @@
-import unreal
+import unreal, sequencer_index, sequencer_time
 
 '''
 	Summary:
@@ -16,26 +16,20 @@ def bool_key_example(sequencer_asset_path):
 	# Load the sequence asset
 	sequence = unreal.load_asset("/Game/TestKeySequence", unreal.LevelSequence)
 	
-	# Iterate over object bindings and tracks/sections
-	all_tracks = sequence.get_master_tracks()
+	# The index walks master tracks, object bindings, tracks and sections once per sequence and remembers the channels of each type,
+	# so calling this example again on the same sequence skips the traversal.
+	index = sequencer_index.get_sequence_index(sequence)
 	
-	for object_binding in sequence.get_bindings():
-		all_tracks.extend(object_binding.get_tracks())
-	
-	# Now we iterate through each section and look for Bool channels within each track.
-	print("Found " + str(len(all_tracks)) + " tracks, searching for bool channels...")
+	# Now we look for Bool channels within each track.
+	print("Found " + str(len(index.tracks())) + " tracks, searching for bool channels...")
 	num_bool_keys_modified = 0
-	for track in all_tracks:
-		# Tracks are composed of sections
-		for section in track.get_sections():
-			# Sections are composed of channels which contain the actual data!
-			for channel in section.find_channels_by_type(unreal.MovieSceneScriptingBoolChannel):
-				print("Found bool channel in section " + section.get_name() + " for track " + track.get_name() + " flipping values...")
-				
-				# Channels are often composed of some (optional) default values and keys.
-				for key in channel.get_keys():
-					key.set_value(not key.get_value())
-					num_bool_keys_modified = num_bool_keys_modified + 1
+	for entry in index.channels(unreal.MovieSceneScriptingBoolChannel):
+		print("Found bool channel in section " + entry.section.get_name() + " for track " + entry.track_name + " flipping values...")
+		
+		# Channels are often composed of some (optional) default values and keys.
+		for key in entry.channel.get_keys():
+			key.set_value(not key.get_value())
+			num_bool_keys_modified = num_bool_keys_modified + 1
 					
 	print ("Modified " + str(num_bool_keys_modified) + " keys!")	
 	return
@@ -61,20 +55,14 @@ def int_byte_key_example(sequencer_asset_path, amount_to_add = 5):
 	# been marked for interpolation in Cinematics ("Expose to Cinematics" in BP, or UPROPERTY(Interp) in C++) to modify.
 	print("Adding the value " + str(amount_to_add) + " to all integer and byte keys in the sequence...")
 	num_keys_modified = 0
-	for object_binding in sequence.get_bindings():
-		for track in object_binding.get_tracks():
-			for section in track.get_sections():
-				int_channels = section.find_channels_by_type(unreal.MovieSceneScriptingIntegerChannel)
-				byte_channels = section.find_channels_by_type(unreal.MovieSceneScriptingByteChannel)
-				
-				print("Found " + str(len(int_channels)) + " Integer tracks and " + str(len(byte_channels)) + " Byte channels for track " + track.get_name() + " raising values...")
-				combined_channels = []
-				combined_channels.extend(int_channels)
-				combined_channels.extend(byte_channels)
-				for channel in combined_channels:
-					for key in channel.get_keys():
-						key.set_value(key.get_value() + amount_to_add)
-						num_keys_modified = num_keys_modified + 1
+	index = sequencer_index.get_sequence_index(sequence)
+	combined_channels = [entry for entry in index.channels(unreal.MovieSceneScriptingIntegerChannel) if entry.binding_id is not None]
+	combined_channels.extend(entry for entry in index.channels(unreal.MovieSceneScriptingByteChannel) if entry.binding_id is not None)
+	print("Found " + str(len(combined_channels)) + " Integer and Byte channels in object bindings, raising values...")
+	for entry in combined_channels:
+		for key in entry.channel.get_keys():
+			key.set_value(key.get_value() + amount_to_add)
+			num_keys_modified = num_keys_modified + 1
 					
 	print("Modified " + str(num_keys_modified) + " + keys! Please note that at this time you will need to modify the structure of the sequence (rearrange track) for the changes to show up in the UI if it is currently open.")
 	return
@@ -100,21 +88,13 @@ def float_key_example(sequencer_asset_path):
 	# Float keys are more complicated than the other types of keys because they support weighted tangent data.
 	# There are many properties you can set on a key - Value, Interp Mode, Tangent Mode, Arrive/Leave Tangents, Tangent Mode and Tangent Weights
 
-	all_tracks = sequence.get_master_tracks()
 	all_float_keys = []
 	
-	for object_binding in sequence.get_bindings():
-		all_tracks.extend(object_binding.get_tracks())
-		
 	# We're going to go through all tracks and gather their float keys
-	for track in all_tracks:
-		# Tracks are composed of sections
-		for section in track.get_sections():
-			# Sections are composed of channels which contain the actual data!
-			for channel in section.find_channels_by_type(unreal.MovieSceneScriptingFloatChannel):
-				keys = channel.get_keys()
-				print('Added {0} keys from channel: {1} on section: {2}'.format(len(keys), channel.get_name(), section.get_name()))
-				all_float_keys.extend(keys)
+	for entry in sequencer_index.get_sequence_index(sequence).channels(unreal.MovieSceneScriptingFloatChannel):
+		keys = entry.channel.get_keys()
+		print('Added {0} keys from channel: {1} on section: {2}'.format(len(keys), entry.channel.get_name(), entry.section.get_name()))
+		all_float_keys.extend(keys)
 	
 	# Now we have all float keys in our sequence in all_float_keys, we can now perform a variety of operations on them.
 	print("Writing float key properties:")
@@ -181,17 +161,14 @@ def string_key_example(sequencer_asset_path):
 	# This example assumes you've created a Blueprint or C++ object with a String field that has
 	# been marked for interpolation in Cinematics ("Expose to Cinematics" in BP, or UPROPERTY(Interp) in C++) to modify.
 	print("Modifying the string value on all string keys in the sequence...")
-	for track in all_tracks:
-		# Tracks are composed of sections
-		for section in track.get_sections():
-			# Sections are composed of channels which contain the actual data!
-			for channel in section.find_channels_by_type(unreal.MovieSceneScriptingStringChannel):
-				print("Found string  channel in section " + section.get_name() + " for track " + track.get_name() + " modifying values...")
-				
-				# Channels are often composed of some (optional) default values and keys.
-				for key in channel.get_keys():
-					key.set_value(key.get_value() + "_Modified!")
-					num_bool_keys_modified = num_bool_keys_modified + 1
+	num_keys_modified = 0
+	for entry in sequencer_index.get_sequence_index(sequence).channels(unreal.MovieSceneScriptingStringChannel):
+		print("Found string  channel in section " + entry.section.get_name() + " for track " + entry.track_name + " modifying values...")
+		
+		# Channels are often composed of some (optional) default values and keys.
+		for key in entry.channel.get_keys():
+			key.set_value(key.get_value() + "_Modified!")
+			num_keys_modified = num_keys_modified + 1
 					
 	print("Modified " + str(num_keys_modified) + " + keys! Please note that at this time you will need to modify the structure of the sequence (rearrange track) for the changes to show up in the UI if it is currently open.")
 	return
@@ -214,29 +191,31 @@ def add_key_example(sequencer_asset_path):
 	# Create a test sequence for us to use.
 	sequence = unreal.load_asset("/Game/TestKeySequence", unreal.LevelSequence)
 	
+	# The frame rates are read once; converting times with sequencer_time avoids a transform_time() call per key.
+	tick_resolution = sequencer_time.FrameRate.from_unreal(sequence.get_tick_resolution())
+	display_rate = sequencer_time.FrameRate.from_unreal(sequence.get_display_rate())
+	
 	# Iterate over the Object Bindings in the sequence as they're more likely to have a track we can test with.
-	for binding in sequence.get_bindings():
-		for track in binding.get_tracks():
-			print(track)
-			for section in track.get_sections():
-				print("\tSection: " + section.get_name())
-
-				for channel in section.get_channels():
-					print("\tChannel: " + channel.get_name())
-					
-					keys = channel.get_keys()
-					for key in keys:				
-						# Calculate a new Frame Number for the new key by halving the current time
-						new_time = unreal.FrameNumber(key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value * 0.5)
-						# Add a new key to this channel with the opposite value of the current key
-						new_key = channel.add_key(new_time, not key.get_value(), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
-						
-						# Print out our information. This shows how to convert between the Sequence Tick Resolution (which is the number a key is stored on)
-						# and the Display Rate (which is what is shown in the UI) as well.
-						new_time_in_display_rate = unreal.TimeManagementLibrary.transform_time(unreal.FrameTime(new_time), sequence.get_tick_resolution(), sequence.get_display_rate())
-						print('Inserting a new key at Frame {0}:{1} (Tick {2}) with Value: {3}'.format(
-							new_time_in_display_rate.frame_number.value, new_time_in_display_rate.sub_frame, new_time.value, new_key.get_value())
-							)
+	for entry in sequencer_index.get_sequence_index(sequence).channels():
+		if entry.binding_id is None:
+			continue
+		print("\tSection: " + entry.section.get_name())
+		channel = entry.channel
+		print("\tChannel: " + channel.get_name())
+		
+		keys = channel.get_keys()
+		for key in keys:				
+			# Calculate a new Frame Number for the new key by halving the current time
+			new_time = unreal.FrameNumber(key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value * 0.5)
+			# Add a new key to this channel with the opposite value of the current key
+			new_key = channel.add_key(new_time, not key.get_value(), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
+			
+			# Print out our information. This shows how to convert between the Sequence Tick Resolution (which is the number a key is stored on)
+			# and the Display Rate (which is what is shown in the UI) as well.
+			new_frame_in_display_rate, new_sub_frame_in_display_rate = sequencer_time.transform_time(new_time.value, tick_resolution, display_rate)
+			print('Inserting a new key at Frame {0}:{1} (Tick {2}) with Value: {3}'.format(
+				new_frame_in_display_rate, new_sub_frame_in_display_rate, new_time.value, new_key.get_value())
+				)
 						
 	print("Finished!")
 	return
@@ -244,10 +223,9 @@ def add_key_example(sequencer_asset_path):
 def add_time_to_keys(sequence, key_array, time):
 	print('Adding {0} frames (time) to {1} keys in array...'.format(time, len(key_array)))
 	
-	# Initialize a FrameNumber from the given time and then convert it to a FrameTime with no sub-frame. Keys can only exist on whole FrameNumbers.
-	time_as_frame_time = unreal.FrameTime(unreal.FrameNumber(time))
-	# Now transform from our Display Rate to the internal tick resolution.
-	time_as_tick = unreal.TimeManagementLibrary.transform_time(time_as_frame_time, sequence.get_display_rate(), sequence.get_tick_resolution())
+	# Transform the given number of frames from our Display Rate to the internal tick resolution. Keys can only exist on whole FrameNumbers.
+	# sequencer_time does the same conversion as unreal.TimeManagementLibrary.transform_time() without calling into the engine.
+	time_as_tick = sequencer_time.display_to_ticks(sequence, time)
 	
 	# Now we apply the new offset to each key in the array. key.get_time() and key.set_time() can take a frame number in either
 	# Display Rate space or Tick Resolution. If you only want keys on whole frames as shown by the UI then you can use Display Rate
@@ -269,9 +247,13 @@ def add_time_to_keys(sequence, key_array, time):
 	#					This means "key.set_key(key.get_key().frame_number, key.get_key().sub_frame)" will not have any affect on position as the defaults for both are in the same resolution.
 	#	- get_key(unreal.SequenceTimeUnit.DISPLAY_RATE) 	- Returns the internal tick that this key is on with a 0.0 subframe value.
 	#														  This means "key.set_key(key.get_key(unreal.SequenceTimeUnit.TICK_RESOLUTION), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)" will not have any affect on position.
+	#
+	# The keys are moved in Tick Resolution by time_as_tick so keys between frames keep their sub-frame position.
+	time_as_tick = int(time_as_tick)
 	for key in key_array:
+		current_tick = key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value
 		print('CurrentTime: {0} NewTime: {1}'.format(key.get_time().frame_number, key.get_time().frame_number + time))
-		key.set_time(key.get_time().frame_number + time, 0.0, unreal.SequenceTimeUnit.DISPLAY_RATE)
+		key.set_time(unreal.FrameNumber(current_tick + time_as_tick), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
 	
 	print('Finished!')
 	return
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Bulk population of a LevelSequence from many actors (crowds).
+# sequencer_examples.create_sequence_from_selection() binds one actor at a time: it recomputes the section range, tries a
+# CameraActor cast, adds a camera cut track and prints for every actor. Here the range is computed once, the track template of
+# each actor class is resolved once, actors are bound in their given order in batches behind a cancellable progress dialog,
+# and cameras share one camera cut track. The 4.23 scripting API has no call that binds several actors at once, so every binding
+# is still one add_possessable(); the savings are the per-actor work around it.
+import unreal, time
+import sequencer_index
+
+# Track templates: the first entry whose actor class matches an actor decides the tracks its binding gets.
+# Every entry is (actor class, track classes, add a camera cut section).
+DEFAULT_TRACK_TEMPLATES = (
+	(unreal.CameraActor, (unreal.MovieScene3DTransformTrack,), True),
+	(unreal.SkeletalMeshActor, (unreal.MovieScene3DTransformTrack, unreal.MovieSceneSkeletalAnimationTrack), False),
+	(unreal.Actor, (unreal.MovieScene3DTransformTrack,), False),
+)
+
+# The tracks sequencer_examples.create_sequence_from_selection() adds: a transform track for every actor, a camera cut for cameras
+TRANSFORM_ONLY_TEMPLATES = (
+	(unreal.CameraActor, (unreal.MovieScene3DTransformTrack,), True),
+	(unreal.Actor, (unreal.MovieScene3DTransformTrack,), False),
+)
+
+'''
+	Summary:
+		Resolves the track template of every actor, looking it up once per actor class.
+	Params:
+		actors - The actors.
+		track_templates - See DEFAULT_TRACK_TEMPLATES.
+	Returns:
+		A list of (actor, template) with template = (track classes, camera cut), in the order of actors. Actors that match no template
+		are left out.
+'''
+def actor_templates(actors, track_templates = DEFAULT_TRACK_TEMPLATES):
+	templates_by_class = {}
+	result = []
+	for actor in actors:
+		actor_class = actor.get_class().get_name()
+		if actor_class not in templates_by_class:
+			templates_by_class[actor_class] = None
+			for template_class, track_classes, camera_cut in track_templates:
+				if isinstance(actor, template_class):
+					templates_by_class[actor_class] = (track_classes, camera_cut)
+					break
+		if templates_by_class[actor_class] is not None:
+			result.append((actor, templates_by_class[actor_class]))
+	return result
+
+'''
+	Summary:
+		Binds actors to a sequence, in their given order, and gives every binding the tracks of its template, with one section over the
+		precomputed range.
+		Open the Python interactive console and use:
+			import sequencer_populate
+			sequence = unreal.load_asset("/Game/CrowdSequence", unreal.LevelSequence)
+			sequencer_populate.populate_from_actors(sequence, unreal.EditorLevelLibrary.get_selected_level_actors(), 5)
+	Params:
+		sequence - The LevelSequence to populate.
+		actors - The actors to bind.
+		length_seconds - Length of the section added to every track.
+		batch_size - Number of actors bound per progress step.
+		track_templates - See DEFAULT_TRACK_TEMPLATES.
+		num_sections - Number of consecutive sections of length_seconds per track.
+	Returns:
+		A dict with the created bindings, the number of tracks and sections, the seconds spent and "cancelled", True when the
+		progress dialog was cancelled and only part of the actors were bound.
+'''
+def populate_from_actors(sequence, actors, length_seconds = 5, batch_size = 100, track_templates = DEFAULT_TRACK_TEMPLATES, num_sections = 1):
+	start_time = time.time()
+	actors = list(actors)
+	section_ranges = [sequence.make_range_seconds(i * length_seconds, length_seconds) for i in range(num_sections)]
+	camera_cut_range = sequence.make_range_seconds(0, length_seconds * num_sections)
+	camera_cut_track = None
+	bindings = []
+	num_tracks = num_sections_created = 0
+	cancelled = False
+
+	with unreal.ScopedSlowTask(len(actors), 'Binding {0} actors to {1}'.format(len(actors), sequence.get_name())) as slow_task:
+		slow_task.make_dialog(True)
+		templated = actor_templates(actors, track_templates)
+		for start in range(0, len(templated), batch_size):
+			if slow_task.should_cancel():
+				cancelled = True
+				break
+			batch = templated[start:start + batch_size]
+			for actor, (track_classes, camera_cut) in batch:
+				binding = sequence.add_possessable(actor)
+				bindings.append(binding)
+				for track_class in track_classes:
+					track = binding.add_track(track_class)
+					num_tracks = num_tracks + 1
+					for section_range in section_ranges:
+						track.add_section().set_range(section_range)
+						num_sections_created = num_sections_created + 1
+
+				if camera_cut:
+					if camera_cut_track is None:
+						camera_cut_track = sequence.add_master_track(unreal.MovieSceneCameraCutTrack)
+					camera_cut_section = camera_cut_track.add_section()
+					camera_cut_section.set_range(camera_cut_range)
+					camera_binding_id = unreal.MovieSceneObjectBindingID()
+					camera_binding_id.set_editor_property("Guid", binding.get_id())
+					camera_cut_section.set_editor_property("CameraBindingID", camera_binding_id)
+					num_sections_created = num_sections_created + 1
+			slow_task.enter_progress_frame(len(batch))
+
+	sequencer_index.invalidate_sequence_index(sequence)
+	seconds = time.time() - start_time
+	print('Bound {0} actors ({1} tracks, {2} sections) in {3:.2f}s, {4:.0f} actors/s{5}'.format(
+		len(bindings), num_tracks, num_sections_created, seconds, len(bindings) / seconds if seconds > 0 else 0.0,
+		', cancelled after {0} of {1}'.format(len(bindings), len(actors)) if cancelled else ''))
+	return {'bindings' : bindings, 'tracks' : num_tracks, 'sections' : num_sections_created, 'seconds' : seconds, 'cancelled' : cancelled}
+
+'''
+	Summary:
+		Bulk version of sequencer_examples.create_sequence_from_selection(): the same tracks (TRANSFORM_ONLY_TEMPLATES) and the same
+		binding order, with the selection read in one call instead of iterated.
+		Open the Python interactive console and use:
+			import sequencer_populate
+			sequencer_populate.create_sequence_from_selection_bulk("CrowdSequence", 5, '/Game/')
+	Params:
+		asset_name - Name of the resulting asset.
+		length_seconds - Length of the sections.
+		package_path - Package path to put the asset into.
+		batch_size - Number of actors bound per progress step.
+		track_templates - See DEFAULT_TRACK_TEMPLATES; pass DEFAULT_TRACK_TEMPLATES to also give skeletal meshes an animation track.
+	Returns:
+		The created LevelSequence asset.
+'''
+def create_sequence_from_selection_bulk(asset_name, length_seconds = 5, package_path = '/Game/', batch_size = 100, track_templates = TRANSFORM_ONLY_TEMPLATES):
+	sequence = unreal.AssetToolsHelpers.get_asset_tools().create_asset(asset_name, package_path, unreal.LevelSequence, unreal.LevelSequenceFactoryNew())
+	populate_from_actors(sequence, unreal.EditorLevelLibrary.get_selected_level_actors(), length_seconds, batch_size, track_templates)
+	return sequence
+
+# The per-actor loop of sequencer_examples.create_sequence_from_selection(), without its print
+def _populate_per_actor(sequence, actors, length_seconds):
+	for actor in actors:
+		binding = sequence.add_possessable(actor)
+		track = binding.add_track(unreal.MovieScene3DTransformTrack)
+		track.add_section().set_range(sequence.make_range_seconds(0, length_seconds))
+		try:
+			camera = unreal.CameraActor.cast(actor)
+			camera_cut_track = sequence.add_master_track(unreal.MovieSceneCameraCutTrack)
+			camera_cut_section = camera_cut_track.add_section()
+			camera_cut_section.set_range(sequence.make_range_seconds(0, length_seconds))
+			camera_binding_id = unreal.MovieSceneObjectBindingID()
+			camera_binding_id.set_editor_property("Guid", binding.get_id())
+			camera_cut_section.set_editor_property("CameraBindingID", camera_binding_id)
+		except TypeError:
+			pass
+
+'''
+	Summary:
+		Measures throughput against actor count for the per-actor loop and the bulk builder. Each run binds the first N selected actors
+		(or the first N actors of the level when nothing is selected) into a temporary sequence that is deleted afterwards.
+		Both runs use the transform-only template so they create the same tracks.
+		Open the Python interactive console and use:
+			import sequencer_populate
+			sequencer_populate.benchmark_population((10, 100, 1000))
+	Params:
+		actor_counts - Actor counts to measure.
+		length_seconds - Length of the sections.
+		package_path - Package path of the temporary sequences.
+	Returns:
+		A list of dicts {'actors', 'per_actor_seconds', 'bulk_seconds', 'per_actor_rate', 'bulk_rate'}.
+'''
+def benchmark_population(actor_counts = (10, 100, 1000), length_seconds = 5, package_path = '/Game/PopulateBenchmark/'):
+	actors = unreal.EditorLevelLibrary.get_selected_level_actors() or unreal.EditorLevelLibrary.get_all_level_actors()
+	asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+	results = []
+	for count in actor_counts:
+		subset = actors[:count]
+		per_actor_sequence = asset_tools.create_asset('PerActor_{0}'.format(count), package_path, unreal.LevelSequence, unreal.LevelSequenceFactoryNew())
+		bulk_sequence = asset_tools.create_asset('Bulk_{0}'.format(count), package_path, unreal.LevelSequence, unreal.LevelSequenceFactoryNew())
+		try:
+			start_time = time.time()
+			_populate_per_actor(per_actor_sequence, subset, length_seconds)
+			per_actor_seconds = time.time() - start_time
+			bulk_seconds = populate_from_actors(bulk_sequence, subset, length_seconds, track_templates = TRANSFORM_ONLY_TEMPLATES)['seconds']
+		finally:
+			unreal.EditorAssetLibrary.delete_asset(per_actor_sequence.get_path_name())
+			unreal.EditorAssetLibrary.delete_asset(bulk_sequence.get_path_name())
+		results.append({
+			'actors' : len(subset),
+			'per_actor_seconds' : per_actor_seconds,
+			'bulk_seconds' : bulk_seconds,
+			'per_actor_rate' : len(subset) / per_actor_seconds if per_actor_seconds > 0 else 0.0,
+			'bulk_rate' : len(subset) / bulk_seconds if bulk_seconds > 0 else 0.0,
+		})
+
+	print('{0:>8} {1:>14} {2:>14}'.format('actors', 'per-actor/s', 'bulk/s'))
+	for result in results:
+		print('{0:>8} {1:>14.0f} {2:>14.0f}'.format(result['actors'], result['per_actor_rate'], result['bulk_rate']))
+	return results
@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Render output cache.
+# A render is keyed by the content hash of the sequence (the sequencer_hash root: bindings, tracks, sections and keys) combined
+# with a canonical hash of the capture settings: the AutomatedLevelSequenceCapture and its MovieSceneCaptureSettings, the
+# capture protocol settings (CompositionGraphCaptureSettings, ...) and the burn-in options. When a key was rendered before, the
+# cached frames are copied into the output folder instead of rendering again. Cached renders are evicted least recently used
+# first once the cache is over its disk budget.
+# The key does not see changes outside the sequence asset (the level, meshes, materials, sub-sequences); pass extra_key (e.g. a
+# changelist number) to cover them.
+#	import sequencer_render_cache, sequencer_examples
+#	cache = sequencer_render_cache.RenderCache("E:/RenderCache", budget_bytes = 200 * 1024 ** 3)
+#	sequencer_render_cache.render_movie_cached(capture_settings, cache)
+import os
+import json
+import time
+import shutil
+import hashlib
+import sqlite3
+import sequencer_diff
+
+DEFAULT_BUDGET_BYTES = 50 * 1024 ** 3
+
+# Properties of the capture objects that decide what is rendered. Output location and process options (output_directory,
+# overwrite_existing, use_separate_process, close_editor_when_capture_starts) are left out so they don't change the key.
+CAPTURE_SETTINGS_PROPERTIES = {
+	'MovieSceneCaptureSettings' : ('game_mode_override', 'output_format', 'use_relative_frame_numbers', 'handle_frames', 'zero_pad_frame_numbers',
+		'frame_rate', 'resolution', 'enable_texture_streaming', 'cinematic_engine_scalability', 'cinematic_mode', 'allow_movement',
+		'allow_turning', 'show_player', 'show_hud'),
+	'AutomatedLevelSequenceCapture' : ('level_sequence_asset', 'capture_type', 'additional_command_line_arguments', 'inherited_command_line_arguments',
+		'use_custom_start_frame', 'use_custom_end_frame', 'custom_start_frame', 'custom_end_frame', 'warm_up_frame_count', 'delay_before_warm_up',
+		'delay_before_shot_warm_up', 'write_edit_decision_list'),
+	'CompositionGraphCaptureSettings' : ('include_render_passes', 'capture_frames_in_hdr', 'hdr_compression_quality', 'capture_gamut',
+		'post_processing_material', 'disable_screen_percentage'),
+	'ImageCaptureSettings' : ('compression_quality',),
+	'VideoCaptureSettings' : ('use_compression', 'compression_quality', 'video_codec'),
+	'LevelSequenceBurnInOptions' : ('use_burn_in', 'burn_in_class'),
+	# Blueprint properties of /Engine/Sequencer/DefaultBurnIn, read with get_editor_property()
+	'DefaultBurnIn_C' : ('TopLeftText', 'TopCenterText', 'TopRightText', 'BottomLeftText', 'BottomCenterText', 'BottomRightText', 'Watermark',
+		'WatermarkTint'),
+}
+
+# Fields of the structs found in the capture settings
+_STRUCT_FIELDS = {
+	'FrameRate' : ('numerator', 'denominator'),
+	'FrameNumber' : ('value',),
+	'CaptureResolution' : ('res_x', 'res_y'),
+	'CaptureProtocolID' : ('identifier',),
+	'CompositionGraphCapturePasses' : ('value',),
+	'DirectoryPath' : ('path',),
+	'LinearColor' : ('r', 'g', 'b', 'a'),
+}
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+	key TEXT PRIMARY KEY,
+	sequence TEXT,
+	content_hash TEXT,
+	settings_hash TEXT,
+	num_files INTEGER NOT NULL,
+	size INTEGER NOT NULL,
+	created REAL NOT NULL,
+	last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used);
+'''
+
+'''
+	Summary:
+		Converts a property value of the capture settings to plain, comparable data: structs to dicts of their fields, objects and
+		classes to their path, enums to their name.
+'''
+def canonical_value(value):
+	# Imported here so the cache itself works outside the editor
+	import unreal
+	if value is None or isinstance(value, (bool, int, float)):
+		return value
+	if isinstance(value, (list, tuple, unreal.Array)):
+		return [canonical_value(item) for item in value]
+	if isinstance(value, unreal.EnumBase):
+		return str(value.name)
+	if isinstance(value, unreal.StructBase):
+		type_name = type(value).__name__
+		if type_name in _STRUCT_FIELDS:
+			return dict((field, canonical_value(value.get_editor_property(field))) for field in _STRUCT_FIELDS[type_name])
+		return {type_name : value.export_text()}
+	if isinstance(value, unreal.Object):
+		return value.get_path_name()
+	return u'{0}'.format(value)
+
+'''
+	Summary:
+		Canonical dict of the properties listed in CAPTURE_SETTINGS_PROPERTIES for one object or struct, keyed by its class name.
+		Classes without a property list are recorded by name only.
+'''
+def object_to_dict(value):
+	type_name = value.get_class().get_name() if hasattr(value, 'get_class') else type(value).__name__
+	properties = CAPTURE_SETTINGS_PROPERTIES.get(type_name, ())
+	return {type_name : dict((name, canonical_value(value.get_editor_property(name))) for name in properties)}
+
+'''
+	Summary:
+		Canonical dict of an AutomatedLevelSequenceCapture: the capture, its settings, its protocol settings and its burn-in.
+'''
+def capture_settings_to_dict(capture_settings):
+	result = {}
+	result.update(object_to_dict(capture_settings))
+	result.update(object_to_dict(capture_settings.settings))
+	protocol_settings = capture_settings.get_editor_property('protocol_settings')
+	if protocol_settings is not None:
+		result['protocol'] = object_to_dict(protocol_settings)
+	burn_in_options = capture_settings.get_editor_property('burn_in_options')
+	if burn_in_options is not None:
+		result.update(object_to_dict(burn_in_options))
+		if burn_in_options.use_burn_in and burn_in_options.settings is not None:
+			result['burn_in'] = object_to_dict(burn_in_options.settings)
+	return result
+
+'''
+	Summary:
+		Hash of a settings dict, independent of key order.
+'''
+def settings_hash(settings):
+	return hashlib.sha1(json.dumps(settings, sort_keys = True).encode('utf-8')).hexdigest()
+
+'''
+	Summary:
+		Cache key of a render.
+	Params:
+		content_hash - sequencer_hash root hash of the sequence.
+		settings_hash - Hash of the capture settings (see settings_hash()).
+		extra_key - Optional string for inputs outside the sequence.
+'''
+def render_key(content_hash, settings_hash, extra_key = None):
+	return hashlib.sha1(u'{0}:{1}:{2}'.format(content_hash, settings_hash, extra_key or '').encode('utf-8')).hexdigest()
+
+def _directory_size(directory):
+	size = 0
+	num_files = 0
+	for root, directories, file_names in os.walk(directory):
+		for file_name in file_names:
+			size = size + os.path.getsize(os.path.join(root, file_name))
+			num_files = num_files + 1
+	return size, num_files
+
+'''
+	Summary:
+		Cached render outputs: one folder per key under cache_root, with a SQLite index of their sizes and last use.
+	Params:
+		cache_root - Folder of the cache.
+		budget_bytes - Disk budget; least recently used entries are removed when it is exceeded.
+'''
+class RenderCache(object):
+	def __init__(self, cache_root, budget_bytes = DEFAULT_BUDGET_BYTES):
+		if not os.path.isdir(cache_root):
+			os.makedirs(cache_root)
+		self.cache_root = cache_root
+		self.budget_bytes = budget_bytes
+		self.connection = sqlite3.connect(os.path.join(cache_root, 'index.db'), timeout = 30)
+		self.connection.row_factory = sqlite3.Row
+		self.connection.executescript(_SCHEMA)
+		self.connection.commit()
+
+	def close(self):
+		self.connection.close()
+
+	def entry_directory(self, key):
+		return os.path.join(self.cache_root, key[:2], key)
+
+	def entries(self):
+		return self.connection.execute('SELECT * FROM entries ORDER BY last_used DESC').fetchall()
+
+	def total_size(self):
+		return self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+	'''
+		Summary:
+			Returns the index row of a key and marks it as used, or None when the key is not cached (or its folder is gone, or it has
+			no files).
+	'''
+	def lookup(self, key):
+		row = self.connection.execute('SELECT * FROM entries WHERE key = ?', (key,)).fetchone()
+		if row is None:
+			return None
+		if row['num_files'] == 0 or not os.path.isdir(self.entry_directory(key)):
+			shutil.rmtree(self.entry_directory(key), ignore_errors = True)
+			self.connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+			self.connection.commit()
+			return None
+		self.connection.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+		self.connection.commit()
+		return row
+
+	'''
+		Summary:
+			Copies the cached files of a key into a folder.
+		Returns:
+			The number of files copied, or None when the key is not cached.
+	'''
+	def restore(self, key, output_directory):
+		if self.lookup(key) is None:
+			return None
+		entry_directory = self.entry_directory(key)
+		num_files = 0
+		for root, directories, file_names in os.walk(entry_directory):
+			destination_root = os.path.join(output_directory, os.path.relpath(root, entry_directory))
+			if not os.path.isdir(destination_root):
+				os.makedirs(destination_root)
+			for file_name in file_names:
+				shutil.copy2(os.path.join(root, file_name), os.path.join(destination_root, file_name))
+				num_files = num_files + 1
+		return num_files
+
+	'''
+		Summary:
+			Stores files under a key, replacing an older entry of the same key, and evicts down to the budget.
+		Params:
+			key - See render_key().
+			source_directory - Folder the files are in.
+			relative_paths - Files to store, relative to source_directory.
+			sequence, content_hash, settings_hash - Recorded in the index for inspection.
+		Returns:
+			False when there are no files; nothing is stored then, since an empty entry would restore as a render without frames.
+	'''
+	def store(self, key, source_directory, relative_paths, sequence = None, content_hash = None, settings_hash = None):
+		if not relative_paths:
+			return False
+		entry_directory = self.entry_directory(key)
+		temp_directory = entry_directory + '.tmp'
+		shutil.rmtree(temp_directory, ignore_errors = True)
+		for relative_path in relative_paths:
+			destination = os.path.join(temp_directory, relative_path)
+			if not os.path.isdir(os.path.dirname(destination)):
+				os.makedirs(os.path.dirname(destination))
+			shutil.copy2(os.path.join(source_directory, relative_path), destination)
+		if not os.path.isdir(temp_directory):
+			os.makedirs(temp_directory)
+		shutil.rmtree(entry_directory, ignore_errors = True)
+		os.rename(temp_directory, entry_directory)
+		size, num_files = _directory_size(entry_directory)
+		now = time.time()
+		self.connection.execute('INSERT OR REPLACE INTO entries (key, sequence, content_hash, settings_hash, num_files, size, created, last_used) '
+			'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (key, sequence, content_hash, settings_hash, num_files, size, now, now))
+		self.connection.commit()
+		self.evict(keep = key)
+		return True
+
+	'''
+		Summary:
+			Removes least recently used entries until the cache fits the budget.
+		Params:
+			budget_bytes - Budget to evict down to, the cache's budget by default.
+			keep - Key that is not removed (the entry just stored).
+		Returns:
+			The removed keys.
+	'''
+	def evict(self, budget_bytes = None, keep = None):
+		budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+		total = self.total_size()
+		removed = []
+		for row in self.connection.execute('SELECT key, size FROM entries ORDER BY last_used').fetchall():
+			if total <= budget_bytes:
+				break
+			if row['key'] == keep:
+				continue
+			shutil.rmtree(self.entry_directory(row['key']), ignore_errors = True)
+			self.connection.execute('DELETE FROM entries WHERE key = ?', (row['key'],))
+			total = total - row['size']
+			removed.append(row['key'])
+		self.connection.commit()
+		return removed
+
+def _snapshot(directory):
+	files = {}
+	for root, directories, file_names in os.walk(directory):
+		for file_name in file_names:
+			path = os.path.join(root, file_name)
+			files[os.path.relpath(path, directory)] = os.path.getmtime(path)
+	return files
+
+# Stores the files of a folder that are new or changed since the snapshot was taken
+def _store_written(cache, key, output_directory, before, sequence, content_hash, settings_hash):
+	written = [path for path, mtime in _snapshot(output_directory).items() if before.get(path) != mtime]
+	if not cache.store(key, output_directory, written, sequence, content_hash, settings_hash):
+		print('Render of {0} wrote no files, not cached'.format(sequence or key))
+
+'''
+	Summary:
+		Runs render() unless its key is cached; a successful render's new or changed files in output_directory are cached.
+		Works for any synchronous renderer that writes every frame, e.g. sequencer_render_shards.render_sequence_sharded(); a render
+		that wrote no files is not cached.
+	Params:
+		cache - The RenderCache.
+		key - See render_key().
+		output_directory - Folder the render writes to.
+		render - Callable without arguments that renders and returns True on success.
+	Returns:
+		(cached, success): cached is True when the frames came from the cache.
+'''
+def cached_render(cache, key, output_directory, render, sequence = None, content_hash = None, settings_hash = None):
+	if cache.restore(key, output_directory) is not None:
+		return True, True
+	before = _snapshot(output_directory)
+	success = render()
+	if success:
+		_store_written(cache, key, output_directory, before, sequence, content_hash, settings_hash)
+	return False, success
+
+'''
+	Summary:
+		Cache key of a sequence asset rendered with an AutomatedLevelSequenceCapture.
+	Params:
+		capture_settings - The AutomatedLevelSequenceCapture; its level_sequence_asset names the sequence.
+		hash_cache_path - Optional sequencer_diff hash tree cache, so an unchanged, saved sequence is not hashed again.
+		extra_key - Optional string for inputs outside the sequence.
+	Returns:
+		(key, content_hash, settings_hash)
+'''
+def capture_render_key(capture_settings, hash_cache_path = None, extra_key = None):
+	sequencer_asset_path = str(capture_settings.level_sequence_asset.export_text()).strip('"')
+	hash_cache = sequencer_diff.HashTreeCache(hash_cache_path) if hash_cache_path else None
+	content_hash = sequencer_diff.sequence_tree(sequencer_asset_path, hash_cache).hash
+	if hash_cache is not None:
+		hash_cache.save()
+	capture_hash = settings_hash(capture_settings_to_dict(capture_settings))
+	return render_key(content_hash, capture_hash, extra_key), content_hash, capture_hash
+
+'''
+	Summary:
+		unreal.SequencerTools.render_movie() with the render cache: a cached render is copied to the output folder at once, otherwise
+		the movie is rendered and its frames are cached when the render reports success.
+		Open the Python interactive console and use:
+			import sequencer_render_cache
+			cache = sequencer_render_cache.RenderCache("E:/RenderCache")
+			sequencer_render_cache.render_movie_cached(capture_settings, cache, "E:/RenderCache/sequence_hashes.json")
+	Params:
+		capture_settings - A configured AutomatedLevelSequenceCapture (see sequencer_examples.render_sequence_to_movie()).
+		cache - The RenderCache.
+		hash_cache_path - Optional sequencer_diff hash tree cache.
+		extra_key - Optional string for inputs outside the sequence.
+		on_finished - Optional callable(success, cached) called when the frames are in place.
+	Returns:
+		True when the frames came from the cache, False when a render was started.
+'''
+def render_movie_cached(capture_settings, cache, hash_cache_path = None, extra_key = None, on_finished = None):
+	import unreal
+	key, content_hash, capture_hash = capture_render_key(capture_settings, hash_cache_path, extra_key)
+	output_directory = unreal.Paths.convert_relative_path_to_full(capture_settings.settings.output_directory.path)
+	sequence_name = str(capture_settings.level_sequence_asset.export_text()).strip('"')
+	if cache.restore(key, output_directory) is not None:
+		print('Render of {0} restored from cache {1}'.format(sequence_name, key))
+		if on_finished is not None:
+			on_finished(True, True)
+		return True
+
+	before = _snapshot(output_directory)
+	# Without overwrite_existing the capture skips frames that are already there, so the written files would be an incomplete render
+	complete = capture_settings.settings.overwrite_existing or not before
+
+	# render_movie() returns as soon as the capture starts; the files are stored when it reports that it finished
+	def on_render_movie_stopped(success):
+		if success and complete:
+			_store_written(cache, key, output_directory, before, sequence_name, content_hash, capture_hash)
+		elif success:
+			print('Render of {0} kept existing frames (overwrite_existing is off), not cached'.format(sequence_name))
+		if on_finished is not None:
+			on_finished(success, False)
+
+	on_finished_callback = unreal.OnRenderMovieStopped()
+	on_finished_callback.bind_callable(on_render_movie_stopped)
+	unreal.SequencerTools.render_movie(capture_settings, on_finished_callback)
+	return False
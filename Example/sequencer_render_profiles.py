@@ -0,0 +1,533 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Declarative render profiles.
+# sequencer_examples.render_sequence_to_movie() sets every capture setting one attribute at a time on every call. A profile lists
+# the same settings as data (in PROFILES or a JSON/YAML file); it is validated against SCHEMA and compiled once into a
+# CaptureTemplate that holds the converted values, the settings struct and the protocol and burn-in objects. Stamping the
+# template creates a capture for one shot with only the per-shot fields set (sequence, frame range, output folder).
+# Profiles can extend another profile and only list what differs. Validation does not need the editor, so profile files can be
+# checked outside it.
+#	import sequencer_render_profiles
+#	template = sequencer_render_profiles.get_capture_template('custom_passes_720p24')
+#	capture_settings = template.stamp("/Game/TestSequence", start_frame = 0, end_frame = 120)
+#	unreal.SequencerTools.render_movie(capture_settings)
+import copy
+import json
+import hashlib
+
+# Kinds of values and the types a profile may use for them
+_STRING_TYPES = (type(''), type(u''))
+_KIND_CHECKS = {
+	'bool' : lambda value: isinstance(value, bool),
+	'int' : lambda value: isinstance(value, int) and not isinstance(value, bool),
+	'float' : lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+	'str' : lambda value: isinstance(value, _STRING_TYPES),
+	'text' : lambda value: isinstance(value, _STRING_TYPES),
+	'frame_rate' : lambda value: _is_number_list(value, 2, int),
+	'frame_number' : lambda value: isinstance(value, int) and not isinstance(value, bool),
+	'resolution' : lambda value: _is_number_list(value, 2, int),
+	'color' : lambda value: _is_number_list(value, 4, (int, float)),
+	'directory' : lambda value: isinstance(value, _STRING_TYPES),
+	'soft_object' : lambda value: isinstance(value, _STRING_TYPES),
+	'soft_class' : lambda value: isinstance(value, _STRING_TYPES),
+	'class' : lambda value: value is None or isinstance(value, _STRING_TYPES),
+	'asset' : lambda value: value is None or isinstance(value, _STRING_TYPES),
+	'string_list' : lambda value: isinstance(value, list) and all(isinstance(item, _STRING_TYPES) for item in value),
+	'HDRCaptureGamut' : lambda value: value in ('HCGM_REC709', 'HCGM_P3DCI', 'HCGM_REC2020', 'HCGM_ACES', 'HCGM_ACESCG', 'HCGM_LINEAR'),
+}
+
+# Properties a profile may set, per section:
+#	settings - MovieSceneCaptureSettings (capture_settings.settings)
+#	capture - AutomatedLevelSequenceCapture
+#	protocol_settings - the settings object of the profile's "protocol" (see PROTOCOL_SETTINGS)
+#	burn_in - LevelSequenceBurnInOptions
+#	burn_in_settings - Blueprint properties of the burn-in class (/Engine/Sequencer/DefaultBurnIn)
+SCHEMA = {
+	'settings' : {
+		'output_directory' : 'directory',
+		'game_mode_override' : 'class',
+		'output_format' : 'str',
+		'overwrite_existing' : 'bool',
+		'use_relative_frame_numbers' : 'bool',
+		'handle_frames' : 'int',
+		'zero_pad_frame_numbers' : 'int',
+		'frame_rate' : 'frame_rate',
+		'resolution' : 'resolution',
+		'enable_texture_streaming' : 'bool',
+		'cinematic_engine_scalability' : 'bool',
+		'cinematic_mode' : 'bool',
+		'allow_movement' : 'bool',
+		'allow_turning' : 'bool',
+		'show_player' : 'bool',
+		'show_hud' : 'bool',
+	},
+	'capture' : {
+		'use_separate_process' : 'bool',
+		'close_editor_when_capture_starts' : 'bool',
+		'additional_command_line_arguments' : 'str',
+		'inherited_command_line_arguments' : 'str',
+		'use_custom_start_frame' : 'bool',
+		'use_custom_end_frame' : 'bool',
+		'custom_start_frame' : 'frame_number',
+		'custom_end_frame' : 'frame_number',
+		'warm_up_frame_count' : 'int',
+		'delay_before_warm_up' : 'float',
+		'delay_before_shot_warm_up' : 'float',
+		'write_edit_decision_list' : 'bool',
+	},
+	'burn_in' : {
+		'use_burn_in' : 'bool',
+		'burn_in_class' : 'soft_class',
+	},
+	'burn_in_settings' : {
+		'TopLeftText' : 'text',
+		'TopCenterText' : 'text',
+		'TopRightText' : 'text',
+		'BottomLeftText' : 'text',
+		'BottomCenterText' : 'text',
+		'BottomRightText' : 'text',
+		'Watermark' : 'asset',
+		'WatermarkTint' : 'color',
+	},
+}
+
+# Capture protocol identifier -> (settings class, properties of the settings object)
+PROTOCOL_SETTINGS = {
+	'CustomRenderPasses' : ('CompositionGraphCaptureSettings', {
+		'include_render_passes' : 'string_list',
+		'capture_frames_in_hdr' : 'bool',
+		'hdr_compression_quality' : 'int',
+		'capture_gamut' : 'HDRCaptureGamut',
+		'post_processing_material' : 'soft_object',
+		'disable_screen_percentage' : 'bool',
+	}),
+	'PNG' : ('ImageCaptureSettings', {'compression_quality' : 'int'}),
+	'JPG' : ('ImageCaptureSettings', {'compression_quality' : 'int'}),
+	'BMP' : ('ImageCaptureSettings', {'compression_quality' : 'int'}),
+	# For EXR compression_quality 0 writes compressed files and 1 uncompressed ones
+	'EXR' : ('ImageCaptureSettings', {'compression_quality' : 'int'}),
+	'Video' : ('VideoCaptureSettings', {'use_compression' : 'bool', 'compression_quality' : 'float', 'video_codec' : 'str'}),
+}
+
+_SECTIONS = ('extends', 'protocol', 'protocol_settings') + tuple(SCHEMA)
+
+# Built-in profiles. "custom_passes_720p24" has the settings of sequencer_examples.render_sequence_to_movie().
+PROFILES = {
+	'custom_passes_720p24' : {
+		'settings' : {
+			'output_directory' : '../../../QAGame/Saved/VideoCaptures/',
+			'game_mode_override' : None,
+			'output_format' : '{world}',
+			'overwrite_existing' : True,
+			'use_relative_frame_numbers' : False,
+			'handle_frames' : 0,
+			'zero_pad_frame_numbers' : 4,
+			'frame_rate' : [24, 1],
+			'resolution' : [1280, 720],
+			'enable_texture_streaming' : False,
+			'cinematic_engine_scalability' : True,
+			'cinematic_mode' : True,
+			'allow_movement' : False,
+			'allow_turning' : False,
+			'show_player' : False,
+			'show_hud' : False,
+		},
+		'capture' : {
+			'use_separate_process' : False,
+			'close_editor_when_capture_starts' : False,
+			'additional_command_line_arguments' : '-NOSCREENMESSAGES',
+			'inherited_command_line_arguments' : '',
+			'use_custom_start_frame' : False,
+			'use_custom_end_frame' : False,
+			'custom_start_frame' : 0,
+			'custom_end_frame' : 0,
+			'warm_up_frame_count' : 0,
+			'delay_before_warm_up' : 0.0,
+			'delay_before_shot_warm_up' : 0.0,
+			'write_edit_decision_list' : True,
+		},
+		'protocol' : 'CustomRenderPasses',
+		'protocol_settings' : {
+			'include_render_passes' : ['BaseColor', 'SceneDepth', 'Roughness'],
+			'capture_frames_in_hdr' : False,
+			'hdr_compression_quality' : 1,
+			'capture_gamut' : 'HCGM_REC709',
+			'post_processing_material' : '',
+			'disable_screen_percentage' : True,
+		},
+		'burn_in' : {
+			'use_burn_in' : True,
+			'burn_in_class' : '/Engine/Sequencer/DefaultBurnIn.DefaultBurnIn_C',
+		},
+		'burn_in_settings' : {
+			'TopLeftText' : '{FocalLength}mm,{Aperture},{FocusDistance}',
+			'TopCenterText' : '{MasterName} - {Date} - {EngineVersion}',
+			'TopRightText' : '{TranslationX} {TranslationY} {TranslationZ}, {RotationX} {RotationY} {RotationZ}',
+			'BottomLeftText' : '{ShotName}',
+			'BottomCenterText' : '{hh}:{mm}:{ss}:{ff} ({MasterFrame})',
+			'BottomRightText' : '{ShotFrame}',
+			'Watermark' : '/Engine/EngineResources/AICON-Green',
+			'WatermarkTint' : [1.0, 0.5, 0.5, 0.5],
+		},
+	},
+	'png_1080p_preview' : {
+		'extends' : 'custom_passes_720p24',
+		'settings' : {
+			'resolution' : [1920, 1080],
+			'cinematic_engine_scalability' : False,
+		},
+		'capture' : {
+			'write_edit_decision_list' : False,
+		},
+		'protocol' : 'PNG',
+		'protocol_settings' : {
+			'compression_quality' : 100,
+		},
+		'burn_in' : {
+			'use_burn_in' : False,
+		},
+	},
+}
+
+# Compiled templates {profile key: CaptureTemplate}
+_template_cache = {}
+
+def _is_number_list(value, length, number_types):
+	return (isinstance(value, (list, tuple)) and len(value) == length
+		and all(isinstance(item, number_types) and not isinstance(item, bool) for item in value))
+
+'''
+	Summary:
+		Resolves "extends" and overrides into one profile dict. A section of a profile replaces the values of the same section of the
+		profile it extends one by one; "protocol" and "protocol_settings" are replaced as a whole when the protocol changes.
+	Params:
+		profile_name - Name in PROFILES (or in profiles).
+		overrides - Optional {section: {property: value}} applied last.
+		profiles - Profiles to resolve names in, PROFILES by default.
+	Returns:
+		The resolved profile, without "extends".
+'''
+def resolve_profile(profile_name, overrides = None, profiles = None):
+	profiles = PROFILES if profiles is None else profiles
+	chain = []
+	name = profile_name
+	while name is not None:
+		if not isinstance(name, _STRING_TYPES):
+			raise ValueError('Render profile {0!r} extends {1!r}, which is not a profile name'.format(chain[-1] if chain else None, name))
+		if name not in profiles:
+			raise KeyError('Unknown render profile {0!r}, expected one of {1}'.format(name, ', '.join(sorted(profiles))))
+		if name in chain:
+			raise ValueError('Render profile {0!r} extends itself'.format(name))
+		chain.append(name)
+		name = profiles[name].get('extends')
+
+	resolved = {}
+	for layer in [profiles[name] for name in reversed(chain)] + [overrides or {}]:
+		if 'protocol' in layer and layer['protocol'] != resolved.get('protocol'):
+			resolved.pop('protocol_settings', None)
+		for section, values in layer.items():
+			if section == 'extends':
+				continue
+			if isinstance(values, dict):
+				resolved.setdefault(section, {}).update(copy.deepcopy(values))
+			else:
+				resolved[section] = values
+	return resolved
+
+'''
+	Summary:
+		Checks a resolved profile against SCHEMA and PROTOCOL_SETTINGS.
+	Returns:
+		A list of error strings, empty when the profile is valid.
+'''
+def validate_profile(profile):
+	if not isinstance(profile, dict):
+		return ['profile must be a mapping, not {0!r}'.format(profile)]
+	errors = []
+	for section in profile:
+		if section not in _SECTIONS:
+			errors.append('unknown section {0!r}'.format(section))
+	protocol = profile.get('protocol')
+	if protocol is not None and not isinstance(protocol, _STRING_TYPES):
+		errors.append('protocol = {0!r} must be a string'.format(protocol))
+		protocol = None
+	elif protocol is not None and protocol not in PROTOCOL_SETTINGS:
+		errors.append('unknown protocol {0!r}, expected one of {1}'.format(protocol, ', '.join(sorted(PROTOCOL_SETTINGS))))
+	schemas = dict(SCHEMA)
+	if protocol in PROTOCOL_SETTINGS:
+		schemas['protocol_settings'] = PROTOCOL_SETTINGS[protocol][1]
+	elif profile.get('protocol') is None and 'protocol_settings' in profile:
+		errors.append('protocol_settings without a protocol')
+
+	for section, schema in schemas.items():
+		values = profile.get(section, {})
+		if not isinstance(values, dict):
+			errors.append('{0} must be a mapping'.format(section))
+			continue
+		for name, value in values.items():
+			kind = schema.get(name)
+			if kind is None:
+				errors.append('{0}.{1} is not a known property'.format(section, name))
+			elif not _KIND_CHECKS[kind](value):
+				errors.append('{0}.{1} = {2!r} is not a valid {3}'.format(section, name, value, kind))
+	settings = profile.get('settings', {})
+	if 'output_format' in settings and isinstance(settings['output_format'], _STRING_TYPES) and not settings['output_format']:
+		errors.append('settings.output_format is empty')
+	return errors
+
+'''
+	Summary:
+		Checks the shape of a {profile name: profile} mapping before its profiles are resolved: names are strings, profiles are
+		mappings and every "extends" names a profile of the mapping or of PROFILES.
+	Returns:
+		A list of error strings, empty when the profiles can be resolved.
+'''
+def check_profiles(profiles):
+	if not isinstance(profiles, dict):
+		return ['the file must be a mapping of profile names to profiles, not {0!r}'.format(type(profiles).__name__)]
+	errors = []
+	for name, profile in profiles.items():
+		if not isinstance(name, _STRING_TYPES):
+			errors.append('profile name {0!r} must be a string'.format(name))
+		elif not isinstance(profile, dict):
+			errors.append('{0}: profile must be a mapping, not {1!r}'.format(name, profile))
+		elif 'extends' in profile:
+			extends = profile['extends']
+			if not isinstance(extends, _STRING_TYPES):
+				errors.append('{0}: extends = {1!r} must be a profile name'.format(name, extends))
+			elif extends not in profiles and extends not in PROFILES:
+				errors.append('{0}: extends unknown profile {1!r}'.format(name, extends))
+	return errors
+
+'''
+	Summary:
+		Loads profiles from a JSON file, or a YAML file (.yaml/.yml, needs PyYAML), validates them and adds them to PROFILES.
+		The file is a mapping {profile name: profile}.
+	Returns:
+		The names of the loaded profiles.
+'''
+def load_profiles(path):
+	with open(path, 'r') as f:
+		if path.lower().endswith(('.yaml', '.yml')):
+			try:
+				import yaml
+			except ImportError:
+				raise ImportError('Reading {0} needs PyYAML; install it into the editor\'s Python or use a .json file'.format(path))
+			profiles = yaml.safe_load(f)
+		else:
+			profiles = json.load(f)
+
+	errors = check_profiles(profiles)
+	if not errors:
+		merged = dict(PROFILES)
+		merged.update(profiles)
+		for name in sorted(profiles):
+			try:
+				profile = resolve_profile(name, profiles = merged)
+			except ValueError as e:
+				errors.append('{0}: {1}'.format(name, e))
+				continue
+			errors.extend('{0}: {1}'.format(name, error) for error in validate_profile(profile))
+	if errors:
+		raise ValueError('Invalid render profiles in {0}:\n\t{1}'.format(path, '\n\t'.join(errors)))
+	PROFILES.update(profiles)
+	clear_cache()
+	return sorted(profiles)
+
+'''
+	Summary:
+		Key of a resolved profile: the same settings give the same key, whatever profile names they came from.
+'''
+def profile_key(profile):
+	return hashlib.sha1(json.dumps(profile, sort_keys = True).encode('utf-8')).hexdigest()
+
+def _convert(kind, value):
+	import unreal
+	if kind == 'frame_rate':
+		return unreal.FrameRate(value[0], value[1])
+	if kind == 'frame_number':
+		return unreal.FrameNumber(value)
+	if kind == 'resolution':
+		resolution = unreal.CaptureResolution()
+		resolution.res_x = value[0]
+		resolution.res_y = value[1]
+		return resolution
+	if kind == 'color':
+		return unreal.LinearColor(*value)
+	if kind == 'directory':
+		return unreal.DirectoryPath(value)
+	if kind == 'soft_object':
+		# Soft Object Paths use an empty string for None
+		return unreal.SoftObjectPath(value or '')
+	if kind == 'soft_class':
+		return unreal.SoftClassPath(value or '')
+	if kind == 'class':
+		return unreal.load_class(None, value) if value else None
+	if kind == 'asset':
+		return unreal.load_asset(value) if value else None
+	if kind == 'HDRCaptureGamut':
+		return getattr(unreal.HDRCaptureGamut, value)
+	if kind == 'float':
+		return float(value)
+	return value
+
+def _converted(values, schema):
+	return [(name, _convert(schema[name], value)) for name, value in sorted(values.items())]
+
+'''
+	Summary:
+		A compiled profile. The values are converted once; the settings struct, capture type, protocol settings and burn-in options are
+		built once and shared by every capture stamped from the template (render_movie() only reads them, so don't modify them).
+	Params:
+		name - Profile name, for messages.
+		profile - The resolved, valid profile.
+'''
+class CaptureTemplate(object):
+	def __init__(self, name, profile):
+		import unreal
+		self.name = name
+		self.profile = profile
+		self.key = profile_key(profile)
+
+		self.settings = unreal.MovieSceneCaptureSettings()
+		for property_name, value in _converted(profile.get('settings', {}), SCHEMA['settings']):
+			self.settings.set_editor_property(property_name, value)
+		self.capture_values = _converted(profile.get('capture', {}), SCHEMA['capture'])
+
+		self.capture_type = None
+		self.protocol_settings = None
+		protocol = profile.get('protocol')
+		if protocol is not None:
+			self.capture_type = unreal.CaptureProtocolID()
+			self.capture_type.identifier = protocol
+			if protocol not in PROTOCOL_SETTINGS:
+				raise ValueError('Render profile {0!r} has unknown protocol {1!r}, expected one of {2}'.format(name, protocol,
+					', '.join(sorted(PROTOCOL_SETTINGS))))
+			settings_class, schema = PROTOCOL_SETTINGS[protocol]
+			self.protocol_settings = getattr(unreal, settings_class)()
+			values = dict(profile.get('protocol_settings', {}))
+			render_passes = values.pop('include_render_passes', None)
+			for property_name, value in _converted(values, schema):
+				self.protocol_settings.set_editor_property(property_name, value)
+			if render_passes is not None:
+				for render_pass in render_passes:
+					self.protocol_settings.include_render_passes.value.append(render_pass)
+
+		self.burn_in_options = None
+		if 'burn_in' in profile:
+			self.burn_in_options = unreal.LevelSequenceBurnInOptions()
+			burn_in = profile['burn_in']
+			self.burn_in_options.use_burn_in = burn_in.get('use_burn_in', False)
+			if burn_in.get('burn_in_class'):
+				self.burn_in_options.set_burn_in(_convert('soft_class', burn_in['burn_in_class']))
+			if self.burn_in_options.use_burn_in:
+				# Blueprint properties can only be set with set_editor_property() and their names as in the Blueprint
+				for property_name, value in _converted(profile.get('burn_in_settings', {}), SCHEMA['burn_in_settings']):
+					self.burn_in_options.settings.set_editor_property(property_name, value)
+
+	'''
+		Summary:
+			Creates a capture for one shot from the template.
+		Params:
+			sequencer_asset_path - The LevelSequence (or shot) to render.
+			start_frame, end_frame - Optional custom frame range (display rate frames).
+			output_directory - Optional output folder replacing the profile's.
+			output_format - Optional file name format replacing the profile's.
+		Returns:
+			A new unreal.AutomatedLevelSequenceCapture.
+	'''
+	def stamp(self, sequencer_asset_path, start_frame = None, end_frame = None, output_directory = None, output_format = None):
+		import unreal
+		capture_settings = unreal.AutomatedLevelSequenceCapture()
+		capture_settings.settings = self.settings
+		for property_name, value in self.capture_values:
+			capture_settings.set_editor_property(property_name, value)
+		if self.capture_type is not None:
+			capture_settings.capture_type = self.capture_type
+			capture_settings.protocol_settings = self.protocol_settings
+		if self.burn_in_options is not None:
+			capture_settings.burn_in_options = self.burn_in_options
+
+		capture_settings.level_sequence_asset = unreal.SoftObjectPath(sequencer_asset_path)
+		if start_frame is not None:
+			capture_settings.use_custom_start_frame = True
+			capture_settings.custom_start_frame = unreal.FrameNumber(start_frame)
+		if end_frame is not None:
+			capture_settings.use_custom_end_frame = True
+			capture_settings.custom_end_frame = unreal.FrameNumber(end_frame)
+		if output_directory is not None:
+			capture_settings.settings.output_directory = unreal.DirectoryPath(output_directory)
+		if output_format is not None:
+			capture_settings.settings.output_format = output_format
+		return capture_settings
+
+	def __repr__(self):
+		return '<CaptureTemplate {0} {1}>'.format(self.name, self.key[:12])
+
+'''
+	Summary:
+		Returns the compiled template of a profile. Profiles are validated and compiled once per key; later calls with the same
+		settings return the same template.
+	Params:
+		profile_name - Name in PROFILES.
+		overrides - Optional {section: {property: value}}.
+	Returns:
+		A CaptureTemplate.
+'''
+def get_capture_template(profile_name, overrides = None):
+	profile = resolve_profile(profile_name, overrides)
+	key = profile_key(profile)
+	template = _template_cache.get(key)
+	if template is None:
+		errors = validate_profile(profile)
+		if errors:
+			raise ValueError('Invalid render profile {0!r}:\n\t{1}'.format(profile_name, '\n\t'.join(errors)))
+		template = CaptureTemplate(profile_name, profile)
+		_template_cache[key] = template
+	return template
+
+'''
+	Summary:
+		Stamps one capture per shot from a profile.
+		Open the Python interactive console and use:
+			import sequencer_render_profiles
+			captures = sequencer_render_profiles.stamp_shots('png_1080p_preview', [("/Game/Shots/Shot010", 0, 96), ("/Game/Shots/Shot020", None, None)])
+	Params:
+		profile_name - Name in PROFILES.
+		shots - (sequencer_asset_path, start_frame, end_frame) tuples; None frames render the sequence's own range.
+		overrides - Optional {section: {property: value}}.
+		output_directory - Optional output folder for every shot.
+	Returns:
+		A list of unreal.AutomatedLevelSequenceCapture.
+'''
+def stamp_shots(profile_name, shots, overrides = None, output_directory = None):
+	template = get_capture_template(profile_name, overrides)
+	return [template.stamp(sequencer_asset_path, start_frame, end_frame, output_directory) for sequencer_asset_path, start_frame, end_frame in shots]
+
+'''
+	Summary:
+		Renders a sequence with a profile.
+		Open the Python interactive console and use:
+			import sequencer_render_profiles
+			sequencer_render_profiles.render_sequence_with_profile("/Game/TestSequence", 'custom_passes_720p24')
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		profile_name - Name in PROFILES.
+		start_frame, end_frame, output_directory - See CaptureTemplate.stamp().
+		overrides - Optional {section: {property: value}}.
+		on_finished_callback - Optional unreal.OnRenderMovieStopped.
+'''
+def render_sequence_with_profile(sequencer_asset_path, profile_name, start_frame = None, end_frame = None, output_directory = None, overrides = None,
+		on_finished_callback = None):
+	import unreal
+	capture_settings = get_capture_template(profile_name, overrides).stamp(sequencer_asset_path, start_frame, end_frame, output_directory)
+	if on_finished_callback is None:
+		unreal.SequencerTools.render_movie(capture_settings)
+	else:
+		unreal.SequencerTools.render_movie(capture_settings, on_finished_callback)
+	return capture_settings
+
+# Clears the compiled templates (after changing PROFILES or the assets they load)
+def clear_cache():
+	_template_cache.clear()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Persistent render job queue.
+# unreal.SequencerTools.render_movie() is fire-and-forget: if the editor goes down during a long render nothing records what was
+# finished. Here every render (a whole sequence or one sequencer_render_shards shard) is a row of a SQLite journal that moves
+# through queued -> running -> done, or failed once it is out of attempts. A failed attempt is retried after an exponential
+# backoff and resumes after the last fully written frame found in the job's folder. The runner keeps a fixed number of worker
+# slots; whenever a slot is free it takes the next runnable job from the shared queue, so no slot idles while work is left.
+# Several runners (editor sessions or command line processes) can share one journal: jobs are claimed atomically and a job whose
+# runner stopped sending heartbeats is queued again.
+# This module does not import unreal unless queue_sequence() has to read settings from the editor. After a crash, resume with:
+#	python sequencer_render_queue.py E:/Renders/render_queue.db 4
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sequencer_render_shards
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_SLOTS = sequencer_render_shards.DEFAULT_MAX_WORKERS
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_SECONDS = 30.0
+MAX_BACKOFF_SECONDS = 600.0
+
+# Settings of a job that are passed to sequencer_render_shards.capture_command()
+_CAPTURE_SETTINGS = ('editor_command', 'project_path', 'map_path', 'frame_rate', 'resolution', 'capture_type', 'warm_up_frames',
+	'output_format', 'extra_arguments')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+	id INTEGER PRIMARY KEY AUTOINCREMENT,
+	sequence TEXT NOT NULL,
+	output_directory TEXT NOT NULL,
+	directory TEXT,
+	start_frame INTEGER NOT NULL,
+	end_frame INTEGER NOT NULL,
+	render_start INTEGER NOT NULL,
+	render_end INTEGER NOT NULL,
+	settings TEXT NOT NULL,
+	state TEXT NOT NULL,
+	attempts INTEGER NOT NULL DEFAULT 0,
+	max_attempts INTEGER NOT NULL,
+	next_attempt REAL NOT NULL DEFAULT 0,
+	resume_frame INTEGER,
+	runner TEXT,
+	slot INTEGER,
+	heartbeat REAL,
+	created REAL NOT NULL,
+	finished REAL,
+	seconds REAL NOT NULL DEFAULT 0,
+	returncode INTEGER,
+	error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state, next_attempt);
+'''
+
+'''
+	Summary:
+		First frame of [start, end) that has to be rendered again, from the frame files already in a folder: the end of the
+		shortest complete run of frames from start over all render passes, minus one because the last file may have been cut off.
+'''
+def resume_frame(directory, start, end):
+	streams = sequencer_render_shards.scan_frames(directory)
+	if not streams:
+		return start
+	resume = end
+	for frames in streams.values():
+		frame = start
+		while frame < end and frame in frames:
+			frame = frame + 1
+		resume = min(resume, frame)
+	return resume if resume in (start, end) else resume - 1
+
+'''
+	Summary:
+		SQLite journal of render jobs and the runner that executes them.
+	Params:
+		db_path - SQLite database file, created if missing.
+'''
+class RenderQueue(object):
+	def __init__(self, db_path):
+		directory = os.path.dirname(db_path)
+		if directory and not os.path.isdir(directory):
+			os.makedirs(directory)
+		self.db_path = db_path
+		self.connection = sqlite3.connect(db_path, timeout = 30)
+		self.connection.row_factory = sqlite3.Row
+		self.connection.executescript(_SCHEMA)
+		self.connection.commit()
+
+	def close(self):
+		self.connection.close()
+
+	'''
+		Summary:
+			Queues the render of [start_frame, end_frame), rendering [render_start, render_end) (the range with its handle frames).
+		Params:
+			settings - Dict with the capture settings (see _CAPTURE_SETTINGS and sequencer_render_shards.capture_command()) and an
+				optional "timeout" in seconds.
+			max_attempts - Attempts before the job is marked failed.
+		Returns:
+			The job id.
+	'''
+	def add_job(self, sequencer_asset_path, output_directory, start_frame, end_frame, settings, render_start = None, render_end = None,
+			max_attempts = DEFAULT_MAX_ATTEMPTS):
+		cursor = self.connection.execute(
+			'INSERT INTO jobs (sequence, output_directory, start_frame, end_frame, render_start, render_end, settings, state, max_attempts, created) '
+			'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+			(sequencer_asset_path, output_directory, start_frame, end_frame,
+				start_frame if render_start is None else render_start, end_frame if render_end is None else render_end,
+				json.dumps(settings, sort_keys = True), QUEUED, max_attempts, time.time()))
+		job_id = cursor.lastrowid
+		directory = os.path.join(output_directory, sequencer_render_shards.SHARD_DIRECTORY, 'job_{0}'.format(job_id))
+		self.connection.execute('UPDATE jobs SET directory = ? WHERE id = ?', (directory, job_id))
+		self.connection.commit()
+		return job_id
+
+	'''
+		Summary:
+			Queues a frame range as shards (see sequencer_render_shards.plan_shards()), one job per shard.
+		Returns:
+			The job ids.
+	'''
+	def add_sharded(self, sequencer_asset_path, output_directory, start_frame, end_frame, settings, num_shards = DEFAULT_SLOTS,
+			handle_frames = 0, max_attempts = DEFAULT_MAX_ATTEMPTS):
+		shards = sequencer_render_shards.plan_shards(start_frame, end_frame, num_shards, handle_frames = handle_frames)
+		return [self.add_job(sequencer_asset_path, output_directory, shard.start, shard.end, settings, shard.render_start, shard.render_end,
+			max_attempts) for shard in shards]
+
+	def job(self, job_id):
+		return self.connection.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+
+	def jobs(self, state = None):
+		if state is None:
+			return self.connection.execute('SELECT * FROM jobs ORDER BY id').fetchall()
+		return self.connection.execute('SELECT * FROM jobs WHERE state = ? ORDER BY id', (state,)).fetchall()
+
+	# Returns {state : count}
+	def counts(self):
+		return dict((row[0], row[1]) for row in self.connection.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state'))
+
+	'''
+		Summary:
+			Puts failed jobs (or the given ones) back in the queue with a fresh set of attempts.
+	'''
+	def retry_failed(self, job_ids = None):
+		rows = self.jobs(FAILED) if job_ids is None else [self.job(job_id) for job_id in job_ids]
+		for row in rows:
+			self.connection.execute('UPDATE jobs SET state = ?, attempts = 0, next_attempt = 0, error = NULL WHERE id = ?', (QUEUED, row['id']))
+		self.connection.commit()
+		return len(rows)
+
+	'''
+		Summary:
+			Queues running jobs whose runner has not sent a heartbeat for stale_seconds (its editor or process is gone). The frames
+			they wrote are kept; the next attempt resumes after them.
+	'''
+	def requeue_stale(self, stale_seconds = 60.0):
+		cursor = self.connection.execute('UPDATE jobs SET state = ?, runner = NULL, slot = NULL WHERE state = ? AND heartbeat < ?',
+			(QUEUED, RUNNING, time.time() - stale_seconds))
+		self.connection.commit()
+		return cursor.rowcount
+
+	def _claim(self, runner, slot):
+		now = time.time()
+		candidates = self.connection.execute('SELECT id FROM jobs WHERE state = ? AND next_attempt <= ? ORDER BY next_attempt, id',
+			(QUEUED, now)).fetchall()
+		for candidate in candidates:
+			# The state condition makes the claim atomic between runners sharing the journal
+			cursor = self.connection.execute('UPDATE jobs SET state = ?, runner = ?, slot = ?, heartbeat = ? WHERE id = ? AND state = ?',
+				(RUNNING, runner, slot, now, candidate['id'], QUEUED))
+			self.connection.commit()
+			if cursor.rowcount == 1:
+				return self.job(candidate['id'])
+		return None
+
+	def _start(self, job):
+		settings = json.loads(job['settings'])
+		resume = resume_frame(job['directory'], job['start_frame'], job['end_frame'])
+		self.connection.execute('UPDATE jobs SET resume_frame = ? WHERE id = ?', (resume, job['id']))
+		self.connection.commit()
+		if resume >= job['end_frame']:
+			# Every frame was written before the previous attempt ended
+			return None
+		handle_frames = job['start_frame'] - job['render_start']
+		shard = sequencer_render_shards.Shard(job['id'], resume, job['end_frame'],
+			job['render_start'] if resume == job['start_frame'] else max(job['render_start'], resume - handle_frames), job['render_end'])
+		shard.directory = job['directory']
+		if not os.path.isdir(shard.directory):
+			os.makedirs(shard.directory)
+		capture = dict((name, settings[name]) for name in _CAPTURE_SETTINGS if name in settings)
+		command = sequencer_render_shards.capture_command(sequencer_asset_path = job['sequence'], shard = shard, output_directory = shard.directory, **capture)
+		log_file = open(os.path.join(shard.directory, 'capture.log'), 'a')
+		return subprocess.Popen(command, stdout = log_file, stderr = subprocess.STDOUT), log_file
+
+	'''
+		Summary:
+			Records the end of an attempt. A job whose frames are all present is collected into its output folder and marked done;
+			otherwise it is queued again after the backoff, or marked failed when it is out of attempts.
+	'''
+	def _finish(self, job, returncode, seconds, backoff_seconds):
+		error = None
+		if returncode != 0:
+			error = 'exit code {0}'.format(returncode)
+		else:
+			shard = sequencer_render_shards.Shard(job['id'], job['start_frame'], job['end_frame'], job['render_start'], job['render_end'])
+			shard.directory = job['directory']
+			missing = sequencer_render_shards.verify_frames(job['directory'], job['start_frame'], job['end_frame'])
+			if missing.ok:
+				report = sequencer_render_shards.collect_frames([shard], job['output_directory'], job['start_frame'], job['end_frame'])
+				if report.ok:
+					shutil.rmtree(job['directory'], ignore_errors = True)
+					try:
+						os.rmdir(os.path.dirname(job['directory']))
+					except OSError:
+						pass	# Other jobs of the output folder are not done yet
+					self.connection.execute('UPDATE jobs SET state = ?, finished = ?, seconds = seconds + ?, returncode = ?, error = NULL, runner = NULL, slot = NULL WHERE id = ?',
+						(DONE, time.time(), seconds, returncode, job['id']))
+					self.connection.commit()
+					return DONE
+				missing = report
+			error = 'missing {0} frames'.format(sum(len(frames) for frames in missing.missing.values()))
+
+		attempts = job['attempts'] + 1
+		state = QUEUED if attempts < job['max_attempts'] else FAILED
+		delay = min(MAX_BACKOFF_SECONDS, backoff_seconds * (2 ** (attempts - 1)))
+		self.connection.execute('UPDATE jobs SET state = ?, attempts = ?, next_attempt = ?, seconds = seconds + ?, returncode = ?, error = ?, runner = NULL, slot = NULL WHERE id = ?',
+			(state, attempts, time.time() + delay, seconds, returncode, error, job['id']))
+		self.connection.commit()
+		return state
+
+	'''
+		Summary:
+			Runs queued jobs in a fixed number of worker slots until the queue is empty (jobs waiting for their backoff are waited for).
+			Open the Python interactive console and use:
+				import sequencer_render_queue
+				queue = sequencer_render_queue.RenderQueue("E:/Renders/render_queue.db")
+				sequencer_render_queue.queue_sequence(queue, "/Game/TestSequence", "E:/Renders/TestSequence", num_shards = 8)
+				queue.run(slots = 4)
+		Params:
+			slots - Number of capture processes run at the same time.
+			backoff_seconds - Delay before the first retry of a job; doubled for every further attempt.
+			poll_interval - Seconds between checks of the running processes.
+			stale_seconds - Running jobs of other runners without a heartbeat for this long are queued again.
+		Returns:
+			The job counts per state.
+	'''
+	def run(self, slots = DEFAULT_SLOTS, backoff_seconds = DEFAULT_BACKOFF_SECONDS, poll_interval = 0.5, stale_seconds = 60.0):
+		runner = '{0}:{1}:{2}'.format(socket.gethostname(), os.getpid(), int(time.time()))
+		running = {}
+		self.requeue_stale(stale_seconds)
+		while True:
+			for slot in range(slots):
+				while slot not in running:
+					job = self._claim(runner, slot)
+					if job is None:
+						break
+					started = self._start(job)
+					if started is None:
+						self._finish(job, 0, 0.0, backoff_seconds)
+						continue
+					process, log_file = started
+					running[slot] = (job, process, log_file, time.time())
+
+			if not running:
+				waiting = self.connection.execute('SELECT MIN(next_attempt) FROM jobs WHERE state = ?', (QUEUED,)).fetchone()[0]
+				if waiting is None:
+					break
+				time.sleep(max(poll_interval, min(waiting - time.time(), stale_seconds)))
+				self.requeue_stale(stale_seconds)
+				continue
+
+			time.sleep(poll_interval)
+			now = time.time()
+			for slot, (job, process, log_file, start_time) in list(running.items()):
+				returncode = process.poll()
+				timeout = json.loads(job['settings']).get('timeout')
+				if returncode is None and timeout and now - start_time > timeout:
+					process.kill()
+					process.wait()
+					returncode = -1
+				if returncode is None:
+					continue
+				log_file.close()
+				del running[slot]
+				state = self._finish(job, returncode, now - start_time, backoff_seconds)
+				print('Job {0} [{1}, {2}) of {3}: {4}'.format(job['id'], job['start_frame'], job['end_frame'], job['sequence'], state))
+			if running:
+				self.connection.execute('UPDATE jobs SET heartbeat = ? WHERE id IN ({0})'.format(','.join('?' * len(running))),
+					[now] + [job['id'] for job, process, log_file, start_time in running.values()])
+				self.connection.commit()
+
+		counts = self.counts()
+		print('Render queue {0}: {1}'.format(self.db_path, ', '.join('{0} {1}'.format(count, state) for state, count in sorted(counts.items()))))
+		return counts
+
+'''
+	Summary:
+		Queues a sequence as shards, reading the capture settings that are not given from the editor.
+	Params:
+		queue - The RenderQueue.
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		output_directory - Folder the frames end up in.
+		num_shards - Number of jobs the range is split into.
+		handle_frames - Frames rendered on both sides of each shard and discarded.
+		max_attempts - Attempts per job.
+		settings - Capture settings (see _CAPTURE_SETTINGS), "timeout", and optionally "start_frame"/"end_frame".
+	Returns:
+		The job ids.
+'''
+def queue_sequence(queue, sequencer_asset_path, output_directory, num_shards = DEFAULT_SLOTS, handle_frames = 2, max_attempts = DEFAULT_MAX_ATTEMPTS, **settings):
+	settings.setdefault('warm_up_frames', 10)
+	needed = ('start_frame', 'end_frame', 'frame_rate', 'editor_command', 'project_path', 'map_path')
+	if any(settings.get(name) is None for name in needed):
+		for name, value in sequencer_render_shards.sequence_capture_settings(sequencer_asset_path).items():
+			if settings.get(name) is None:
+				settings[name] = value
+	start_frame = settings.pop('start_frame')
+	end_frame = settings.pop('end_frame')
+	return queue.add_sharded(sequencer_asset_path, output_directory, start_frame, end_frame, settings, num_shards, handle_frames, max_attempts)
+
+if __name__ == '__main__' and len(sys.argv) > 1:
+	render_queue = RenderQueue(sys.argv[1])
+	render_queue.run(int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SLOTS)
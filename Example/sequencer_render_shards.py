@@ -0,0 +1,436 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Sharded rendering of a LevelSequence in separate capture processes.
+# sequencer_examples.render_sequence_to_movie() captures the whole sequence in the editor process. Here the playback range is
+# split into consecutive shards and every shard is captured by its own editor process (-game, AutomatedLevelSequenceCapture)
+# with its own -MovieStartFrame/-MovieEndFrame, so a many-core machine renders several shards at once. Each shard renders
+# handle frames on both sides of its range (and warms up before its first frame) so motion blur and temporal effects have
+# history at the shard boundaries; the handle frames are discarded when the shard outputs are collected. Collection then checks
+# that every frame of the range exists exactly once.
+# The process runner does not need the editor: pass editor_command (any executable, e.g. the stub capture at the end of this
+# module) together with the project, map, frame range and frame rate.
+#	import sequencer_render_shards
+#	sequencer_render_shards.render_sequence_sharded("/Game/TestSequence", "E:/Renders/TestSequence", max_workers = 4)
+import os
+import re
+import sys
+import time
+import shutil
+import subprocess
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_OUTPUT_FORMAT = '{sequence}.{frame}'
+CAPTURE_TYPE_CLASS = '/Script/MovieSceneCapture.AutomatedLevelSequenceCapture'
+SHARD_DIRECTORY = '_shards'
+
+# Frame files: anything ending in a frame number before the extension, e.g. "TestSequence.0012.png" or "Shot.BaseColor.12.exr"
+_FRAME_FILE = re.compile(r'^(.*?)(\d+)(\.[A-Za-z0-9]+)$')
+
+'''
+	Summary:
+		One shard of a frame range. Frames are display rate frame numbers; all ranges are half-open.
+	Params:
+		index - Position of the shard in the plan.
+		start, end - Frames this shard contributes to the output.
+		render_start, render_end - Frames this shard renders: start/end widened by the handle frames, clamped to the sequence range.
+'''
+class Shard(object):
+	__slots__ = ('index', 'start', 'end', 'render_start', 'render_end', 'returncode', 'seconds', 'log_path', 'directory')
+
+	def __init__(self, index, start, end, render_start, render_end):
+		self.index = index
+		self.start = start
+		self.end = end
+		self.render_start = render_start
+		self.render_end = render_end
+		self.returncode = None
+		self.seconds = 0.0
+		self.log_path = None
+		self.directory = None
+
+	def __repr__(self):
+		return '<Shard {0} [{1}, {2}) render [{3}, {4})>'.format(self.index, self.start, self.end, self.render_start, self.render_end)
+
+'''
+	Summary:
+		Splits [start_frame, end_frame) into consecutive shards of near equal length.
+	Params:
+		start_frame, end_frame - Frame range to render (display rate, end exclusive).
+		num_shards - Number of shards. Ignored when shard_frames is given.
+		shard_frames - Length of each shard (the last one may be shorter).
+		handle_frames - Extra frames rendered on both sides of each shard and discarded afterwards.
+	Returns:
+		A list of Shard.
+'''
+def plan_shards(start_frame, end_frame, num_shards = DEFAULT_MAX_WORKERS, shard_frames = None, handle_frames = 0):
+	num_frames = end_frame - start_frame
+	if num_frames <= 0:
+		return []
+	if shard_frames:
+		bounds = list(range(start_frame, end_frame, shard_frames)) + [end_frame]
+	else:
+		num_shards = max(1, min(num_shards, num_frames))
+		size, remainder = divmod(num_frames, num_shards)
+		bounds = [start_frame]
+		for index in range(num_shards):
+			bounds.append(bounds[-1] + size + (1 if index < remainder else 0))
+	shards = []
+	for index, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+		shards.append(Shard(index, start, end, max(start_frame, start - handle_frames), min(end_frame, end + handle_frames)))
+	return shards
+
+'''
+	Summary:
+		Checks that the kept ranges of a plan cover [start_frame, end_frame) without gaps or overlaps.
+	Returns:
+		A list of error strings, empty when the plan is valid.
+'''
+def check_plan(shards, start_frame, end_frame):
+	errors = []
+	expected = start_frame
+	for shard in sorted(shards, key = lambda shard: shard.start):
+		if shard.start > expected:
+			errors.append('gap [{0}, {1})'.format(expected, shard.start))
+		elif shard.start < expected:
+			errors.append('overlap [{0}, {1})'.format(shard.start, min(expected, shard.end)))
+		if not (shard.render_start <= shard.start and shard.end <= shard.render_end):
+			errors.append('{0} does not render its own range'.format(shard))
+		expected = max(expected, shard.end)
+	if expected != end_frame:
+		errors.append('plan ends at {0} instead of {1}'.format(expected, end_frame))
+	return errors
+
+def _format_rate(frame_rate):
+	numerator, denominator = frame_rate
+	return str(numerator) if denominator == 1 else '{0}/{1}'.format(numerator, denominator)
+
+'''
+	Summary:
+		Builds the command line that captures one shard in a separate game process.
+		-MovieEndFrame is passed as the exclusive end; if an engine build treats it as inclusive the extra frame lies outside the
+		shard's range and is discarded like a handle frame.
+	Params:
+		editor_command - Editor executable, or a list (executable and leading arguments, e.g. [sys.executable, "stub.py"]).
+		project_path, map_path - The .uproject file and the map package to load ("/Game/Maps/Main").
+		sequencer_asset_path - The LevelSequence to capture.
+		shard - The Shard to capture.
+		output_directory - Folder the frames are written to.
+		frame_rate - (numerator, denominator) of the capture.
+		resolution - (width, height).
+		capture_type - Capture protocol identifier ("PNG", "JPG", "BMP", "EXR", "Video", "CustomRenderPasses").
+		warm_up_frames - Frames run before the first captured frame.
+		output_format - File name format, must contain {frame}.
+		extra_arguments - More command line arguments.
+	Returns:
+		The argument list for subprocess.
+'''
+def capture_command(editor_command, project_path, map_path, sequencer_asset_path, shard, output_directory, frame_rate,
+		resolution = (1280, 720), capture_type = 'PNG', warm_up_frames = 0, output_format = DEFAULT_OUTPUT_FORMAT, extra_arguments = ()):
+	command = list(editor_command) if isinstance(editor_command, (list, tuple)) else [editor_command]
+	command.extend([
+		project_path,
+		map_path,
+		'-game',
+		'-MovieSceneCaptureType={0}'.format(CAPTURE_TYPE_CLASS),
+		'-LevelSequence={0}'.format(sequencer_asset_path),
+		'-MovieFolder={0}'.format(output_directory),
+		'-MovieName={0}'.format(output_format),
+		'-MovieFormat={0}'.format(capture_type),
+		'-MovieFrameRate={0}'.format(_format_rate(frame_rate)),
+		'-MovieStartFrame={0}'.format(shard.render_start),
+		'-MovieEndFrame={0}'.format(shard.render_end),
+		'-MovieWarmUpFrames={0}'.format(warm_up_frames),
+		'-MovieCinematicMode=Yes',
+		'-ResX={0}'.format(resolution[0]),
+		'-ResY={0}'.format(resolution[1]),
+		'-ForceRes',
+		'-Windowed',
+		'-NoLoadingScreen',
+		'-NoTextureStreaming',
+		'-NOSCREENMESSAGES',
+		'-Unattended',
+	])
+	command.extend(extra_arguments)
+	return command
+
+'''
+	Summary:
+		Runs one command per shard, at most max_workers at a time. Each process writes its output to a log file next to its frames.
+	Params:
+		shards - The shards to run. Each needs its directory set.
+		make_command - Callable shard -> argument list.
+		max_workers - Number of processes run at the same time.
+		timeout - Seconds after which a shard's process is killed (None for no limit).
+		poll_interval - Seconds between checks of the running processes.
+	Returns:
+		The shards, with returncode (-1 for killed processes), seconds and log_path set.
+'''
+def run_shards(shards, make_command, max_workers = DEFAULT_MAX_WORKERS, timeout = None, poll_interval = 0.1):
+	pending = list(shards)
+	running = []
+	while pending or running:
+		while pending and len(running) < max(1, max_workers):
+			shard = pending.pop(0)
+			if not os.path.isdir(shard.directory):
+				os.makedirs(shard.directory)
+			shard.log_path = os.path.join(shard.directory, 'capture.log')
+			log_file = open(shard.log_path, 'w')
+			process = subprocess.Popen(make_command(shard), stdout = log_file, stderr = subprocess.STDOUT)
+			running.append((shard, process, log_file, time.time()))
+
+		time.sleep(poll_interval)
+		still_running = []
+		for shard, process, log_file, start_time in running:
+			returncode = process.poll()
+			if returncode is None and timeout is not None and time.time() - start_time > timeout:
+				process.kill()
+				process.wait()
+				returncode = -1
+			if returncode is None:
+				still_running.append((shard, process, log_file, start_time))
+				continue
+			log_file.close()
+			shard.returncode = returncode
+			shard.seconds = time.time() - start_time
+		running = still_running
+	return shards
+
+'''
+	Summary:
+		Lists the frame files of a directory.
+	Returns:
+		A dict stream -> {frame number : file name}, where stream is the file name with the frame number removed
+		(one stream per render pass).
+'''
+def scan_frames(directory):
+	streams = {}
+	if not os.path.isdir(directory):
+		return streams
+	for file_name in os.listdir(directory):
+		match = _FRAME_FILE.match(file_name)
+		if match is None or not os.path.isfile(os.path.join(directory, file_name)):
+			continue
+		stream = match.group(1) + '#' + match.group(3)
+		streams.setdefault(stream, {})[int(match.group(2))] = file_name
+	return streams
+
+'''
+	Summary:
+		Result of collect_frames() and verify_frames().
+	Params:
+		missing - Dict stream -> frame numbers of [start, end) without a file.
+		overlaps - Dict stream -> frame numbers written by more than one shard.
+		collected - Number of frame files in the output directory.
+		discarded - Number of handle frame files removed.
+'''
+class FrameReport(object):
+	def __init__(self):
+		self.missing = {}
+		self.overlaps = {}
+		self.collected = 0
+		self.discarded = 0
+
+	@property
+	def ok(self):
+		return not any(self.missing.values()) and not any(self.overlaps.values())
+
+	def as_dict(self):
+		return {'ok' : self.ok, 'missing' : self.missing, 'overlaps' : self.overlaps, 'collected' : self.collected, 'discarded' : self.discarded}
+
+	def __repr__(self):
+		return '<FrameReport ok {0} collected {1} discarded {2} missing {3} overlaps {4}>'.format(self.ok, self.collected, self.discarded,
+			sum(len(frames) for frames in self.missing.values()), sum(len(frames) for frames in self.overlaps.values()))
+
+'''
+	Summary:
+		Checks that every stream of a directory has exactly the frames [start_frame, end_frame).
+	Params:
+		streams - Optional result of scan_frames(directory), to avoid listing the directory again.
+'''
+def verify_frames(directory, start_frame, end_frame, streams = None, report = None):
+	report = report or FrameReport()
+	streams = scan_frames(directory) if streams is None else streams
+	if not streams:
+		report.missing['*'] = list(range(start_frame, end_frame))
+	for stream, frames in streams.items():
+		report.missing[stream] = [frame for frame in range(start_frame, end_frame) if frame not in frames]
+		report.collected = report.collected + sum(1 for frame in frames if start_frame <= frame < end_frame)
+	return report
+
+'''
+	Summary:
+		Moves the frames each shard owns from its directory into the output directory, removes the handle frames and verifies the
+		result. A frame written by two shards is reported as an overlap and the first shard's file is kept.
+	Params:
+		shards - The shards, with their directories.
+		output_directory - Destination of the frames.
+		start_frame, end_frame - The whole rendered range.
+		splice - The shards only replace part of the range; the other frames are expected in output_directory already, so the
+			whole folder is verified instead of the collected frames.
+	Returns:
+		A FrameReport.
+'''
+def collect_frames(shards, output_directory, start_frame, end_frame, splice = False):
+	report = FrameReport()
+	owners = {}
+	collected = {}
+	for shard in shards:
+		for stream, frames in scan_frames(shard.directory).items():
+			for frame, file_name in frames.items():
+				source = os.path.join(shard.directory, file_name)
+				if not (shard.start <= frame < shard.end):
+					os.remove(source)
+					report.discarded = report.discarded + 1
+					continue
+				stream_owners = owners.setdefault(stream, {})
+				if frame in stream_owners:
+					report.overlaps.setdefault(stream, []).append(frame)
+					os.remove(source)
+					continue
+				stream_owners[frame] = shard.index
+				destination = os.path.join(output_directory, file_name)
+				if os.path.exists(destination):
+					os.remove(destination)
+				shutil.move(source, destination)
+				collected.setdefault(stream, {})[frame] = file_name
+	for overlapping in report.overlaps.values():
+		overlapping.sort()
+	return verify_frames(output_directory, start_frame, end_frame, None if splice else collected, report)
+
+'''
+	Summary:
+		Reads the settings a capture process needs from the editor: playback range, display rate, editor binary, project and map.
+'''
+def sequence_capture_settings(sequencer_asset_path):
+	# Imported here so the runner works outside the editor
+	import unreal
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	display_rate = sequence.get_display_rate()
+	return {
+		'start_frame' : sequence.get_playback_start(),
+		'end_frame' : sequence.get_playback_end(),
+		'frame_rate' : (display_rate.numerator, display_rate.denominator),
+		'editor_command' : os.path.join(unreal.Paths.convert_relative_path_to_full(unreal.Paths.engine_dir()), 'Binaries', 'Win64', 'UE4Editor.exe'),
+		'project_path' : unreal.Paths.convert_relative_path_to_full(unreal.Paths.get_project_file_path()),
+		'map_path' : unreal.EditorLevelLibrary.get_editor_world().get_outermost().get_name(),
+	}
+
+'''
+	Summary:
+		Fills the settings that are None in a dict (see sequence_capture_settings()) from the editor. Without None values the editor
+		is not needed.
+'''
+def fill_capture_settings(sequencer_asset_path, settings):
+	settings = dict(settings)
+	if any(value is None for value in settings.values()):
+		for name, value in sequence_capture_settings(sequencer_asset_path).items():
+			if settings.get(name) is None:
+				settings[name] = value
+	return settings
+
+'''
+	Summary:
+		Captures planned shards into folders under output_directory/_shards, then collects their frames into output_directory and
+		verifies [start_frame, end_frame). The shard folders are removed when every shard succeeded and no frame is missing.
+	Params:
+		capture - Keyword arguments of capture_command() other than the sequence, shard and output folder.
+		splice - See collect_frames().
+	Returns:
+		(FrameReport, failed shards)
+'''
+def capture_shards(sequencer_asset_path, shards, output_directory, start_frame, end_frame, capture, max_workers = DEFAULT_MAX_WORKERS, timeout = None,
+		splice = False):
+	shard_root = os.path.join(output_directory, SHARD_DIRECTORY)
+	for shard in shards:
+		shard.directory = os.path.join(shard_root, '{0:03d}'.format(shard.index))
+
+	def make_command(shard):
+		return capture_command(sequencer_asset_path = sequencer_asset_path, shard = shard, output_directory = shard.directory, **capture)
+
+	run_shards(shards, make_command, max_workers, timeout)
+	report = collect_frames(shards, output_directory, start_frame, end_frame, splice)
+	failed = [shard for shard in shards if shard.returncode != 0]
+	if report.ok and not failed:
+		shutil.rmtree(shard_root, ignore_errors = True)
+	for shard in failed:
+		print('Shard {0} failed with exit code {1}, see {2}'.format(shard.index, shard.returncode, shard.log_path))
+	return report, failed
+
+'''
+	Summary:
+		Renders a sequence as shards in parallel capture processes and collects the frames into one directory.
+		Open the Python interactive console and use:
+			import sequencer_render_shards
+			sequencer_render_shards.render_sequence_sharded("/Game/TestSequence", "E:/Renders/TestSequence", max_workers = 4, handle_frames = 2)
+		Outside the editor (or with a stub instead of the editor) give every setting that would otherwise be read from the editor:
+			sequencer_render_shards.render_sequence_sharded("/Game/TestSequence", "/tmp/frames", editor_command = [sys.executable, "sequencer_render_shards.py", "--stub"],
+				project_path = "Test.uproject", map_path = "/Game/Main", start_frame = 0, end_frame = 240, frame_rate = (24, 1))
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		output_directory - Folder the frames end up in. The shards render into its "_shards" subfolder, which is removed afterwards.
+		max_workers - Number of capture processes run at the same time.
+		num_shards - Number of shards, max_workers by default.
+		handle_frames - Frames rendered on both sides of each shard and discarded.
+		warm_up_frames - Frames run before each shard's first captured frame.
+		capture_type, resolution, output_format, extra_arguments - See capture_command().
+		timeout - Seconds after which a shard's process is killed.
+		editor_command, project_path, map_path, start_frame, end_frame, frame_rate - Read from the editor when not given.
+	Returns:
+		A dict with the FrameReport (as a dict), the shards and the seconds spent.
+'''
+def render_sequence_sharded(sequencer_asset_path, output_directory, max_workers = DEFAULT_MAX_WORKERS, num_shards = None, handle_frames = 2,
+		warm_up_frames = 10, capture_type = 'PNG', resolution = (1280, 720), output_format = DEFAULT_OUTPUT_FORMAT, extra_arguments = (),
+		timeout = None, editor_command = None, project_path = None, map_path = None, start_frame = None, end_frame = None, frame_rate = None):
+	given = fill_capture_settings(sequencer_asset_path, {
+		'start_frame' : start_frame, 'end_frame' : end_frame, 'frame_rate' : frame_rate,
+		'editor_command' : editor_command, 'project_path' : project_path, 'map_path' : map_path,
+	})
+
+	start_time = time.time()
+	shards = plan_shards(given['start_frame'], given['end_frame'], num_shards or max_workers, handle_frames = handle_frames)
+	errors = check_plan(shards, given['start_frame'], given['end_frame'])
+	if errors:
+		raise ValueError('Invalid shard plan: {0}'.format('; '.join(errors)))
+
+	capture = {
+		'editor_command' : given['editor_command'], 'project_path' : given['project_path'], 'map_path' : given['map_path'],
+		'frame_rate' : given['frame_rate'], 'resolution' : resolution, 'capture_type' : capture_type, 'warm_up_frames' : warm_up_frames,
+		'output_format' : output_format, 'extra_arguments' : extra_arguments,
+	}
+	report, failed = capture_shards(sequencer_asset_path, shards, output_directory, given['start_frame'], given['end_frame'], capture, max_workers, timeout)
+
+	seconds = time.time() - start_time
+	print('Rendered {0} frames in {1} shards ({2} workers) in {3:.2f}s: {4}'.format(
+		given['end_frame'] - given['start_frame'], len(shards), max_workers, seconds, report))
+	return {'report' : report.as_dict(), 'shards' : shards, 'failed' : [shard.index for shard in failed], 'seconds' : seconds}
+
+'''
+	Summary:
+		Stand-in for the editor binary: parses the capture arguments of capture_command() and writes one small file per frame
+		(format PNG/JPG/BMP/EXR decides the extension), sleeping -StubFrameSeconds per frame.
+			python sequencer_render_shards.py --stub <capture arguments>
+'''
+def stub_capture(arguments):
+	values = {}
+	for argument in arguments:
+		if argument.startswith('-') and '=' in argument:
+			name, value = argument[1:].split('=', 1)
+			values[name] = value
+	directory = values['MovieFolder']
+	if not os.path.isdir(directory):
+		os.makedirs(directory)
+	sequence_name = values.get('LevelSequence', 'Sequence').rsplit('/', 1)[-1].split('.')[0]
+	extension = {'JPG' : 'jpg', 'BMP' : 'bmp', 'EXR' : 'exr'}.get(values.get('MovieFormat'), 'png')
+	frame_seconds = float(values.get('StubFrameSeconds', 0))
+	output_format = values.get('MovieName', DEFAULT_OUTPUT_FORMAT)
+	for frame in range(int(values['MovieStartFrame']), int(values['MovieEndFrame'])):
+		file_name = output_format.replace('{sequence}', sequence_name).replace('{frame}', '{0:04d}'.format(frame)) + '.' + extension
+		with open(os.path.join(directory, file_name), 'w') as f:
+			f.write(str(frame))
+		time.sleep(frame_seconds)
+	print('Stub captured [{0}, {1})'.format(values['MovieStartFrame'], values['MovieEndFrame']))
+	return 0
+
+if __name__ == '__main__' and len(sys.argv) > 1 and sys.argv[1] == '--stub':
+	sys.exit(stub_capture(sys.argv[2:]))
@@ -0,0 +1,412 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Incremental re-render of the changed shots of a master sequence.
+# Every shot section of the master's cinematic shot track gets a content hash: the sequencer_hash root of its shot sequence plus
+# the section's start offset, time scale and duration. The hashes of a render are kept in shot_render.json next to its frames,
+# together with a hash of the master's other tracks and bindings and a hash of the capture settings; the cut that was rendered
+# is read back from the EDL (Render to Movie's, or the one written here after each render, see sequencer_edl).
+# On the next render only shots whose hash changed, or whose place in the cut moved, are captured (as sequencer_render_shards
+# shards with their record range as the frame range) and their frames are spliced into the existing output. Frames of the playback
+# range that no shot covers are rendered from the master alone when they were not such a gap before, e.g. after a shot was removed.
+# A change to the master's own tracks, its playback range or the capture settings re-renders everything.
+# Content outside the hashed sequences (the level, referenced assets, sequences nested inside a shot) is not seen.
+#	import sequencer_shot_render
+#	sequencer_shot_render.render_changed_shots("/Game/Cinematics/Master", "E:/Renders/Master", max_workers = 4)
+import os
+import json
+import time
+import hashlib
+import sequencer_edl
+import sequencer_diff
+import sequencer_hash
+import sequencer_render_cache
+import sequencer_render_shards
+
+MANIFEST_NAME = 'shot_render.json'
+SHOT_TRACK_TYPE = 'MovieSceneCinematicShotTrack'
+# Name of the ShotInfo of a range that no shot covers
+GAP_NAME = '(no shot)'
+
+# Capture settings that change the frames; the editor binary and project location do not
+_KEYED_CAPTURE_SETTINGS = ('map_path', 'frame_rate', 'resolution', 'capture_type', 'warm_up_frames', 'output_format', 'extra_arguments')
+
+'''
+	Summary:
+		One shot of the master sequence.
+	Params:
+		name - Shot display name.
+		sequence_path - Path of the shot sequence.
+		start, end - Range in the master, display rate frames (end exclusive).
+		source_in - First frame of the shot sequence that plays (the section's start offset).
+		hash - Content hash (see shot_hash()).
+'''
+class ShotInfo(object):
+	__slots__ = ('name', 'sequence_path', 'start', 'end', 'source_in', 'hash')
+
+	def __init__(self, name, sequence_path, start, end, source_in = 0, hash = None):
+		self.name = name
+		self.sequence_path = sequence_path
+		self.start = start
+		self.end = end
+		self.source_in = source_in
+		self.hash = hash
+
+	def as_dict(self):
+		return dict((name, getattr(self, name)) for name in self.__slots__)
+
+	def __repr__(self):
+		return '<ShotInfo {0} [{1}, {2})>'.format(self.name, self.start, self.end)
+
+'''
+	Summary:
+		Hash of a shot: its sequence's content hash, the section parameters that change what plays, and its duration. The position
+		in the master is not part of it; moved shots are found by comparing ranges.
+'''
+def shot_hash(sequence_hash, start_offset, time_scale, duration):
+	content = json.dumps([sequence_hash, start_offset, time_scale, duration])
+	return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+# (key, shot) pairs; repeated names get a "#n" suffix like sequencer_hash keys
+def _keyed(shots, name = lambda shot: shot.name):
+	seen = {}
+	result = []
+	for shot in shots:
+		key = name(shot)
+		count = seen.get(key, 0)
+		seen[key] = count + 1
+		result.append((key if count == 0 else '{0}#{1}'.format(key, count), shot))
+	return result
+
+'''
+	Summary:
+		Hash of everything in a master sequence document except its cinematic shot tracks: the other master tracks and the bindings.
+	Params:
+		root - Hashed sequencer_hash tree of the master.
+'''
+def context_hash(root):
+	digest = hashlib.sha1()
+	digest.update(sequencer_hash.record_hash(root.record, root.kind).encode('utf-8'))
+	for key, binding in root.keyed_children():
+		if binding.record.get('id') != sequencer_hash.MASTER_BINDING_ID:
+			digest.update(u'{0}:{1}'.format(key, binding.hash).encode('utf-8'))
+			continue
+		for track_key, track in binding.keyed_children():
+			if track.record.get('type') != SHOT_TRACK_TYPE:
+				digest.update(u'{0}/{1}:{2}'.format(key, track_key, track.hash).encode('utf-8'))
+	return digest.hexdigest()
+
+'''
+	Summary:
+		Reads the shots of a master sequence and hashes them.
+	Params:
+		sequence - The master LevelSequence.
+		hash_cache - Optional sequencer_diff.HashTreeCache, so unchanged saved shot sequences are not read again.
+	Returns:
+		(context hash, list of ShotInfo in master order)
+'''
+def master_shots(sequence, hash_cache = None):
+	# Imported here so the planning works outside the editor
+	import unreal, sequencer_export, sequencer_time
+	root = sequencer_hash.document_from_records(sequencer_export.iter_export_records(sequence))
+	sequencer_hash.compute_hashes(root)
+
+	shots = []
+	for track in sequence.find_master_tracks_by_type(unreal.MovieSceneCinematicShotTrack):
+		for section in track.get_sections():
+			shot_sequence = section.get_editor_property('sub_sequence')
+			section_range = section.get_range()
+			if shot_sequence is None or not section.is_active() or not (section_range.has_start and section_range.has_end):
+				continue
+			start_frames, start_sub_frames = sequencer_time.ticks_to_display(sequence, section_range.inclusive_start)
+			end_frames, end_sub_frames = sequencer_time.ticks_to_display(sequence, section_range.exclusive_end)
+			start = int(sequencer_time.round_to_frame(start_frames, start_sub_frames))
+			end = int(sequencer_time.round_to_frame(end_frames, end_sub_frames))
+			parameters = section.get_editor_property('parameters')
+			start_offset = parameters.start_frame_offset.value
+			sequence_path = shot_sequence.get_path_name()
+			name = str(section.get_editor_property('shot_display_name')) or shot_sequence.get_name()
+			sequence_hash = sequencer_diff.sequence_tree(sequence_path, hash_cache).hash
+			shots.append(ShotInfo(name, sequence_path, start, end, start_offset,
+				shot_hash(sequence_hash, start_offset, parameters.time_scale, end - start)))
+	shots.sort(key = lambda shot: shot.start)
+	return context_hash(root), shots
+
+'''
+	Summary:
+		Hash of the capture settings that change the frames.
+'''
+def capture_hash(capture, handle_frames):
+	settings = dict((name, capture.get(name)) for name in _KEYED_CAPTURE_SETTINGS)
+	settings['handle_frames'] = handle_frames
+	return sequencer_render_cache.settings_hash(json.loads(json.dumps(settings)))
+
+def load_manifest(output_directory):
+	path = os.path.join(output_directory, MANIFEST_NAME)
+	if not os.path.isfile(path):
+		return None
+	with open(path, 'r') as f:
+		return json.load(f)
+
+def _clip_base_name(clip_name):
+	return os.path.splitext(os.path.basename(clip_name.replace('\\', '/')))[0]
+
+'''
+	Summary:
+		Ranges of the previously rendered shots according to an EDL, keyed like _keyed(). Events are matched to the manifest's shots by
+		clip name or reel name, or by position when the EDL has one video event per shot. The EDL's timecodes are aligned so that its
+		first event starts where the manifest's first shot started.
+	Returns:
+		{shot key: (start, end)}, empty when the EDL does not match the manifest.
+'''
+def edl_shot_ranges(edl, manifest_shots):
+	events = edl.video_events()
+	if not events or not manifest_shots:
+		return {}
+	ordered = sorted(manifest_shots, key = lambda shot: shot['start'])
+	offset = ordered[0]['start'] - events[0].record_in
+	keyed_shots = _keyed(ordered, lambda shot: shot['name'])
+
+	ranges = {}
+	unmatched = list(events)
+	for key, shot in keyed_shots:
+		for event in unmatched:
+			if (event.clip_name and _clip_base_name(event.clip_name) == shot['name']) or event.reel == sequencer_edl.reel_name(shot['name']):
+				ranges[key] = (event.record_in + offset, event.record_out + offset)
+				unmatched.remove(event)
+				break
+	if len(ranges) == len(keyed_shots):
+		return ranges
+	if len(events) == len(keyed_shots):
+		return dict((key, (event.record_in + offset, event.record_out + offset)) for (key, shot), event in zip(keyed_shots, events))
+	print('EDL {0} does not match the previous render ({1} video events, {2} shots); using the manifest ranges'.format(
+		edl.title, len(events), len(keyed_shots)))
+	return {}
+
+'''
+	Summary:
+		Ranges of [start_frame, end_frame) that none of the given ranges covers.
+	Params:
+		ranges - (start, end) pairs, in any order; they may overlap.
+	Returns:
+		Sorted (start, end) pairs.
+'''
+def uncovered_ranges(ranges, start_frame, end_frame):
+	uncovered = []
+	position = start_frame
+	for start, end in sorted(ranges):
+		if start > position:
+			uncovered.append((position, min(start, end_frame)))
+		position = max(position, end)
+		if position >= end_frame:
+			break
+	if position < end_frame:
+		uncovered.append((position, end_frame))
+	return [(start, end) for start, end in uncovered if start < end]
+
+# The gaps of the current cut that were not gaps of the previous one
+def _new_gaps(gaps, previous_gaps):
+	previous_frames = set()
+	for start, end in previous_gaps:
+		previous_frames.update(range(start, end))
+	new_frames = [frame for start, end in gaps for frame in range(start, end) if frame not in previous_frames]
+	ranges = []
+	for frame in new_frames:
+		if ranges and ranges[-1][1] == frame:
+			ranges[-1][1] = frame + 1
+		else:
+			ranges.append([frame, frame + 1])
+	return [(start, end) for start, end in ranges]
+
+'''
+	Summary:
+		Names of the shots of the previous render that are not in the current cut.
+'''
+def removed_shots(shots, manifest):
+	if manifest is None:
+		return []
+	current = set(key for key, shot in _keyed(shots))
+	return [key for key, shot in _keyed(manifest['shots'], lambda shot: shot['name']) if key not in current]
+
+'''
+	Summary:
+		Decides which shots, and which ranges without a shot, have to be rendered.
+	Params:
+		shots - Current ShotInfo list.
+		context - Current context hash (see context_hash()).
+		settings - Current capture hash (see capture_hash()).
+		manifest - The previous render's manifest (see load_manifest()), None if there is none.
+		edl - Optional sequencer_edl.Edl of the previous render; its ranges take precedence over the manifest's.
+		start_frame, end_frame - Current playback range of the master.
+	Returns:
+		A list of (ShotInfo, reason) for the shots to render. Ranges that no shot covers come as ShotInfo named GAP_NAME without a
+		sequence; on a full render all of them are included, otherwise those that were not gaps before (where a removed shot was).
+'''
+def plan_changed_shots(shots, context, settings, manifest, edl = None, start_frame = None, end_frame = None):
+	if start_frame is None:
+		start_frame = min([shot.start for shot in shots] or [0])
+	if end_frame is None:
+		end_frame = max([shot.end for shot in shots] or [0])
+	gaps = uncovered_ranges([(shot.start, shot.end) for shot in shots], start_frame, end_frame)
+
+	reason = None
+	if manifest is None:
+		reason = 'not rendered before'
+	elif manifest.get('settings_hash') != settings:
+		reason = 'capture settings changed'
+	elif manifest.get('context_hash') != context:
+		reason = 'master tracks changed'
+	elif (manifest.get('start_frame'), manifest.get('end_frame')) != (start_frame, end_frame):
+		reason = 'playback range changed from [{0}, {1})'.format(manifest.get('start_frame'), manifest.get('end_frame'))
+	if reason is not None:
+		return [(shot, reason) for shot in shots] + [(ShotInfo(GAP_NAME, None, start, end), reason) for start, end in gaps]
+
+	previous = dict(_keyed(manifest['shots'], lambda shot: shot['name']))
+	ranges = dict((key, (shot['start'], shot['end'])) for key, shot in previous.items())
+	if edl is not None:
+		ranges.update(edl_shot_ranges(edl, manifest['shots']))
+
+	changed = []
+	for key, shot in _keyed(shots):
+		if key not in previous:
+			changed.append((shot, 'new shot'))
+		elif previous[key]['hash'] != shot.hash:
+			changed.append((shot, 'content changed'))
+		elif ranges[key] != (shot.start, shot.end):
+			changed.append((shot, 'moved from [{0}, {1})'.format(*ranges[key])))
+	previous_gaps = uncovered_ranges(ranges.values(), start_frame, end_frame)
+	changed.extend((ShotInfo(GAP_NAME, None, start, end), 'no longer covered by a shot') for start, end in _new_gaps(gaps, previous_gaps))
+	return changed
+
+'''
+	Summary:
+		Removes the frame files of a folder that lie outside [start_frame, end_frame) (left from a longer playback range).
+	Returns:
+		The number of files removed.
+'''
+def remove_frames_outside(directory, start_frame, end_frame):
+	removed = 0
+	for stream, frames in sequencer_render_shards.scan_frames(directory).items():
+		for frame, file_name in frames.items():
+			if not (start_frame <= frame < end_frame):
+				os.remove(os.path.join(directory, file_name))
+				removed = removed + 1
+	return removed
+
+def _find_edl(output_directory, manifest):
+	if manifest and manifest.get('edl') and os.path.isfile(os.path.join(output_directory, manifest['edl'])):
+		return os.path.join(output_directory, manifest['edl'])
+	if not os.path.isdir(output_directory):
+		return None
+	edl_names = sorted(name for name in os.listdir(output_directory) if name.lower().endswith('.edl'))
+	return os.path.join(output_directory, edl_names[0]) if edl_names else None
+
+'''
+	Summary:
+		Renders the changed shots of a master into an existing output and records the new state. Does not need the editor when the
+		shots, hashes and every capture setting are given (see sequencer_render_shards.render_sequence_sharded()).
+	Params:
+		sequencer_asset_path - The master sequence.
+		output_directory - Folder with the frames of the previous render.
+		shots - Current ShotInfo list.
+		context - Current context hash.
+		start_frame, end_frame - Playback range of the master.
+		capture - Keyword arguments of sequencer_render_shards.capture_command() other than the sequence, shard and folder.
+		max_workers - Number of capture processes run at the same time.
+		handle_frames - Frames rendered on both sides of each shot and discarded.
+		timeout - Seconds after which a shot's process is killed.
+		edl_path - EDL of the previous render; found in output_directory when not given.
+		force - Render every shot.
+		dry_run - Only return the plan.
+	Returns:
+		A dict with the rendered shots and reasons, the removed shots, the FrameReport (as a dict), the failed shots and the seconds
+		spent. The output is verified over [start_frame, end_frame) even when nothing had to be rendered.
+'''
+def render_shots(sequencer_asset_path, output_directory, shots, context, start_frame, end_frame, capture, max_workers = sequencer_render_shards.DEFAULT_MAX_WORKERS,
+		handle_frames = 2, timeout = None, edl_path = None, force = False, dry_run = False):
+	start_time = time.time()
+	settings = capture_hash(capture, handle_frames)
+	manifest = None if force else load_manifest(output_directory)
+	edl_path = edl_path or _find_edl(output_directory, manifest)
+	edl = sequencer_edl.read_edl(edl_path, tuple(capture['frame_rate'])) if manifest is not None and edl_path else None
+	changed = plan_changed_shots(shots, context, settings, manifest, edl, start_frame, end_frame)
+	removed = removed_shots(shots, manifest)
+	for shot, reason in changed:
+		print('{0:<24} [{1}, {2}) {3}'.format(shot.name, shot.start, shot.end, reason))
+	for name in removed:
+		print('{0:<24} removed'.format(name))
+	num_shots = sum(1 for shot, reason in changed if shot.sequence_path is not None)
+	print('{0} of {1} shots and {2} ranges without a shot to render'.format(num_shots, len(shots), len(changed) - num_shots))
+	result = {'shots' : [(shot.name, reason) for shot, reason in changed], 'removed' : removed, 'report' : None, 'failed' : [], 'seconds' : 0.0}
+	if dry_run:
+		return result
+
+	outside = remove_frames_outside(output_directory, start_frame, end_frame)
+	if outside:
+		print('Removed {0} frame files outside [{1}, {2})'.format(outside, start_frame, end_frame))
+	if changed:
+		shards = [sequencer_render_shards.Shard(index, shot.start, shot.end, max(start_frame, shot.start - handle_frames), min(end_frame, shot.end + handle_frames))
+			for index, (shot, reason) in enumerate(changed)]
+		report, failed = sequencer_render_shards.capture_shards(sequencer_asset_path, shards, output_directory, start_frame, end_frame, capture,
+			max_workers, timeout, splice = True)
+	else:
+		report, failed = sequencer_render_shards.verify_frames(output_directory, start_frame, end_frame), []
+	result['report'] = report.as_dict()
+	result['failed'] = [changed[shard.index][0].name for shard in failed]
+
+	if report.ok and not failed:
+		title = sequencer_asset_path.rsplit('/', 1)[-1].split('.')[0]
+		edl_name = '{0}.edl'.format(title)
+		sequencer_edl.write_edl(os.path.join(output_directory, edl_name), title,
+			[(shot.name, shot.source_in, shot.start, shot.end) for shot in shots], tuple(capture['frame_rate']))
+		manifest = {
+			'sequence' : sequencer_asset_path,
+			'context_hash' : context,
+			'settings_hash' : settings,
+			'start_frame' : start_frame,
+			'end_frame' : end_frame,
+			'edl' : edl_name,
+			'shots' : [shot.as_dict() for shot in shots],
+		}
+		with open(os.path.join(output_directory, MANIFEST_NAME), 'w') as f:
+			json.dump(manifest, f, indent = 1, sort_keys = True)
+
+	result['seconds'] = time.time() - start_time
+	print('Rendered {0} of {1} shots and {2} ranges without a shot in {3:.2f}s: {4}'.format(num_shots, len(shots), len(changed) - num_shots,
+		result['seconds'], report))
+	return result
+
+'''
+	Summary:
+		Re-renders only the shots of a master sequence that changed since the last render into output_directory.
+		Open the Python interactive console and use:
+			import sequencer_shot_render
+			sequencer_shot_render.render_changed_shots("/Game/Cinematics/Master", "E:/Renders/Master", dry_run = True)
+			sequencer_shot_render.render_changed_shots("/Game/Cinematics/Master", "E:/Renders/Master", max_workers = 4)
+	Params:
+		sequencer_asset_path - The master sequence.
+		output_directory - Folder of the frames; a first render fills it completely.
+		hash_cache_path - Optional sequencer_diff hash tree cache for the shot sequences.
+		max_workers, handle_frames, timeout, force, dry_run - See render_shots().
+		warm_up_frames, capture_type, resolution, output_format, extra_arguments - See sequencer_render_shards.capture_command().
+	Returns:
+		See render_shots().
+'''
+def render_changed_shots(sequencer_asset_path, output_directory, hash_cache_path = None, max_workers = sequencer_render_shards.DEFAULT_MAX_WORKERS,
+		handle_frames = 2, warm_up_frames = 10, capture_type = 'PNG', resolution = (1280, 720), output_format = sequencer_render_shards.DEFAULT_OUTPUT_FORMAT,
+		extra_arguments = (), timeout = None, force = False, dry_run = False):
+	import unreal
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	hash_cache = sequencer_diff.HashTreeCache(hash_cache_path) if hash_cache_path else None
+	context, shots = master_shots(sequence, hash_cache)
+	if hash_cache is not None:
+		hash_cache.save()
+
+	settings = sequencer_render_shards.sequence_capture_settings(sequencer_asset_path)
+	capture = {
+		'editor_command' : settings['editor_command'], 'project_path' : settings['project_path'], 'map_path' : settings['map_path'],
+		'frame_rate' : settings['frame_rate'], 'resolution' : resolution, 'capture_type' : capture_type, 'warm_up_frames' : warm_up_frames,
+		'output_format' : output_format, 'extra_arguments' : list(extra_arguments),
+	}
+	return render_shots(sequencer_asset_path, output_directory, shots, context, settings['start_frame'], settings['end_frame'], capture,
+		max_workers, handle_frames, timeout, force = force, dry_run = dry_run)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Lazy generator pipeline over a LevelSequence: tracks -> sections -> channels -> keys.
+# Each stage pulls from the previous one only when its consumer asks for the next item, so only the proxies of the current
+# binding/track/section/channel are alive at any time instead of lists of every track or key in the sequence.
+# The stages take filters (channel type, binding name, track name, time range) and compose with sequencer_bulk_keys, which
+# reads and writes one channel at a time.
+import unreal
+import numpy as np
+import curve_simplify
+import sequencer_bulk_keys
+
+'''
+	Summary:
+		Yields (binding, track) for the master tracks (binding is None) and then for the tracks of every object binding.
+	Params:
+		sequence - The LevelSequence to walk.
+		binding_name - Only yield tracks of the binding with this display name. Master tracks are skipped when it is given.
+		track_name - Only yield tracks with this name.
+		include_master_tracks - Yield the master tracks as well as the binding tracks.
+'''
+def iter_tracks(sequence, binding_name = None, track_name = None, include_master_tracks = True):
+	if include_master_tracks and binding_name is None:
+		for track in sequence.get_master_tracks():
+			if track_name is None or track.get_name() == track_name:
+				yield None, track
+	for binding in sequence.get_bindings():
+		if binding_name is not None and binding.get_display_name() != binding_name:
+			continue
+		for track in binding.get_tracks():
+			if track_name is None or track.get_name() == track_name:
+				yield binding, track
+
+'''
+	Summary:
+		Yields (binding, track, section) for the tracks yielded by iter_tracks().
+'''
+def iter_sections(sequence, binding_name = None, track_name = None, include_master_tracks = True):
+	for binding, track in iter_tracks(sequence, binding_name, track_name, include_master_tracks):
+		for section in track.get_sections():
+			yield binding, track, section
+
+'''
+	Summary:
+		Yields (binding, track, section, channel) for the channels of the given type.
+	Params:
+		channel_type - A MovieSceneScriptingChannel class, or None for every channel.
+'''
+def iter_channels(sequence, channel_type = None, binding_name = None, track_name = None, include_master_tracks = True):
+	for binding, track, section in iter_sections(sequence, binding_name, track_name, include_master_tracks):
+		channels = section.get_channels() if channel_type is None else section.find_channels_by_type(channel_type)
+		for channel in channels:
+			yield binding, track, section, channel
+
+'''
+	Summary:
+		Yields the keys of the channels of the given type, optionally restricted to a time range.
+		Open the Python interactive console and use:
+			import sequencer_stream
+			sequence = unreal.load_asset("/Game/TestKeySequence", unreal.LevelSequence)
+			for key in sequencer_stream.iter_keys(sequence, unreal.MovieSceneScriptingBoolChannel, start_frame = 0, end_frame = 120):
+				key.set_value(not key.get_value())
+	Params:
+		channel_type - A MovieSceneScriptingChannel class, or None for every channel.
+		start_frame - Only yield keys at or after this frame.
+		end_frame - Only yield keys before this frame.
+		time_unit - The unit of start_frame and end_frame, display rate frames by default.
+'''
+def iter_keys(sequence, channel_type = None, binding_name = None, track_name = None, start_frame = None, end_frame = None, time_unit = unreal.SequenceTimeUnit.DISPLAY_RATE, include_master_tracks = True):
+	for binding, track, section, channel in iter_channels(sequence, channel_type, binding_name, track_name, include_master_tracks):
+		for key in channel.get_keys():
+			if start_frame is not None or end_frame is not None:
+				frame = key.get_time(time_unit).frame_number.value
+				if start_frame is not None and frame < start_frame:
+					continue
+				if end_frame is not None and frame >= end_frame:
+					continue
+			yield key
+
+'''
+	Summary:
+		Yields the items of an iterable in lists of at most batch_size items. Only one batch is alive at a time.
+'''
+def batched(iterable, batch_size):
+	batch = []
+	for item in iterable:
+		batch.append(item)
+		if len(batch) >= batch_size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+'''
+	Summary:
+		Yields one sequencer_bulk_keys.FloatKeyArrays per float channel, reading each channel only when it is reached.
+		Transform the arrays and pass them to sequencer_bulk_keys.write_float_keys() before asking for the next one, so only one
+		channel's keys are held at a time.
+	Params:
+		fields - Names of the fields to read (see sequencer_bulk_keys.FLOAT_KEY_FIELD_NAMES).
+		start_frame, end_frame, time_unit - Optional time range; the yielded arrays get a boolean "in_range" mask attribute (times are
+			read even if not requested). Keys outside the range are still read, so mask the transforms with it.
+'''
+def iter_float_key_arrays(sequence, fields = sequencer_bulk_keys.FLOAT_KEY_FIELD_NAMES, binding_name = None, track_name = None, start_frame = None, end_frame = None, time_unit = unreal.SequenceTimeUnit.DISPLAY_RATE, include_master_tracks = True):
+	start_tick = end_tick = None
+	if start_frame is not None or end_frame is not None:
+		fields = tuple(fields) + ('times',)
+		if time_unit == unreal.SequenceTimeUnit.DISPLAY_RATE:
+			start_tick = sequencer_bulk_keys.display_frames_to_ticks(sequence, start_frame) if start_frame is not None else None
+			end_tick = sequencer_bulk_keys.display_frames_to_ticks(sequence, end_frame) if end_frame is not None else None
+		else:
+			start_tick, end_tick = start_frame, end_frame
+	for binding, track, section, channel in iter_channels(sequence, unreal.MovieSceneScriptingFloatChannel, binding_name, track_name, include_master_tracks):
+		arrays = sequencer_bulk_keys.read_float_keys(channel, fields)
+		if start_tick is not None or end_tick is not None:
+			in_range = np.ones(len(arrays), dtype = bool)
+			if start_tick is not None:
+				in_range &= arrays.times >= start_tick
+			if end_tick is not None:
+				in_range &= arrays.times < end_tick
+			arrays.in_range = in_range
+		yield arrays
+
+'''
+	Summary:
+		Streams every float channel of a sequence through the bulk path: adds a value to the keys inside a frame range and writes each
+		channel back before reading the next one.
+		Open the Python interactive console and use:
+			import sequencer_stream
+			sequencer_stream.add_value_in_range("/Game/TestKeySequence", 35.0, 0, 120)
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		value - Value added to the keys.
+		start_frame, end_frame - Display rate frame range of the keys to modify.
+	Returns:
+		The number of keys modified.
+'''
+def add_value_in_range(sequencer_asset_path, value, start_frame = None, end_frame = None):
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	num_keys_modified = 0
+	for arrays in iter_float_key_arrays(sequence, ('values',), start_frame = start_frame, end_frame = end_frame):
+		if start_frame is None and end_frame is None:
+			arrays.values += value
+			num_keys_modified = num_keys_modified + len(arrays)
+		else:
+			arrays.values[arrays.in_range] += value
+			num_keys_modified = num_keys_modified + int(np.count_nonzero(arrays.in_range))
+		sequencer_bulk_keys.write_float_keys(arrays)
+	print('Modified {0} keys!'.format(num_keys_modified))
+	return num_keys_modified
+
+'''
+	Summary:
+		Removes redundant keys from every float channel of a sequence, one channel at a time (see sequencer_bulk_keys.simplify_float_keys).
+		Open the Python interactive console and use:
+			import sequencer_stream
+			sequencer_stream.simplify_sequence("/Game/TestKeySequence", 0.01)
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		tolerance - Largest allowed value error at a removed key.
+		mode - curve_simplify.LINEAR or curve_simplify.CUBIC.
+		binding_name, track_name - Optional filters, see iter_tracks().
+	Returns:
+		A dict with the number of channels, keys before, keys removed and the max error over all channels.
+'''
+def simplify_sequence(sequencer_asset_path, tolerance, mode = curve_simplify.CUBIC, binding_name = None, track_name = None):
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	fields = ('times', 'values', 'interp_modes', 'tangent_modes', 'tangent_weight_modes', 'arrive_tangents', 'leave_tangents')
+	report = {'channels' : 0, 'keys' : 0, 'keys_removed' : 0, 'max_error' : 0.0}
+	for arrays in iter_float_key_arrays(sequence, fields, binding_name, track_name):
+		report['channels'] = report['channels'] + 1
+		report['keys'] = report['keys'] + len(arrays)
+		num_removed, max_error = sequencer_bulk_keys.simplify_float_keys(arrays, tolerance, mode)
+		report['keys_removed'] = report['keys_removed'] + num_removed
+		report['max_error'] = max(report['max_error'], max_error)
+	print('Removed {0} of {1} keys in {2} channels, max error {3:.6f}'.format(report['keys_removed'], report['keys'], report['channels'], report['max_error']))
+	return report
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Exact frame rate conversion without the editor.
+# Mirrors FFrameRate::TransformTime, FFrameRate::AsSeconds and FFrameRate::AsFrameTime: the whole frame part is computed with
+# integer arithmetic (so it is exact), the result is floored to a frame number, and the remainder becomes a sub-frame clamped
+# below 1.0 and stored as a 32-bit float like FFrameTime::SubFrame. Whole NumPy arrays of frame numbers are converted at once,
+# replacing one unreal.TimeManagementLibrary.transform_time() call per key.
+# This module does not import unreal; FrameRate.from_unreal() reads any object with numerator/denominator attributes.
+import numpy as np
+from fractions import Fraction
+
+# Largest sub-frame the engine stores (FFrameTime::MaxSubframe, the largest float below 1.0)
+MAX_SUBFRAME = 0.999999940395355
+
+'''
+	Summary:
+		A frame rate as numerator / denominator frames per second, like unreal.FrameRate.
+	Params:
+		numerator - Frames.
+		denominator - Seconds.
+'''
+class FrameRate(object):
+	def __init__(self, numerator, denominator = 1):
+		if numerator <= 0 or denominator <= 0:
+			raise ValueError('Invalid frame rate {0}/{1}'.format(numerator, denominator))
+		self.numerator = int(numerator)
+		self.denominator = int(denominator)
+
+	'''
+		Summary:
+			Creates a FrameRate from an unreal.FrameRate, such as sequence.get_display_rate() or sequence.get_tick_resolution().
+	'''
+	@classmethod
+	def from_unreal(cls, frame_rate):
+		return cls(frame_rate.numerator, frame_rate.denominator)
+
+	def as_fraction(self):
+		return Fraction(self.numerator, self.denominator)
+
+	def as_decimal(self):
+		return float(self.numerator) / self.denominator
+
+	'''
+		Summary:
+			Returns the time of a frame (and optional sub-frame) in seconds. Accepts scalars or NumPy arrays.
+	'''
+	def as_seconds(self, frames, sub_frames = 0.0):
+		frames = np.asarray(frames, dtype = np.int64)
+		return (frames.astype(np.float64) + sub_frames) * self.denominator / self.numerator
+
+	'''
+		Summary:
+			Returns (frames, sub_frames) for a time in seconds, flooring like FFrameRate::AsFrameTime. Accepts scalars or NumPy arrays.
+	'''
+	def as_frame_time(self, seconds):
+		time_as_frame = np.asarray(seconds, dtype = np.float64) * self.numerator / self.denominator
+		frames = np.floor(time_as_frame)
+		return frames.astype(np.int64), _clamp_sub_frames(time_as_frame - frames)
+
+	def __eq__(self, other):
+		return isinstance(other, FrameRate) and self.numerator == other.numerator and self.denominator == other.denominator
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __hash__(self):
+		return hash((self.numerator, self.denominator))
+
+	def __repr__(self):
+		return 'FrameRate({0}/{1})'.format(self.numerator, self.denominator)
+
+def _clamp_sub_frames(sub_frames):
+	return np.minimum(sub_frames, MAX_SUBFRAME).astype(np.float32)
+
+'''
+	Summary:
+		Converts frame numbers (and optional sub-frames) from one frame rate to another, like unreal.TimeManagementLibrary.transform_time().
+		The whole frame part is exact; the sub-frame part is computed in doubles like the engine.
+		Example:
+			display_rate = sequencer_time.FrameRate.from_unreal(sequence.get_display_rate())
+			tick_resolution = sequencer_time.FrameRate.from_unreal(sequence.get_tick_resolution())
+			ticks, sub_frames = sequencer_time.transform_time([0, 15, 30], display_rate, tick_resolution)
+	Params:
+		frames - Frame number, or a sequence / NumPy array of frame numbers.
+		source_rate - FrameRate the frames are in.
+		destination_rate - FrameRate to convert to.
+		sub_frames - Optional sub-frame (0-1) or array of sub-frames.
+	Returns:
+		(frames, sub_frames) as an int64 and a float32 NumPy array (NumPy scalars for scalar input).
+'''
+def transform_time(frames, source_rate, destination_rate, sub_frames = None):
+	frames = np.asarray(frames, dtype = np.int64)
+	if source_rate == destination_rate:
+		sub_frames = np.zeros(frames.shape, dtype = np.float32) if sub_frames is None else np.asarray(sub_frames, dtype = np.float32)
+		return frames.copy(), sub_frames
+
+	# New time = time * destination / source, as one reduced fraction
+	ratio = destination_rate.as_fraction() / source_rate.as_fraction()
+	numerator, denominator = ratio.numerator, ratio.denominator
+
+	# Floor division keeps the frame part exact for negative frames too
+	scaled = frames * numerator
+	whole = scaled // denominator
+	fraction = (scaled - whole * denominator).astype(np.float64) / denominator
+	if sub_frames is not None:
+		fraction = fraction + np.asarray(sub_frames, dtype = np.float64) * numerator / denominator
+	carry = np.floor(fraction)
+	return whole + carry.astype(np.int64), _clamp_sub_frames(fraction - carry)
+
+'''
+	Summary:
+		Rounds (frames, sub_frames) to whole frames like FFrameTime::RoundToFrame (sub-frames of 0.5 and above round up).
+'''
+def round_to_frame(frames, sub_frames):
+	return np.asarray(frames, dtype = np.int64) + (np.asarray(sub_frames) >= 0.5)
+
+'''
+	Summary:
+		Rounds (frames, sub_frames) up to whole frames like FFrameTime::CeilToFrame.
+'''
+def ceil_to_frame(frames, sub_frames):
+	return np.asarray(frames, dtype = np.int64) + (np.asarray(sub_frames) > 0.0)
+
+'''
+	Summary:
+		Converts display rate frame numbers of a sequence to tick resolution frame numbers, flooring like FrameTime.frame_number.
+	Params:
+		sequence - The LevelSequence whose display rate and tick resolution are used.
+		frames - Frame number or array of frame numbers at the display rate.
+	Returns:
+		The tick resolution frame numbers (int64, a NumPy scalar for scalar input).
+'''
+def display_to_ticks(sequence, frames):
+	return transform_time(frames, FrameRate.from_unreal(sequence.get_display_rate()), FrameRate.from_unreal(sequence.get_tick_resolution()))[0]
+
+'''
+	Summary:
+		Converts tick resolution frame numbers of a sequence to display rate frame times.
+	Returns:
+		(frames, sub_frames) at the display rate.
+'''
+def ticks_to_display(sequence, ticks):
+	return transform_time(ticks, FrameRate.from_unreal(sequence.get_tick_resolution()), FrameRate.from_unreal(sequence.get_display_rate()))
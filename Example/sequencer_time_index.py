@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Time-range index of a LevelSequence.
+# Section ranges go into an interval tree, and the key times of every channel are kept as a sorted NumPy array, so
+# "which sections and keys are active between frame A and B" is answered without scanning the whole sequence.
+# All times are in the sequence's tick resolution; unbounded section ranges extend to -inf/+inf.
+import unreal
+import numpy as np
+import sequencer_index
+import sequencer_bulk_keys
+
+'''
+	Summary:
+		Static centered interval tree over half-open intervals [start, end).
+	Params:
+		intervals - Iterable of (start, end, item).
+'''
+class IntervalTree(object):
+	def __init__(self, intervals):
+		self.intervals = [interval for interval in intervals if interval[0] < interval[1]]
+		self.root = self._build(self.intervals)
+
+	def __len__(self):
+		return len(self.intervals)
+
+	# Node: (center, intervals sorted by start, intervals sorted by end descending, left, right)
+	def _build(self, intervals):
+		if not intervals:
+			return None
+		# The start of the median interval is inside that interval, so every node keeps at least one interval
+		starts = sorted(interval[0] for interval in intervals)
+		center = starts[len(starts) // 2]
+		left, right, here = [], [], []
+		for interval in intervals:
+			if interval[1] <= center:
+				left.append(interval)
+			elif interval[0] > center:
+				right.append(interval)
+			else:
+				here.append(interval)
+		return (center,
+			sorted(here, key = lambda interval: interval[0]),
+			sorted(here, key = lambda interval: interval[1], reverse = True),
+			self._build(left),
+			self._build(right))
+
+	'''
+		Summary:
+			Returns the items whose interval overlaps [start, end).
+	'''
+	def overlap(self, start, end):
+		result = []
+		stack = [self.root]
+		while stack:
+			node = stack.pop()
+			if node is None:
+				continue
+			center, by_start, by_end, left, right = node
+			if end <= center:
+				for interval in by_start:
+					if interval[0] >= end:
+						break
+					if interval[1] > start:
+						result.append(interval[2])
+				stack.append(left)
+			elif start > center:
+				for interval in by_end:
+					if interval[1] <= start:
+						break
+					if interval[0] < end:
+						result.append(interval[2])
+				stack.append(right)
+			else:
+				result.extend(interval[2] for interval in by_start if interval[0] < end and interval[1] > start)
+				stack.append(left)
+				stack.append(right)
+		return result
+
+	'''
+		Summary:
+			Returns the items whose interval contains the point.
+	'''
+	def at(self, point):
+		return self.overlap(point, point + 1)
+
+'''
+	Summary:
+		Sorted key times of one channel.
+	Params:
+		entry - The sequencer_index.ChannelEntry of the channel.
+		keys - The key proxies, sorted by time.
+		times - NumPy int64 array of the key times in ticks, sorted.
+'''
+class ChannelKeyTimes(object):
+	def __init__(self, entry, keys, times):
+		self.entry = entry
+		self.keys = keys
+		self.times = times
+
+	'''
+		Summary:
+			Returns the indices (into keys and times) of the keys in [start, end).
+	'''
+	def window(self, start, end):
+		return np.arange(np.searchsorted(self.times, start, 'left'), np.searchsorted(self.times, end, 'left'))
+
+'''
+	Summary:
+		Interval index over the sections of a sequence plus the sorted key times of its channels.
+		Open the Python interactive console and use:
+			import sequencer_time_index
+			sequence = unreal.load_asset("/Game/TestKeySequence", unreal.LevelSequence)
+			time_index = sequencer_time_index.SequenceTimeIndex(sequence)
+			start, end = time_index.display_range_to_ticks(100, 200)
+			for binding_id, track, section in time_index.sections_overlapping(start, end):
+				print(section.get_name())
+	Params:
+		sequence - The LevelSequence to index.
+		channel_types - Channel types whose key times are indexed.
+'''
+class SequenceTimeIndex(object):
+	def __init__(self, sequence, channel_types = (unreal.MovieSceneScriptingFloatChannel, unreal.MovieSceneScriptingBoolChannel, unreal.MovieSceneScriptingIntegerChannel, unreal.MovieSceneScriptingByteChannel)):
+		self.sequence = sequence
+		index = sequencer_index.get_sequence_index(sequence)
+
+		section_intervals = []
+		for binding_id, track, section in index.sections():
+			section_range = section.get_range()
+			start = section_range.inclusive_start if section_range.has_start else float('-inf')
+			end = section_range.exclusive_end if section_range.has_end else float('inf')
+			section_intervals.append((start, end, (binding_id, track, section)))
+		self.sections = IntervalTree(section_intervals)
+
+		self.channels = []
+		channel_intervals = []
+		for channel_type in channel_types:
+			for entry in index.channels(channel_type):
+				keys = entry.channel.get_keys()
+				if not keys:
+					continue
+				times = np.array([key.get_time(unreal.SequenceTimeUnit.TICK_RESOLUTION).frame_number.value for key in keys], dtype = np.int64)
+				order = np.argsort(times, kind = 'mergesort')
+				channel_key_times = ChannelKeyTimes(entry, [keys[i] for i in order], times[order])
+				self.channels.append(channel_key_times)
+				channel_intervals.append((int(channel_key_times.times[0]), int(channel_key_times.times[-1]) + 1, channel_key_times))
+		# Channels by the span of their keys, so window queries only visit channels that can have keys in the window
+		self.channel_spans = IntervalTree(channel_intervals)
+
+	'''
+		Summary:
+			Converts a display rate frame range to ticks.
+	'''
+	def display_range_to_ticks(self, start_frame, end_frame):
+		return sequencer_bulk_keys.display_frames_to_ticks(self.sequence, start_frame), sequencer_bulk_keys.display_frames_to_ticks(self.sequence, end_frame)
+
+	'''
+		Summary:
+			Returns (binding_id, track, section) for the sections whose range overlaps [start, end) ticks.
+	'''
+	def sections_overlapping(self, start, end):
+		return self.sections.overlap(start, end)
+
+	'''
+		Summary:
+			Returns (binding_id, track, section) for the sections active at the given tick.
+	'''
+	def sections_at(self, tick):
+		return self.sections.at(tick)
+
+	'''
+		Summary:
+			Returns the keys in [start, end) ticks, grouped by channel.
+		Params:
+			channel_type - Only return keys of this channel type.
+		Returns:
+			A list of (ChannelKeyTimes, indices) where indices is a NumPy array into ChannelKeyTimes.keys / .times.
+	'''
+	def keys_in_window(self, start, end, channel_type = None):
+		result = []
+		for channel_key_times in self.channel_spans.overlap(start, end):
+			if channel_type is not None and not isinstance(channel_key_times.entry.channel, channel_type):
+				continue
+			indices = channel_key_times.window(start, end)
+			if len(indices):
+				result.append((channel_key_times, indices))
+		return result
+
+	'''
+		Summary:
+			Returns the keys on the given tick, grouped by channel like keys_in_window().
+	'''
+	def keys_at(self, tick, channel_type = None):
+		return self.keys_in_window(tick, tick + 1, channel_type)
+
+'''
+	Summary:
+		Moves only the keys inside a display rate frame range by a number of frames; keys outside the range are not touched.
+		Open the Python interactive console and use:
+			import sequencer_time_index
+			sequencer_time_index.shift_keys_in_window("/Game/TestKeySequence", 100, 200, 15)
+	Params:
+		sequencer_asset_path - String that points to the Movie Scene sequence asset.
+		start_frame, end_frame - Display rate frame range of the keys to move.
+		frames - Number of display rate frames to move the keys by.
+	Returns:
+		The number of keys moved.
+'''
+def shift_keys_in_window(sequencer_asset_path, start_frame, end_frame, frames):
+	sequence = unreal.load_asset(sequencer_asset_path, unreal.LevelSequence)
+	time_index = SequenceTimeIndex(sequence)
+	start, end = time_index.display_range_to_ticks(start_frame, end_frame)
+	offset = sequencer_bulk_keys.display_frames_to_ticks(sequence, frames)
+	num_keys_moved = 0
+	for channel_key_times, indices in time_index.keys_in_window(start, end):
+		for i in indices:
+			channel_key_times.keys[i].set_time(unreal.FrameNumber(int(channel_key_times.times[i] + offset)), 0.0, unreal.SequenceTimeUnit.TICK_RESOLUTION)
+		num_keys_moved = num_keys_moved + len(indices)
+	print('Moved {0} keys!'.format(num_keys_moved))
+	return num_keys_moved